@@ -0,0 +1,202 @@
+"""
+Czarna lista tokenów JWT w cache (Redis) z TTL równym czasowi do wygaśnięcia tokena.
+
+Wpis 'auth:blacklist:<jti>' znika razem z ważnością tokena, więc lista nie rośnie
+bez końca i nie wymaga czyszczenia tabel. add() jest atomowe (cache.add) - przy
+rotacji dwa równoległe odświeżenia tym samym tokenem nie dostaną dwóch nowych par.
+
+Unieważnione tokeny dostępu (wylogowanie) są sprawdzane przy każdym żądaniu, dlatego
+przed odczytem z cache stoi filtr Blooma w pamięci procesu: odpowiedź "nie ma" jest
+pewna i nie kosztuje zapytania do Redisa. Filtr jest uzupełniany z dziennika
+unieważnień (kolejne numery z licznika) najwyżej co TOKEN_REVOCATION_SYNC_INTERVAL
+sekund - o tyle może się spóźnić wylogowanie w innym procesie. Zadanie
+compact_token_blacklist zapisuje migawkę żywych wpisów, żeby nowy proces nie czytał
+całego dziennika.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+ENTRY_KEY = 'auth:blacklist:{jti}'
+SEQUENCE_KEY = 'auth:blacklist:revoked:seq'
+LOG_KEY = 'auth:blacklist:revoked:{number}'
+SNAPSHOT_KEY = 'auth:blacklist:revoked:snapshot'
+BATCH_SIZE = 1000
+# Jak długo proces ponawia odczyt brakującego wpisu dziennika (numer już pobrany, wpis jeszcze niezapisany)
+PENDING_GRACE = 60
+
+
+def _ttl(token):
+    """Sekundy do wygaśnięcia tokena (z LEEWAY), 0 dla tokena już nieważnego"""
+    leeway = api_settings.LEEWAY
+    if isinstance(leeway, timedelta):
+        leeway = leeway.total_seconds()
+    return max(0, math.ceil(token['exp'] + leeway - time.time()))
+
+
+def add(token):
+    """Dodaje token do czarnej listy; False, jeśli już na niej był"""
+    ttl = _ttl(token)
+    if not ttl:
+        return True
+    return cache.add(ENTRY_KEY.format(jti=token[api_settings.JTI_CLAIM]), token['exp'], ttl)
+
+
+def contains(token):
+    return cache.get(ENTRY_KEY.format(jti=token[api_settings.JTI_CLAIM])) is not None
+
+
+def revoke(token):
+    """Unieważnia token dostępu - od razu w tym procesie, w pozostałych po synchronizacji filtra"""
+    if not add(token):
+        return
+    ttl = _ttl(token)
+    if not ttl:
+        return
+    jti = token[api_settings.JTI_CLAIM]
+    cache.add(SEQUENCE_KEY, 0, None)
+    number = cache.incr(SEQUENCE_KEY)
+    cache.set(LOG_KEY.format(number=number), (jti, token['exp']), ttl)
+    revoked.add(jti, token['exp'])
+
+
+def is_revoked(token):
+    return revoked.contains(token[api_settings.JTI_CLAIM])
+
+
+def _read_log(numbers):
+    """{numer: (jti, exp)} dla istniejących wpisów dziennika"""
+    numbers = list(numbers)
+    entries = {}
+    for start in range(0, len(numbers), BATCH_SIZE):
+        keys = {LOG_KEY.format(number=number): number for number in numbers[start:start + BATCH_SIZE]}
+        for key, entry in cache.get_many(keys).items():
+            entries[keys[key]] = entry
+    return entries
+
+
+def compact():
+    """
+    Zapisuje migawkę żywych unieważnień: (numer, {jti: exp}, brakujące numery).
+    Brakujące numery są sprawdzane jeszcze raz przy następnej kompakcji - wpis mógł
+    nie być jeszcze zapisany; jeśli wtedy go nie ma, to wygasł.
+    """
+    sequence = cache.get(SEQUENCE_KEY, 0)
+    number, entries, missing = cache.get(SNAPSHOT_KEY) or (0, {}, [])
+    if sequence < number:
+        # Cache wyczyszczony - dziennik zaczyna się od nowa
+        number, entries, missing = 0, {}, []
+    log = _read_log([*missing, *range(number + 1, sequence + 1)])
+    entries = {**entries, **dict(log.values())}
+    now = time.time()
+    entries = {jti: exp for jti, exp in entries.items() if exp > now}
+    missing = [n for n in range(number + 1, sequence + 1) if n not in log]
+    cache.set(SNAPSHOT_KEY, (sequence, entries, missing), None)
+    return len(entries)
+
+
+# ==================== FILTR BLOOMA ====================
+
+class BloomFilter:
+    """Filtr Blooma na bytearray z podwójnym haszowaniem blake2b"""
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevokedTokens:
+    """Unieważnione tokeny dostępu widziane przez proces: filtr Blooma + {jti: exp}"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._number = None
+        self._entries = {}
+        self._pending = {}
+        self._next_sync = 0
+        self._filter = None
+        self._capacity = 0
+
+    def _rebuild(self):
+        now = time.time()
+        self._entries = {jti: exp for jti, exp in self._entries.items() if exp > now}
+        capacity = max(settings.TOKEN_REVOCATION_BLOOM_CAPACITY, 2 * len(self._entries))
+        self._filter = BloomFilter(capacity, settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE)
+        self._capacity = capacity
+        for jti in self._entries:
+            self._filter.add(jti)
+
+    def add(self, jti, exp):
+        self.sync()
+        with self._lock:
+            self._entries[jti] = exp
+            self._filter.add(jti)
+
+    def _merge(self, entries):
+        for jti, exp in entries:
+            self._entries[jti] = exp
+            self._filter.add(jti)
+
+    def sync(self, force=False):
+        now = time.monotonic()
+        if not force and now < self._next_sync:
+            return
+        with self._lock:
+            self._next_sync = now + settings.TOKEN_REVOCATION_SYNC_INTERVAL
+            sequence = cache.get(SEQUENCE_KEY, 0)
+            if self._number is None or sequence < self._number:
+                # Start procesu albo wyczyszczony cache - migawka i dziennik od niej
+                number, entries, missing = cache.get(SNAPSHOT_KEY) or (0, {}, [])
+                if sequence < number:
+                    number, entries, missing = 0, {}, []
+                self._entries = dict(entries)
+                self._pending = {n: now for n in missing}
+                self._number = number
+                self._rebuild()
+            numbers = [*self._pending, *range(self._number + 1, sequence + 1)]
+            if not numbers:
+                return
+            log = _read_log(numbers)
+            self._merge(log.values())
+            for number in range(self._number + 1, sequence + 1):
+                if number not in log:
+                    self._pending[number] = now
+            self._pending = {
+                number: since for number, since in self._pending.items()
+                if number not in log and now - since < PENDING_GRACE
+            }
+            self._number = sequence
+            if len(self._entries) > self._capacity:
+                self._rebuild()
+
+    def contains(self, jti):
+        self.sync()
+        if jti not in self._filter:
+            return False
+        if self._entries.get(jti, 0) > time.time():
+            return True
+        # Fałszywie dodatni wynik filtra albo wpis wygasły lokalnie - rozstrzyga cache
+        return cache.get(ENTRY_KEY.format(jti=jti)) is not None
+
+
+revoked = RevokedTokens()
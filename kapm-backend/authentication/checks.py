@@ -0,0 +1,19 @@
+"""
+Ostrzeżenie, gdy produkcja podpisuje tokeny JWT wspólnym sekretem zamiast
+kluczy z JWT_KEYS_DIR (authentication/keys.py) - JWKS jest wtedy pusty.
+"""
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .keys import keyring
+
+
+@register()
+def check_jwt_signing_keys(app_configs, **kwargs):
+    if settings.DEBUG or keyring.active() is not None:
+        return []
+    return [Warning(
+        f'Brak kluczy podpisujących JWT w {settings.JWT_KEYS_DIR} - tokeny są podpisywane HS256 z SECRET_KEY.',
+        hint='Uruchom: python manage.py rotate_jwt_key',
+        id='authentication.W001',
+    )]
@@ -0,0 +1,196 @@
+"""
+Klucze asymetryczne do podpisywania tokenów JWT (RS256 lub EdDSA) z rotacją.
+
+Klucze prywatne leżą w JWT_KEYS_DIR jako <kid>.pem; kid trafia do nagłówka tokena.
+Tokeny podpisuje najnowszy klucz (kid zaczyna się od daty utworzenia), a weryfikacja
+przyjmuje każdy klucz z katalogu - po rotacji stare tokeny działają do wygaśnięcia.
+Komenda rotate_jwt_key dodaje nowy klucz i usuwa klucze zastąpione dawniej niż
+czas życia tokena odświeżania. Klucze publiczne są publikowane w /.well-known/jwks.json,
+więc frontend i warstwa brzegowa weryfikują tokeny bez zapytania do backendu.
+
+Katalog jest wczytywany ponownie po zmianie jego mtime, więc rotacja nie wymaga
+restartu procesów. Pusty katalog (development, testy) oznacza HS256 z SECRET_KEY.
+"""
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+
+ALGORITHMS = {
+    'RS256': RSAAlgorithm,
+    'EdDSA': OKPAlgorithm,
+}
+FALLBACK_ALGORITHM = 'HS256'
+RSA_KEY_SIZE = 2048
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_key: object
+
+    @property
+    def public_key(self):
+        return self.private_key.public_key()
+
+    def to_jwk(self):
+        jwk = ALGORITHMS[self.algorithm].to_jwk(self.public_key, as_dict=True)
+        return {**jwk, 'kid': self.kid, 'alg': self.algorithm, 'use': 'sig'}
+
+
+def algorithm_for(private_key):
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return 'RS256'
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return 'EdDSA'
+    raise ValueError(f'Nieobsługiwany typ klucza: {type(private_key).__name__}')
+
+
+# ==================== KATALOG KLUCZY ====================
+
+class KeyRing:
+    """Klucze z JWT_KEYS_DIR, wczytywane ponownie po zmianie katalogu"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Stan "nic nie wczytano" - różny także od None (brak katalogu), więc pierwszy odczyt buduje JWKS
+        self._mtime = object()
+        self._keys = {}
+        self._jwks = json.dumps({'keys': []}, sort_keys=True)
+
+    @property
+    def path(self):
+        return settings.JWT_KEYS_DIR
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            keys = {}
+            if mtime is not None:
+                for filename in sorted(os.listdir(self.path)):
+                    kid, extension = os.path.splitext(filename)
+                    if extension != '.pem':
+                        continue
+                    with open(os.path.join(self.path, filename), 'rb') as pem:
+                        private_key = serialization.load_pem_private_key(pem.read(), password=None)
+                    keys[kid] = SigningKey(kid, algorithm_for(private_key), private_key)
+            jwks = json.dumps({'keys': [key.to_jwk() for key in keys.values()]}, sort_keys=True)
+            self._keys, self._jwks, self._mtime = keys, jwks, mtime
+
+    def keys(self):
+        self._refresh()
+        return self._keys
+
+    def active(self):
+        """Klucz do podpisywania - najnowszy (kid zaczyna się od daty utworzenia)"""
+        keys = self.keys()
+        return keys[max(keys)] if keys else None
+
+    def jwks(self):
+        """(treść JWKS, ETag)"""
+        self._refresh()
+        return self._jwks, hashlib.md5(self._jwks.encode()).hexdigest()
+
+    def generate(self, algorithm):
+        """Tworzy nowy klucz; zacznie podpisywać tokeny jako najnowszy"""
+        if algorithm == 'EdDSA':
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=RSA_KEY_SIZE)
+        kid = f'{timezone.now():%Y%m%d%H%M%S}-{os.urandom(4).hex()}'
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+        descriptor = os.open(os.path.join(self.path, f'{kid}.pem'), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, 'wb') as key_file:
+            key_file.write(pem)
+        return kid
+
+    def prune(self, max_age):
+        """
+        Usuwa klucze zastąpione dawniej niż max_age; zwraca usunięte kid.
+        Klucz podpisuje tokeny aż do utworzenia następnego, więc wiek liczy się
+        od utworzenia kolejnego klucza, a nie jego własnego.
+        """
+        now = timezone.now().timestamp()
+        kids = sorted(self.keys())
+        removed = []
+        for kid, successor in zip(kids, kids[1:]):
+            superseded_at = os.path.getmtime(os.path.join(self.path, f'{successor}.pem'))
+            if now - superseded_at > max_age.total_seconds():
+                os.remove(os.path.join(self.path, f'{kid}.pem'))
+                removed.append(kid)
+        return removed
+
+
+keyring = KeyRing()
+
+
+# ==================== BACKEND SIMPLEJWT ====================
+
+class KeyRingTokenBackend(TokenBackend):
+    """TokenBackend podpisujący aktywnym kluczem z kid w nagłówku"""
+
+    def __init__(self):
+        super().__init__(
+            FALLBACK_ALGORITHM, settings.SECRET_KEY, audience=api_settings.AUDIENCE,
+            issuer=api_settings.ISSUER, leeway=api_settings.LEEWAY, json_encoder=api_settings.JSON_ENCODER,
+        )
+
+    def encode(self, payload):
+        key = keyring.active()
+        if key is None:
+            return super().encode(payload)
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload['aud'] = self.audience
+        if self.issuer is not None:
+            jwt_payload['iss'] = self.issuer
+        return jwt.encode(
+            jwt_payload, key.private_key, algorithm=key.algorithm,
+            headers={'kid': key.kid}, json_encoder=self.json_encoder,
+        )
+
+    def decode(self, token, verify=True):
+        keys = keyring.keys()
+        if not keys:
+            return super().decode(token, verify)
+        try:
+            kid = jwt.get_unverified_header(token).get('kid')
+        except jwt.InvalidTokenError as ex:
+            raise TokenBackendError(_('Token is invalid or expired')) from ex
+        key = keys.get(kid)
+        if key is None:
+            raise TokenBackendError(_('Token is invalid or expired'))
+        try:
+            return jwt.decode(
+                token, key.public_key, algorithms=[key.algorithm],
+                audience=self.audience, issuer=self.issuer, leeway=self.get_leeway(),
+                options={'verify_aud': self.audience is not None, 'verify_signature': verify},
+            )
+        except jwt.InvalidAlgorithmError as ex:
+            raise TokenBackendError(_('Invalid algorithm specified')) from ex
+        except jwt.InvalidTokenError as ex:
+            raise TokenBackendError(_('Token is invalid or expired')) from ex
+
+
+token_backend = KeyRingTokenBackend()
@@ -0,0 +1,48 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from authentication.tokens import RoleRefreshToken
+from authentication.views import CustomTokenRefreshView
+
+
+class Command(BaseCommand):
+    help = 'Mierzy czas odświeżenia tokenów (/api/auth/refresh/) i liczbę zapytań do bazy'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError(f'Nie ma użytkownika {options["username"]}')
+
+        view = CustomTokenRefreshView.as_view()
+        factory = RequestFactory()
+        path = reverse('authentication:token_refresh')
+        refresh = str(RoleRefreshToken.for_user(user))
+        timings, queries = [], 0
+        for _ in range(options['iterations']):
+            request = factory.post(path, {'refresh': refresh}, content_type='application/json')
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = view(request)
+                timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f'Odświeżenie nie powiodło się: {response.status_code} {response.data}')
+            # Rotacja - kolejne odświeżenie nowym tokenem, jak robi to frontend
+            refresh = response.data['refresh']
+            queries += len(captured)
+
+        timings.sort()
+        self.stdout.write(f'Odświeżeń: {len(timings)}')
+        self.stdout.write(f'Średnio: {statistics.mean(timings):.2f} ms, mediana: {statistics.median(timings):.2f} ms')
+        self.stdout.write(f'p95: {timings[int(len(timings) * 0.95) - 1]:.2f} ms, max: {timings[-1]:.2f} ms')
+        self.stdout.write(self.style.SUCCESS(f'Zapytania do bazy na odświeżenie: {queries / len(timings):.2f}'))
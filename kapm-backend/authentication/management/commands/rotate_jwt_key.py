@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from authentication.keys import ALGORITHMS, keyring
+
+
+class Command(BaseCommand):
+    help = 'Dodaje nowy klucz podpisujący tokeny JWT i usuwa zastąpione klucze, których tokeny już wygasły'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--algorithm', choices=list(ALGORITHMS), default=settings.JWT_SIGNING_ALGORITHM)
+        parser.add_argument('--if-missing', action='store_true', help='Utwórz klucz tylko, gdy katalog jest pusty')
+        parser.add_argument('--no-prune', action='store_true', help='Nie usuwaj starych kluczy')
+
+    def handle(self, *args, **options):
+        if options['if_missing'] and keyring.active() is not None:
+            self.stdout.write(f'Aktywny klucz: {keyring.active().kid}')
+            return
+
+        kid = keyring.generate(options['algorithm'])
+        self.stdout.write(self.style.SUCCESS(f'Nowy klucz {options["algorithm"]}: {kid}'))
+
+        if not options['no_prune']:
+            # Klucz jest potrzebny, dopóki żyją podpisane nim tokeny - do REFRESH_TOKEN_LIFETIME od zastąpienia
+            removed = keyring.prune(settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'])
+            for old_kid in removed:
+                self.stdout.write(f'Usunięto klucz: {old_kid}')
@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from cms.models import UserProfile
+from core import images
+from . import user_cache
+
+User = get_user_model()
+
+
+# ==================== CACHE UŻYTKOWNIKA ====================
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_user_cache(sender, instance, **kwargs):
+    user_cache.invalidate(instance.user_id)
+
+
+@receiver(images.variants_updated, sender=UserProfile)
+def invalidate_avatar_user_cache(sender, instance, **kwargs):
+    """Warianty awatara są zapisywane przez update() - bez post_save"""
+    user_cache.invalidate(instance.user_id)
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from . import blacklist
+
+
+@shared_task
+def compact_token_blacklist():
+    """Zapisuje migawkę żywych unieważnień tokenów dostępu (bez wygasłych)"""
+    return blacklist.compact()
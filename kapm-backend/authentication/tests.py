@@ -1,3 +1,62 @@
-from django.test import TestCase
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from . import blacklist
+from .keys import KeyRing
+
+
+class TokenRevocationTests(TestCase):
+    """Wylogowanie i rotacja tokenów odświeżania (authentication/blacklist.py)"""
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='jan', password='tajne-haslo-123')
+        response = self.client.post('/api/auth/login/', {'username': 'jan', 'password': 'tajne-haslo-123'})
+        self.assertEqual(response.status_code, 200)
+        self.access = response.data['access']
+        self.refresh = response.data['refresh']
+
+    def auth(self, access):
+        return {'HTTP_AUTHORIZATION': f'Bearer {access}'}
+
+    def test_logout_revokes_access_and_refresh_tokens(self):
+        self.assertEqual(self.client.get('/api/auth/me/', **self.auth(self.access)).status_code, 200)
+
+        response = self.client.post('/api/auth/logout/', {'refresh': self.refresh}, **self.auth(self.access))
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.client.get('/api/auth/me/', **self.auth(self.access)).status_code, 401)
+        self.assertEqual(self.client.post('/api/auth/refresh/', {'refresh': self.refresh}).status_code, 401)
+
+    def test_reused_refresh_token_is_rejected(self):
+        response = self.client.post('/api/auth/refresh/', {'refresh': self.refresh})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data['refresh'], self.refresh)
+
+        self.assertEqual(self.client.post('/api/auth/refresh/', {'refresh': self.refresh}).status_code, 401)
+        # Nowa para z rotacji działa dalej
+        self.assertEqual(self.client.post('/api/auth/refresh/', {'refresh': response.data['refresh']}).status_code, 200)
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = blacklist.BloomFilter(capacity=100, error_rate=0.01)
+        items = [f'jti-{i}' for i in range(100)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+
+
+class JwksTests(TestCase):
+    """Publiczne klucze JWKS (authentication/keys.py)"""
+
+    def test_missing_keys_directory_gives_empty_key_set(self):
+        missing = os.path.join(tempfile.gettempdir(), 'kapm-no-such-jwt-keys')
+        with override_settings(JWT_KEYS_DIR=missing), mock.patch('authentication.views.keyring', KeyRing()):
+            response = self.client.get('/.well-known/jwks.json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'keys': []})
+        self.assertIn('ETag', response)
@@ -0,0 +1,135 @@
+"""
+Tokeny JWT z rolą użytkownika.
+
+Token dostępu zawiera role, is_staff i is_superuser, więc uprawnienia
+(cms/permissions.py) nie muszą czytać profilu z bazy. Przy każdym odświeżeniu
+roszczenia są brane z aktualnego stanu użytkownika (authentication/user_cache.py) -
+zmiana roli dociera do klienta najpóźniej po ACCESS_TOKEN_LIFETIME.
+
+Tokeny odświeżania trafiają na czarną listę w cache (authentication/blacklist.py)
+po rotacji i przy wylogowaniu. Odświeżenie to jeden odczyt użytkownika z cache
+i jeden atomowy zapis na czarną listę - bez zapytań do bazy.
+
+Tokeny są podpisywane kluczami z authentication/keys.py (RS256/EdDSA z rotacją).
+"""
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken as BaseAccessToken, RefreshToken
+
+from . import blacklist, keys, user_cache
+
+ROLE_CLAIMS = ('role', 'is_staff', 'is_superuser')
+ANONYMOUS_CLAIMS = {'role': None, 'is_staff': False, 'is_superuser': False}
+
+
+def role_claims(user):
+    profile = getattr(user, 'profile', None)
+    return {
+        'role': profile.role if profile is not None else None,
+        'is_staff': user.is_staff,
+        'is_superuser': user.is_superuser,
+    }
+
+
+def user_summary(user):
+    return {'id': user.id, 'username': user.username, 'email': user.email}
+
+
+def request_claims(request):
+    """
+    Rola i flagi z tokena dostępu. Żądania bez takiego tokena (sesja, tokeny
+    wydane przed dodaniem roszczeń) korzystają z użytkownika i profilu.
+    """
+    token = getattr(request, 'auth', None)
+    if token is not None and all(claim in token for claim in ROLE_CLAIMS):
+        return {claim: token[claim] for claim in ROLE_CLAIMS}
+    if not request.user.is_authenticated:
+        return dict(ANONYMOUS_CLAIMS)
+    return role_claims(request.user)
+
+
+class AccessToken(BaseAccessToken):
+    _token_backend = keys.token_backend
+
+
+class RoleRefreshToken(RefreshToken):
+    """RefreshToken, którego tokeny dostępu niosą aktualną rolę użytkownika"""
+    _token_backend = keys.token_backend
+    access_token_class = AccessToken
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.user = user
+        for claim, value in role_claims(user).items():
+            token[claim] = value
+        return token
+
+    @cached_property
+    def user(self):
+        """Właściciel tokena z authentication/user_cache.py albo None"""
+        return user_cache.get_user(self[api_settings.USER_ID_CLAIM])
+
+    def verify(self, *args, **kwargs):
+        self.check_blacklist()
+        super().verify(*args, **kwargs)
+
+    def check_blacklist(self):
+        if blacklist.contains(self):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        """Dodaje token do czarnej listy; False, jeśli już na niej był"""
+        return blacklist.add(self)
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        claims = role_claims(self.user) if self.user is not None else ANONYMOUS_CLAIMS
+        for claim, value in claims.items():
+            access[claim] = value
+        return access
+
+
+class RotatedRefreshToken(RoleRefreshToken):
+    """
+    Token przy odświeżaniu z rotacją - ponowne użycie wykrywa atomowe blacklist(),
+    więc weryfikacja pomija odczyt czarnej listy.
+    """
+
+    def check_blacklist(self):
+        pass
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Odświeżenie z danymi użytkownika w odpowiedzi. Użytkownik potrzebny do roszczeń
+    jest brany raz z cache (RoleRefreshToken.user) i służy też do podsumowania.
+    """
+    token_class = RoleRefreshToken
+    user = serializers.DictField(read_only=True)
+
+    def validate(self, attrs):
+        rotate = api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION
+        token_class = RotatedRefreshToken if rotate else self.token_class
+        refresh = token_class(attrs['refresh'])
+        user = refresh.user
+        if user is None or not user.is_active:
+            raise AuthenticationFailed(_('No active account found with the given credentials'), code='no_active_account')
+
+        data = {'access': str(refresh.access_token), 'user': user_summary(user)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # add() jest atomowe - z równoległych odświeżeń tym samym tokenem przechodzi jedno
+            if rotate and not refresh.blacklist():
+                raise TokenError(_('Token is blacklisted'))
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        return data
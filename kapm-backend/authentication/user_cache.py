@@ -0,0 +1,72 @@
+"""
+Cache użytkownika razem z profilem dla uwierzytelniania JWT.
+
+Rekord zawiera pola User (bez hasła) i UserProfile, a klucz - numer wersji
+podbijany przy każdym zapisie lub usunięciu User/UserProfile (authentication/signals.py),
+w tym przy zmianie hasła. Odtworzony użytkownik ma profil w cache relacji, więc
+user.profile i hasattr(user, 'profile') nie wykonują zapytań. Hasło jest polem
+odroczonym - wczytuje się dopiero przy odczycie (np. check_password), a save()
+zapisuje wtedy tylko wczytane pola.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from rest_framework_simplejwt.settings import api_settings
+
+from cms.models import UserProfile
+
+VERSION_KEY = 'auth:user:{pk}:version'
+RECORD_KEY = 'auth:user:{pk}:v{version}'
+EXCLUDED_FIELDS = {'password'}
+
+
+def _get_version(pk):
+    key = VERSION_KEY.format(pk=pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def invalidate(pk):
+    try:
+        cache.incr(VERSION_KEY.format(pk=pk))
+    except ValueError:
+        cache.set(VERSION_KEY.format(pk=pk), 2, None)
+
+
+def _dump(instance, exclude=()):
+    names = [field.attname for field in instance._meta.concrete_fields if field.attname not in exclude]
+    return names, [getattr(instance, name) for name in names]
+
+
+def _load(model, record):
+    names, values = record
+    return model.from_db(router.db_for_read(model), names, values)
+
+
+def get_user(user_id):
+    """Użytkownik o podanym identyfikatorze (USER_ID_FIELD) albo None"""
+    User = get_user_model()
+    key = RECORD_KEY.format(pk=user_id, version=_get_version(user_id))
+    record = cache.get(key)
+    if record is None:
+        user = User.objects.select_related('profile').filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None:
+            return None
+        profile = getattr(user, 'profile', None)
+        record = {
+            'user': _dump(user, EXCLUDED_FIELDS),
+            'profile': _dump(profile) if profile is not None else None,
+        }
+        cache.set(key, record, settings.AUTH_USER_CACHE_TIMEOUT)
+
+    user = _load(User, record['user'])
+    profile = _load(UserProfile, record['profile']) if record['profile'] else None
+    # Relacja w obie strony z cache - bez zapytań przy user.profile i profile.user
+    UserProfile.user.field.remote_field.set_cached_value(user, profile)
+    if profile is not None:
+        UserProfile.user.field.set_cached_value(profile, user)
+    return user
@@ -1,13 +1,20 @@
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.views.decorators.http import require_safe
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.exceptions import TokenError
 
+from . import blacklist
+from .keys import keyring
+from .tokens import AccessToken, RoleRefreshToken
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -28,7 +35,7 @@ def login_view(request):
 
     if user is not None and user.is_active:
         # Generuj tokeny JWT
-        refresh = RefreshToken.for_user(user)
+        refresh = RoleRefreshToken.for_user(user)
 
         # Pobierz profil użytkownika jeśli istnieje
         profile_data = {}
@@ -118,7 +125,7 @@ def register_view(request):
     )
 
     # Generuj tokeny
-    refresh = RefreshToken.for_user(user)
+    refresh = RoleRefreshToken.for_user(user)
 
     return Response({
         'access': str(refresh.access_token),
@@ -137,13 +144,15 @@ def register_view(request):
 @permission_classes([IsAuthenticated])
 def logout_view(request):
     """
-    Logout - blacklistuje refresh token
+    Logout - blacklistuje refresh token i unieważnia bieżący token dostępu
     """
     try:
         refresh_token = request.data.get('refresh')
         if refresh_token:
-            token = RefreshToken(refresh_token)
+            token = RoleRefreshToken(refresh_token)
             token.blacklist()
+            if isinstance(request.auth, AccessToken):
+                blacklist.revoke(request.auth)
             return Response({'message': 'Wylogowano pomyślnie'}, status=status.HTTP_200_OK)
         else:
             return Response(
@@ -271,7 +280,7 @@ def change_password_view(request):
     user.save()
 
     # Generuj nowe tokeny po zmianie hasła
-    refresh = RefreshToken.for_user(user)
+    refresh = RoleRefreshToken.for_user(user)
 
     return Response({
         'message': 'Hasło zmienione pomyślnie',
@@ -280,27 +289,23 @@ def change_password_view(request):
     })
 
 
-# Rozszerzenie TokenRefreshView o dodatkowe dane
 class CustomTokenRefreshView(TokenRefreshView):
-    def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-
-        # Jeśli refresh się powiódł, dodaj dane użytkownika
-        if response.status_code == 200:
-            # Pobierz user_id z tokenu
-            refresh_token = request.data.get('refresh')
-            if refresh_token:
-                try:
-                    token = RefreshToken(refresh_token)
-                    user_id = token.payload.get('user_id')
-                    if user_id:
-                        user = User.objects.get(pk=user_id)
-                        response.data['user'] = {
-                            'id': user.id,
-                            'username': user.username,
-                            'email': user.email,
-                        }
-                except (User.DoesNotExist, TokenError):
-                    pass
-
-        return response
+    """
+    Odświeżenie tokenów z danymi użytkownika (id, username, email) w odpowiedzi -
+    dane przychodzą z RoleTokenRefreshSerializer, bez ponownego dekodowania tokena.
+    """
+
+
+@require_safe
+def jwks_view(request):
+    """
+    Klucze publiczne do lokalnej weryfikacji tokenów dostępu (JWKS, RFC 7517)
+    """
+    content, etag = keyring.jwks()
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type='application/jwk-set+json')
+    response['ETag'] = etag
+    response['Cache-Control'] = f'public, max-age={settings.JWKS_MAX_AGE}'
+    return response
@@ -5,32 +5,25 @@ from .models import (
     BlogPost, Category, Tag, Page, MediaFile,
     UserProfile, Comment
 )
+from . import counters, dashboard, syndication
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'slug', 'parent', 'is_active', 'posts_count', 'created_at']
+    list_display = ['name', 'slug', 'parent', 'is_active', 'published_posts_count', 'created_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
     ordering = ['name']
 
-    def posts_count(self, obj):
-        return obj.posts.count()
-    posts_count.short_description = 'Liczba postów'
-
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = ['name', 'slug', 'posts_count', 'created_at']
+    list_display = ['name', 'slug', 'published_posts_count', 'created_at']
     search_fields = ['name']
     prepopulated_fields = {'slug': ('name',)}
     ordering = ['name']
 
-    def posts_count(self, obj):
-        return obj.posts.count()
-    posts_count.short_description = 'Liczba postów'
-
 
 class CommentInline(admin.TabularInline):
     model = Comment
@@ -76,6 +69,7 @@ class BlogPostAdmin(admin.ModelAdmin):
     def status_badge(self, obj):
         colors = {
             'draft': 'orange',
+            'scheduled': 'blue',
             'published': 'green',
             'archived': 'red'
         }
@@ -97,11 +91,17 @@ class BlogPostAdmin(admin.ModelAdmin):
 
     def make_published(self, request, queryset):
         updated = queryset.update(status='published', published_at=timezone.now())
+        counters.rebuild()  # update() omija sygnały aktualizujące liczniki
+        dashboard.mark_stale()
+        syndication.invalidate_all()
         self.message_user(request, f'{updated} postów zostało opublikowanych.')
     make_published.short_description = 'Opublikuj zaznaczone posty'
 
     def make_draft(self, request, queryset):
         updated = queryset.update(status='draft')
+        counters.rebuild()
+        dashboard.mark_stale()
+        syndication.invalidate_all()
         self.message_user(request, f'{updated} postów zostało przeniesionych do szkiców.')
     make_draft.short_description = 'Przenieś do szkiców'
 
@@ -137,11 +137,13 @@ class PageAdmin(admin.ModelAdmin):
 
     def publish_pages(self, request, queryset):
         updated = queryset.update(is_published=True)
+        syndication.invalidate_all()
         self.message_user(request, f'{updated} stron zostało opublikowanych.')
     publish_pages.short_description = 'Opublikuj strony'
 
     def unpublish_pages(self, request, queryset):
         updated = queryset.update(is_published=False)
+        syndication.invalidate_all()
         self.message_user(request, f'{updated} stron zostało ukrytych.')
     unpublish_pages.short_description = 'Ukryj strony'
 
@@ -212,11 +214,13 @@ class CommentAdmin(admin.ModelAdmin):
 
     def approve_comments(self, request, queryset):
         updated = queryset.update(is_approved=True)
+        dashboard.mark_stale()
         self.message_user(request, f'{updated} komentarzy zostało zatwierdzonych.')
     approve_comments.short_description = 'Zatwierdź komentarze'
 
     def reject_comments(self, request, queryset):
         updated = queryset.update(is_approved=False)
+        dashboard.mark_stale()
         self.message_user(request, f'{updated} komentarzy zostało odrzuconych.')
     reject_comments.short_description = 'Odrzuć komentarze'
 
@@ -0,0 +1,151 @@
+"""
+Statystyki wyświetleń postów w przedziałach czasu.
+
+Zadanie flush_view_counts przekazuje tu zbuforowane przyrosty - każdy trafia
+naraz do przedziału godzinowego, dziennego i miesięcznego (zbiorczy upsert).
+Stare wiersze godzinowe i dzienne usuwa compact(), miesięczne zostają na stałe.
+Zapytania o okno czasu składają wynik z najgrubszych przedziałów mieszczących się w oknie;
+części okna sprzed okresu przechowywania są rozszerzane do pełnych dni lub miesięcy.
+Przedziały zaczynają się w lokalnej strefie czasowej, a arytmetyka idzie w UTC.
+"""
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from .models import PostViewStat
+
+GRANULARITIES = ('hour', 'day', 'month')
+
+
+def floor_bucket(moment, granularity):
+    """Początek przedziału zawierającego moment (w lokalnej strefie czasowej)"""
+    moment = timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+    if granularity in ('day', 'month'):
+        moment = moment.replace(hour=0)
+    if granularity == 'month':
+        moment = moment.replace(day=1)
+    return moment
+
+
+def next_bucket(bucket, granularity):
+    """Początek następnego przedziału - liczony w UTC, żeby zmiana czasu nie przesuwała przedziałów"""
+    bucket = bucket.astimezone(dt_timezone.utc)
+    if granularity == 'hour':
+        return timezone.localtime(bucket + timedelta(hours=1))
+    if granularity == 'day':
+        # Doba lokalna ma 23-25 godzin - 36 godzin później to zawsze następny dzień
+        return floor_bucket(bucket + timedelta(hours=36), 'day')
+    return floor_bucket(bucket + timedelta(days=32), 'month')
+
+
+def ceil_bucket(moment, granularity):
+    bucket = floor_bucket(moment, granularity)
+    return bucket if bucket == moment else next_bucket(bucket, granularity)
+
+
+@transaction.atomic
+def record_views(pending, at=None):
+    """
+    Dolicza przyrosty {pk posta: liczba wyświetleń} do przedziałów zawierających `at`.
+    Brakujące wiersze są wstawiane z zerem (ignore_conflicts - równoległy flush nie kończy
+    się błędem unikalności), a potem każda grupa postów z tym samym przyrostem dostaje
+    jeden UPDATE z F() we wszystkich przedziałach naraz.
+    Wywoływane w transakcji view_counter.flush - błąd cofa też zapis BlogPost.views_count.
+    """
+    if not pending:
+        return
+    at = at or timezone.now()
+
+    buckets = {granularity: floor_bucket(at, granularity) for granularity in GRANULARITIES}
+    PostViewStat.objects.bulk_create(
+        [
+            PostViewStat(post_id=post_id, granularity=granularity, bucket=bucket, views=0)
+            for granularity, bucket in buckets.items() for post_id in pending
+        ],
+        ignore_conflicts=True,
+    )
+
+    in_buckets = Q()
+    for granularity, bucket in buckets.items():
+        in_buckets |= Q(granularity=granularity, bucket=bucket)
+    by_delta = defaultdict(list)
+    for post_id, delta in pending.items():
+        by_delta[delta].append(post_id)
+    for delta, post_ids in by_delta.items():
+        PostViewStat.objects.filter(in_buckets, post_id__in=post_ids).update(views=F('views') + delta)
+
+
+def retention_cutoffs(now=None):
+    """Początki najstarszych zachowanych przedziałów godzinowych i dziennych"""
+    now = now or timezone.now()
+    return (
+        floor_bucket(now - timedelta(days=settings.ANALYTICS_HOURLY_RETENTION_DAYS), 'day'),
+        floor_bucket(now - timedelta(days=settings.ANALYTICS_DAILY_RETENTION_DAYS), 'month'),
+    )
+
+
+def compact(now=None):
+    """Usuwa wiersze godzinowe i dzienne starsze niż okres przechowywania"""
+    hourly_cutoff, daily_cutoff = retention_cutoffs(now)
+    hourly = PostViewStat.objects.filter(granularity='hour', bucket__lt=hourly_cutoff).delete()[0]
+    daily = PostViewStat.objects.filter(granularity='day', bucket__lt=daily_cutoff).delete()[0]
+    return hourly, daily
+
+
+def window_filter(start, end, now=None):
+    """
+    Warunek pokrywający okno [start, end) rozłącznymi przedziałami:
+    pełne miesiące, potem pełne dni poza nimi, a resztę godzinami.
+    Okno jest rozszerzane do pełnych godzin - to najmniejszy przechowywany przedział -
+    a krawędź sprzed okresu przechowywania do pełnych dni lub miesięcy (wiersze
+    godzinowe i dzienne usunął już compact()).
+    """
+    start, end = floor_bucket(start, 'hour'), ceil_bucket(end, 'hour')
+    hourly_cutoff, daily_cutoff = retention_cutoffs(now)
+    for cutoff, granularity in ((hourly_cutoff, 'day'), (daily_cutoff, 'month')):
+        if start < cutoff:
+            start = floor_bucket(start, granularity)
+        if end < cutoff:
+            end = ceil_bucket(end, granularity)
+    if start >= end:
+        return Q(pk__in=[])
+
+    day_start, day_end = ceil_bucket(start, 'day'), floor_bucket(end, 'day')
+    if day_start >= day_end:
+        return Q(granularity='hour', bucket__gte=start, bucket__lt=end)
+
+    month_start, month_end = ceil_bucket(start, 'month'), floor_bucket(end, 'month')
+    hours = (Q(granularity='hour', bucket__gte=start, bucket__lt=day_start)
+             | Q(granularity='hour', bucket__gte=day_end, bucket__lt=end))
+    if month_start >= month_end:
+        return hours | Q(granularity='day', bucket__gte=day_start, bucket__lt=day_end)
+
+    return (
+        hours
+        | Q(granularity='day', bucket__gte=day_start, bucket__lt=month_start)
+        | Q(granularity='day', bucket__gte=month_end, bucket__lt=day_end)
+        | Q(granularity='month', bucket__gte=month_start, bucket__lt=month_end)
+    )
+
+
+def top_posts(start, end, limit=10):
+    """Posty z największą liczbą wyświetleń w oknie - jedno zapytanie agregujące"""
+    return list(
+        PostViewStat.objects.filter(window_filter(start, end))
+        .values('post_id', 'post__title', 'post__slug')
+        .annotate(total_views=Sum('views'))
+        .order_by('-total_views', 'post_id')[:limit]
+    )
+
+
+def post_series(post_id, granularity, start, end):
+    """Szereg czasowy wyświetleń posta na wybranym poziomie szczegółowości"""
+    return list(
+        PostViewStat.objects.filter(
+            post_id=post_id, granularity=granularity, bucket__gte=start, bucket__lt=end
+        ).order_by('bucket').values('bucket', 'views')
+    )
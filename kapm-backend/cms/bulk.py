@@ -0,0 +1,108 @@
+"""
+Operacje masowe na postach (AdminBlogPostViewSet.bulk).
+
+Zmiana jest jednym UPDATE (albo jednym INSERT/DELETE w tabeli tagów) w transakcji,
+z pominięciem save() i sygnałów - dlatego skutki uboczne, które normalnie obsługują
+sygnały (cms/signals.py), są wykonywane tutaj zbiorczo: liczniki kategorii i tagów,
+cache odpowiedzi, mapa witryny i kanały, powiązane posty i dashboard.
+
+Uprawnienia są sprawdzane dla każdego posta jak w IsAuthorOrAdmin; wynik dla każdego
+identyfikatora to 'updated', 'forbidden' albo 'not_found'.
+"""
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import cache, counters, dashboard, related, syndication
+from .models import BlogPost, Category, Tag
+
+UPDATED = 'updated'
+FORBIDDEN = 'forbidden'
+NOT_FOUND = 'not_found'
+
+STATUS_ACTIONS = {
+    'publish': 'published',
+    'unpublish': 'draft',
+    'archive': 'archived',
+}
+ACTIONS = [*STATUS_ACTIONS, 'set_category', 'add_tags', 'remove_tags']
+MAX_IDS = 1000
+
+
+def can_edit(user, author_id):
+    """Odpowiednik IsAuthorOrAdmin.has_object_permission dla metod zapisu"""
+    return user.is_superuser or author_id == user.pk
+
+
+def apply(queryset, user, action, ids, category=None, tags=()):
+    """
+    Wykonuje akcję na postach o podanych ids widocznych w queryset.
+    Zwraca (liczba zmienionych postów, [{'id': ..., 'status': ...}]).
+    """
+    ids = list(dict.fromkeys(ids))
+    visible = dict(queryset.filter(pk__in=ids).values_list('pk', 'author_id'))
+    allowed = [pk for pk in ids if pk in visible and can_edit(user, visible[pk])]
+    results = [
+        {'id': pk, 'status': UPDATED if pk in allowed else FORBIDDEN if pk in visible else NOT_FOUND}
+        for pk in ids
+    ]
+    if not allowed:
+        return 0, results
+
+    posts = BlogPost.objects.filter(pk__in=allowed)
+    requested_tag_pks = [tag.pk for tag in tags]
+    status_changed = action in STATUS_ACTIONS
+    with transaction.atomic():
+        # Stan sprzed zmiany - do przeliczenia liczników i fragmentów mapy witryny
+        category_pks = set(posts.values_list('category_id', flat=True))
+        tag_pks = set(requested_tag_pks).union(
+            BlogPost.tags.through.objects.filter(blogpost_id__in=allowed).values_list('tag_id', flat=True)
+        )
+        old_shards = _shards(posts) if status_changed else set()
+        now = timezone.now()
+
+        if status_changed:
+            fields = {'status': STATUS_ACTIONS[action], 'updated_at': now}
+            if action == 'publish':
+                # Jak BlogPost.save - data w przyszłości oznacza publikację zaplanowaną
+                fields['published_at'] = Coalesce(F('published_at'), Value(now))
+                fields['status'] = Case(
+                    When(published_at__gt=now, then=Value('scheduled')), default=Value('published')
+                )
+            posts.update(**fields)
+        elif action == 'set_category':
+            posts.update(category=category, updated_at=now)
+            category_pks.add(category.pk if category else None)
+        elif action == 'add_tags':
+            Through = BlogPost.tags.through
+            Through.objects.bulk_create(
+                [Through(blogpost_id=pk, tag_id=tag_pk) for pk in allowed for tag_pk in requested_tag_pks],
+                ignore_conflicts=True,
+            )
+            posts.update(updated_at=now)
+        elif action == 'remove_tags':
+            BlogPost.tags.through.objects.filter(blogpost_id__in=allowed, tag_id__in=requested_tag_pks).delete()
+            posts.update(updated_at=now)
+        else:
+            raise ValueError(f'Nieznana akcja: {action}')
+
+        counters.rebuild(
+            categories=Category.objects.filter(pk__in=category_pks - {None}),
+            tags=Tag.objects.filter(pk__in=tag_pks),
+        )
+        if status_changed:
+            syndication.schedule(syndication.affected_documents(old_shards | _shards(posts)))
+        transaction.on_commit(lambda: _after_commit(allowed, status_changed))
+        related.schedule()
+    return len(allowed), results
+
+
+def _shards(posts):
+    return {syndication.document_shard(post) for post in posts.only(*syndication.shard_fields(BlogPost))}
+
+
+def _after_commit(pks, status_changed):
+    cache.invalidate_posts(pks)
+    if status_changed:
+        dashboard.mark_stale()
@@ -0,0 +1,153 @@
+"""
+Wersjonowany cache odpowiedzi publicznego API bloga.
+
+Klucze zawierają numer wersji - zamiast usuwać wpisy, sygnały podbijają
+wersję, a stare odpowiedzi same wygasają po CMS_CACHE_TIMEOUT.
+Lista ma jedną wspólną wersję, szczegóły posta - wersję per post. Obok wersji
+zapisywany jest czas jej ostatniej zmiany - nagłówek Last-Modified bez zapytania do bazy.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+from rest_framework.response import Response
+
+LIST_VERSION_KEY = 'cms:blog:list:version'
+DETAIL_VERSION_KEY = 'cms:blog:detail:{pk}:version'
+STATS_KEY = 'cms:blog:stats:{name}'
+MODIFIED_SUFFIX = ':modified'
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key + MODIFIED_SUFFIX, time.time(), None)
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+    cache.set(key + MODIFIED_SUFFIX, time.time(), None)
+
+
+def _get_modified(key):
+    modified = cache.get(key + MODIFIED_SUFFIX)
+    if modified is None:
+        # Brak wpisu (np. wyczyszczony cache) - ostrożnie "teraz", nigdy za wcześnie
+        cache.add(key + MODIFIED_SUFFIX, time.time(), None)
+        modified = cache.get(key + MODIFIED_SUFFIX, time.time())
+    return modified
+
+
+def _incr_stat(name):
+    key = STATS_KEY.format(name=name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def build_key(request, action, pk=None):
+    """Buduje klucz z akcji, wersji, języka i parametrów zapytania"""
+    version = get_version_token(pk)
+    params = sorted(request.query_params.lists())
+    digest = hashlib.md5(repr((request.path, params)).encode()).hexdigest()
+    language = getattr(request, 'LANGUAGE_CODE', None) or get_language()
+    return f'cms:blog:{action}:{pk or "-"}:v{version}:{language}:{digest}'
+
+
+def get_version_token(pk=None):
+    """Bieżąca wersja listy lub szczegółów posta - do walidatorów ETag"""
+    if pk is None:
+        return _get_version(LIST_VERSION_KEY)
+    return _get_version(DETAIL_VERSION_KEY.format(pk=pk))
+
+
+def get_last_modified(pk=None):
+    """Czas ostatniej zmiany wersji listy lub szczegółów posta - do nagłówka Last-Modified"""
+    key = LIST_VERSION_KEY if pk is None else DETAIL_VERSION_KEY.format(pk=pk)
+    return datetime.fromtimestamp(_get_modified(key), tz=timezone.utc)
+
+
+def get_cached(key):
+    """Zwraca zapisane dane odpowiedzi i aktualizuje liczniki hit/miss"""
+    data = cache.get(key)
+    _incr_stat('hits' if data is not None else 'misses')
+    return data
+
+
+def set_cached(key, data):
+    cache.set(key, data, settings.CMS_CACHE_TIMEOUT)
+
+
+def invalidate_list():
+    _bump_version(LIST_VERSION_KEY)
+
+
+def invalidate_posts(pks):
+    """Unieważnia listy oraz szczegóły wskazanych postów"""
+    invalidate_list()
+    invalidate_details(pks)
+
+
+def invalidate_details(pks):
+    """Unieważnia tylko szczegóły wskazanych postów (listy zostają)"""
+    for pk in pks:
+        _bump_version(DETAIL_VERSION_KEY.format(pk=pk))
+
+
+def get_stats():
+    hits = cache.get(STATS_KEY.format(name='hits'), 0)
+    misses = cache.get(STATS_KEY.format(name='misses'), 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+        'list_version': _get_version(LIST_VERSION_KEY),
+    }
+
+
+class CachedResponseMixin:
+    """
+    Mixin dla ReadOnlyModelViewSet - cache'uje dane odpowiedzi list i szczegółów.
+    Cache'owane są tylko odpowiedzi 200 na żądania GET - dane publiczne
+    nie zależą od zalogowanego użytkownika.
+    """
+
+    def should_cache(self, request):
+        return request.method == 'GET'
+
+    def cached_response(self, request, action, render, pk=None):
+        if not self.should_cache(request):
+            return render()
+
+        key = build_key(request, action, pk)
+        data = get_cached(key)
+        if data is not None:
+            return Response(data)
+
+        response = render()
+        if response.status_code == 200:
+            set_cached(key, response.data)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, 'list', lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return self.cached_response(
+            request, 'retrieve', lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs), pk=pk
+        )
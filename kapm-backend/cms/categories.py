@@ -0,0 +1,63 @@
+"""
+Drzewo kategorii.
+
+Category.path (ścieżka zmaterializowana, cms/paths.py) pozwala wybrać posty całego
+poddrzewa jednym zapytaniem: category__path__startswith=<ścieżka kategorii>.
+Drzewo aktywnych kategorii budowane jest jednym zapytaniem i trzymane w cache
+do następnej zmiany kategorii lub licznika postów (cms/signals.py, cms/counters.py).
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Category
+
+TREE_KEY = 'cms:categories:tree'
+
+
+def build_tree():
+    """
+    Zwraca {'tree': [węzły główne], 'paths': {slug: ścieżka}} dla aktywnych kategorii.
+    Podkategorie nieaktywnej kategorii są pomijane razem z nią.
+    """
+    nodes = {}
+    roots = []
+    paths = {}
+    rows = Category.objects.filter(is_active=True).order_by('depth', 'name').values(
+        'id', 'name', 'slug', 'description', 'parent_id', 'path', 'depth', 'published_posts_count'
+    )
+    for row in rows:
+        parent_id, path = row.pop('parent_id'), row.pop('path')
+        if parent_id is not None and parent_id not in nodes:
+            continue
+        node = dict(row, posts_count=row.pop('published_posts_count'), children=[])
+        nodes[node['id']] = node
+        paths[node['slug']] = path
+        (nodes[parent_id]['children'] if parent_id is not None else roots).append(node)
+
+    # Liczba postów w całym poddrzewie - od najgłębszych węzłów w górę
+    for node in sorted(nodes.values(), key=lambda node: -node['depth']):
+        node['tree_posts_count'] = node['posts_count'] + sum(
+            child['tree_posts_count'] for child in node['children']
+        )
+    return {'tree': roots, 'paths': paths}
+
+
+def _get_cached_tree():
+    data = cache.get(TREE_KEY)
+    if data is None:
+        data = build_tree()
+        cache.set(TREE_KEY, data, settings.CMS_CACHE_TIMEOUT)
+    return data
+
+
+def get_tree():
+    return _get_cached_tree()['tree']
+
+
+def get_path(slug):
+    """Ścieżka aktywnej kategorii o podanym slugu (None, jeśli nie ma takiej)"""
+    return _get_cached_tree()['paths'].get(slug)
+
+
+def invalidate_tree():
+    cache.delete(TREE_KEY)
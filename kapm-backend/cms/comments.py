@@ -0,0 +1,49 @@
+"""
+Drzewo komentarzy budowane w pamięci.
+
+Wszystkie zatwierdzone odpowiedzi dla strony wątków pobierane są jednym zapytaniem
+po ścieżce zmaterializowanej (Comment.path), a następnie grupowane wg rodzica.
+Odpowiedzi na niezatwierdzone komentarze są pomijane razem z ich poddrzewem.
+"""
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from .models import Comment
+
+
+def build_tree(roots, max_depth=None):
+    """
+    Zwraca słownik {id rodzica: [odpowiedzi]} dla poddrzew podanych komentarzy.
+    max_depth ogranicza liczbę poziomów odpowiedzi pod każdym z korzeni.
+    """
+    # Komentarz bez ścieżki nie ma wskazywalnego poddrzewa (pusta ścieżka pasowałaby do wszystkich)
+    roots = [root for root in roots if root.path]
+    if not roots:
+        return {}
+
+    queryset = Comment.objects.filter(
+        reduce(or_, (Q(path__startswith=root.path) for root in roots)),
+        is_approved=True,
+    ).exclude(pk__in=[root.pk for root in roots]).select_related('author').order_by('-created_at')
+
+    if max_depth is not None:
+        queryset = queryset.filter(depth__lte=max(root.depth for root in roots) + max_depth)
+
+    children = defaultdict(list)
+    for comment in queryset:
+        children[comment.parent_id].append(comment)
+
+    # Tylko węzły osiągalne od korzeni przez zatwierdzone komentarze w limicie głębokości
+    tree = {}
+    stack = [(root, 0) for root in roots]
+    while stack:
+        node, level = stack.pop()
+        if max_depth is not None and level >= max_depth:
+            tree[node.pk] = []
+            continue
+        tree[node.pk] = children.get(node.pk, [])
+        stack.extend((child, level + 1) for child in tree[node.pk])
+    return tree
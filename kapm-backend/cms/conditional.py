@@ -0,0 +1,103 @@
+"""
+Warunkowe GET (ETag / Last-Modified) dla publicznych endpointów CMS.
+
+Walidatory liczone są jednym lekkim zapytaniem - dla list MAX(updated_at), COUNT
+i SUM liczników po przefiltrowanym querysecie, dla szczegółów updated_at jednego
+wiersza - więc odpowiedź 304 nie wymaga serializacji.
+Widoki z cache odpowiedzi (cms/cache.py) biorą ETag i Last-Modified z wersji cache;
+szczegóły sprawdzają jeszcze tylko, czy obiekt jest publicznie dostępny.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from django.utils.translation import get_language
+
+
+class ConditionalGetMixin:
+    """
+    Mixin dla ReadOnlyModelViewSet.
+
+    conditional_extra_fields - liczniki wpływające na odpowiedź; ich zmiana musi
+    też przesuwać updated_at (suma nie zauważy przeniesienia między wierszami).
+    etag_from_version - ETag z get_etag_extra, a Last-Modified z
+    get_version_last_modified (wersja cache odpowiedzi), bez agregatów w bazie.
+    """
+    conditional_extra_fields = ()
+    etag_from_version = False
+
+    def get_etag_extra(self, request, pk=None):
+        """Dodatkowe składniki ETag (np. wersja cache) - do nadpisania w widoku"""
+        return None
+
+    def get_version_last_modified(self, request, pk=None):
+        """Czas zmiany wersji cache (dla etag_from_version) - do nadpisania w widoku"""
+        return None
+
+    def get_list_validators(self, request):
+        if self.etag_from_version:
+            return self.get_version_last_modified(request), {}
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        state = queryset.aggregate(
+            last_modified=Max('updated_at'), count=Count('pk'),
+            **{field: Sum(field) for field in self.conditional_extra_fields},
+        )
+        return state.pop('last_modified'), state
+
+    def get_detail_validators(self, request, lookup):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        try:
+            queryset = queryset.filter(**{self.lookup_field: lookup})
+            if self.etag_from_version:
+                # Tylko potwierdzenie, że obiekt jest publiczny - reszta stanu w wersji cache
+                pk = queryset.values_list('pk', flat=True).first()
+                if pk is None:
+                    return None, None
+                return self.get_version_last_modified(request, pk), {'pk': pk}
+            state = queryset.values('updated_at', *self.conditional_extra_fields).first()
+        except (ValueError, TypeError, ValidationError):
+            return None, None  # Niepoprawny identyfikator - 404 ze standardowego retrieve
+        if state is None:
+            return None, None
+        return state.pop('updated_at'), state
+
+    def conditional_response(self, request, render, lookup=None):
+        if request.method not in ('GET', 'HEAD'):
+            return render()
+
+        if lookup is None:
+            last_modified, state = self.get_list_validators(request)
+        else:
+            last_modified, state = self.get_detail_validators(request, lookup)
+            if state is None:
+                return render()  # 404 obsługuje standardowy retrieve
+        self.conditional_state = state
+
+        fingerprint = repr((
+            last_modified, sorted(state.items()), self.get_etag_extra(request, state.get('pk', lookup)),
+            request.get_full_path(), get_language(), request.accepted_media_type,
+        ))
+        etag = quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return self.conditional_response(
+            request, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs), lookup
+        )
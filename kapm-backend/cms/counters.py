@@ -0,0 +1,93 @@
+"""
+Zdenormalizowane liczniki opublikowanych postów dla Category i Tag.
+
+Liczniki są aktualizowane przyrostowo przez sygnały (cms/signals.py),
+a rebuild() przelicza je od zera - używa go komenda rebuild_post_counts
+oraz operacje masowe omijające sygnały. Każda zmiana licznika przesuwa też
+updated_at - walidatory warunkowego GET (cms/conditional.py) opierają się na MAX(updated_at).
+"""
+from django.db.models import DEFERRED, Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Now
+
+from . import categories as category_tree
+from .models import BlogPost, Category, Tag
+
+PUBLISHED = 'published'
+
+
+def _adjust(model, pks, delta):
+    pks = [pk for pk in pks if pk]
+    if pks and delta:
+        model.objects.filter(pk__in=pks).update(
+            published_posts_count=F('published_posts_count') + delta, updated_at=Now(),
+        )
+        if model is Category:
+            # Drzewo kategorii w cache zawiera liczniki postów
+            category_tree.invalidate_tree()
+
+
+def _loaded_state(post):
+    """Zwraca (status, category_id) posta sprzed zmian"""
+    loaded = getattr(post, '_loaded_values', {})
+    if 'status' in loaded and 'category_id' in loaded and not any(
+        value is DEFERRED for value in (loaded['status'], loaded['category_id'])
+    ):
+        return loaded['status'], loaded['category_id']
+    old = BlogPost.objects.filter(pk=post.pk).values_list('status', 'category_id').first()
+    return old or (None, None)
+
+
+def post_saved(post, created):
+    old_status, old_category_id = (None, None) if created else _loaded_state(post)
+    was_published = old_status == PUBLISHED
+    is_published = post.status == PUBLISHED
+
+    if (was_published, old_category_id) != (is_published, post.category_id):
+        if was_published:
+            _adjust(Category, [old_category_id], -1)
+        if is_published:
+            _adjust(Category, [post.category_id], 1)
+
+    if was_published != is_published and not created:
+        _adjust(Tag, post.tags.values_list('pk', flat=True), 1 if is_published else -1)
+
+    post._loaded_values = {'status': post.status, 'category_id': post.category_id}
+
+
+def post_deleted(post, tag_pks):
+    status, category_id = _loaded_state(post)
+    if status == PUBLISHED:
+        _adjust(Category, [category_id], -1)
+        _adjust(Tag, tag_pks, -1)
+
+
+def post_tags_changed(post, tag_pks, delta):
+    if post.status == PUBLISHED:
+        _adjust(Tag, tag_pks, delta)
+
+
+def tag_posts_changed(tag, post_pks, delta):
+    published = BlogPost.objects.filter(pk__in=post_pks, status=PUBLISHED).count()
+    _adjust(Tag, [tag.pk], published * delta)
+
+
+def rebuild(categories=None, tags=None):
+    """Przelicza liczniki od zera (domyślnie dla wszystkich kategorii i tagów)"""
+    if categories is None:
+        categories = Category.objects.all()
+    if tags is None:
+        tags = Tag.objects.all()
+
+    category_counts = BlogPost.objects.filter(
+        category=OuterRef('pk'), status=PUBLISHED
+    ).order_by().values('category').annotate(c=Count('pk')).values('c')
+    tag_counts = BlogPost.tags.through.objects.filter(
+        tag=OuterRef('pk'), blogpost__status=PUBLISHED
+    ).order_by().values('tag').annotate(c=Count('pk')).values('c')
+
+    updated_categories = categories.update(
+        published_posts_count=Coalesce(Subquery(category_counts), Value(0)), updated_at=Now(),
+    )
+    updated_tags = tags.update(published_posts_count=Coalesce(Subquery(tag_counts), Value(0)), updated_at=Now())
+    category_tree.invalidate_tree()
+    return updated_categories, updated_tags
@@ -0,0 +1,83 @@
+"""
+Statystyki dashboardu.
+
+compute_stats() liczy wszystko agregatami warunkowymi - jedno zapytanie na tabelę.
+Wynik trzymany jest w jednowierszowym DashboardSnapshot; sygnały oznaczają go
+jako nieaktualny, a odświeżenie następuje przy kolejnym odczycie lub okresowo
+(zadanie refresh_dashboard_snapshot). Zapis wyświetleń (flush) tylko dodaje
+przyrost do total_views, bez przeliczania.
+
+Każda zmiana migawki zwiększa jej wersję, a odświeżenie zapisuje wynik tylko wtedy,
+gdy wersja się nie zmieniła (compare-and-set) - oznaczenie jako nieaktualna albo
+przyrost wyświetleń w trakcie przeliczania nie giną.
+"""
+from django.contrib.auth.models import User
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from . import view_counter
+from .models import BlogPost, Comment, DashboardSnapshot, MediaFile
+
+SNAPSHOT_PK = 1
+REFRESH_ATTEMPTS = 3
+STAT_FIELDS = [
+    'total_posts', 'published_posts', 'draft_posts', 'total_comments',
+    'pending_comments', 'total_users', 'total_media', 'total_views',
+]
+
+
+def compute_stats():
+    posts = BlogPost.objects.aggregate(
+        total_posts=Count('pk'),
+        published_posts=Count('pk', filter=Q(status='published')),
+        draft_posts=Count('pk', filter=Q(status='draft')),
+        total_views=Sum('views_count'),
+    )
+    comments = Comment.objects.aggregate(
+        total_comments=Count('pk'),
+        pending_comments=Count('pk', filter=Q(is_approved=False)),
+    )
+    return {
+        **posts,
+        **comments,
+        'total_views': posts['total_views'] or 0,
+        'total_users': User.objects.count(),
+        'total_media': MediaFile.objects.count(),
+    }
+
+
+def refresh_snapshot():
+    """Przelicza migawkę; przy zmianie w trakcie przeliczania ponawia, w końcu zostawia ją nieaktualną"""
+    for _ in range(REFRESH_ATTEMPTS):
+        snapshot, _ = DashboardSnapshot.objects.get_or_create(pk=SNAPSHOT_PK)
+        stats = {**compute_stats(), 'is_stale': False, 'refreshed_at': timezone.now()}
+        if DashboardSnapshot.objects.filter(pk=SNAPSHOT_PK, version=snapshot.version).update(**stats):
+            break
+        stats['is_stale'] = True
+    for field, value in stats.items():
+        setattr(snapshot, field, value)
+    return snapshot
+
+
+def mark_stale():
+    DashboardSnapshot.objects.filter(pk=SNAPSHOT_PK).update(is_stale=True, version=F('version') + 1)
+
+
+def add_views(delta):
+    """Dodaje zapisane wyświetlenia do migawki (bez przeliczania)"""
+    DashboardSnapshot.objects.filter(pk=SNAPSHOT_PK).update(
+        total_views=F('total_views') + delta, version=F('version') + 1,
+    )
+
+
+def get_stats():
+    """Zwraca statystyki z migawki (odświeżając ją tylko gdy jest nieaktualna)"""
+    snapshot = DashboardSnapshot.objects.filter(pk=SNAPSHOT_PK).first()
+    if snapshot is None or snapshot.is_stale:
+        snapshot = refresh_snapshot()
+
+    stats = {field: getattr(snapshot, field) for field in STAT_FIELDS}
+    # Wyświetlenia czekające na flush nie zmieniają migawki
+    stats['total_views'] += view_counter.get_pending_total()
+    stats['refreshed_at'] = snapshot.refreshed_at
+    return stats
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F
+from django_filters import rest_framework as filters
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from . import categories, search
+from .models import BlogPost
+
+
+class BlogPostFilter(filters.FilterSet):
+    """
+    Filtry publicznej listy postów. category_tree=<slug> zwraca posty kategorii
+    i wszystkich jej podkategorii (jedno zapytanie po Category.path).
+    """
+    category_tree = filters.CharFilter(method='filter_category_tree', label='Kategoria z podkategoriami (slug)')
+
+    class Meta:
+        model = BlogPost
+        fields = ['category', 'tags', 'is_featured']
+
+    def filter_category_tree(self, queryset, name, value):
+        path = categories.get_path(value)
+        if not path:
+            # Pusta ścieżka pasowałaby do wszystkich postów
+            return queryset.none()
+        return queryset.filter(category__path__startswith=path)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Wyszukiwanie po search_vector z sortowaniem wg trafności i fragmentami
+    z podświetleniem (search_rank, search_headline).
+    Jawny parametr ordering ma pierwszeństwo przed trafnością.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms or not search.is_supported():
+            return super().filter_queryset(request, queryset, view)
+
+        config = settings.BLOG_SEARCH_CONFIG
+        query = SearchQuery(terms, config=config, search_type='websearch')
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query),
+            search_headline=SearchHeadline(
+                'content', query, config=config,
+                start_sel='<mark>', stop_sel='</mark>',
+                max_words=35, min_words=15, max_fragments=2,
+            ),
+        )
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('-search_rank', '-published_at')
+        return queryset
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from cms import counters
+
+
+class Command(BaseCommand):
+    help = 'Przelicza od zera liczniki opublikowanych postów dla kategorii i tagów'
+
+    def handle(self, *args, **options):
+        categories, tags = counters.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Przeliczono liczniki: {categories} kategorii, {tags} tagów'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from cms import related
+
+
+class Command(BaseCommand):
+    help = 'Przelicza listy powiązanych postów'
+
+    def handle(self, *args, **options):
+        changed = related.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Zmienione listy powiązanych postów: {changed}'))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from cms import cache, rendering, syndication
+from cms.models import BlogPost, Page
+
+
+class Command(BaseCommand):
+    help = 'Renderuje ponownie treść postów i stron zapisaną starszą wersją renderera'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Renderuj wszystkie wiersze, także aktualne')
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        total = 0
+        for model in (BlogPost, Page):
+            queryset = model.objects.only('pk', 'content').order_by('pk')
+            if not options['all']:
+                queryset = queryset.filter(render_version__lt=rendering.RENDERER_VERSION)
+            pks = self.rerender(model, queryset, options['batch_size'])
+            if pks and model is BlogPost:
+                cache.invalidate_posts(pks)
+            total += len(pks)
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {len(pks)}')
+
+        if total:
+            syndication.invalidate_all()
+        self.stdout.write(self.style.SUCCESS(
+            f'Przerenderowano {total} obiektów (wersja {rendering.RENDERER_VERSION})'
+        ))
+
+    def rerender(self, model, queryset, batch_size):
+        # updated_at zmienia się razem z HTML - nowe ETag/Last-Modified dla klientów
+        fields = [*rendering.RENDERED_FIELDS, 'updated_at']
+        pks = []
+        batch = []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            obj.render_content()
+            obj.updated_at = timezone.now()
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                pks.extend(self.flush(model, batch, fields))
+                batch = []
+        pks.extend(self.flush(model, batch, fields))
+        return pks
+
+    def flush(self, model, batch, fields):
+        model.objects.bulk_update(batch, fields)
+        return [obj.pk for obj in batch]
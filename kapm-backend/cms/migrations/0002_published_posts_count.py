@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_published_posts_count(apps, schema_editor):
+    BlogPost = apps.get_model("cms", "BlogPost")
+    Category = apps.get_model("cms", "Category")
+    Tag = apps.get_model("cms", "Tag")
+
+    category_counts = (
+        BlogPost.objects.filter(category=OuterRef("pk"), status="published")
+        .order_by()
+        .values("category")
+        .annotate(c=Count("pk"))
+        .values("c")
+    )
+    tag_counts = (
+        BlogPost.tags.through.objects.filter(tag=OuterRef("pk"), blogpost__status="published")
+        .order_by()
+        .values("tag")
+        .annotate(c=Count("pk"))
+        .values("c")
+    )
+    Category.objects.update(published_posts_count=Coalesce(Subquery(category_counts), Value(0)))
+    Tag.objects.update(published_posts_count=Coalesce(Subquery(tag_counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="published_posts_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Liczba opublikowanych postów"
+            ),
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="published_posts_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Liczba opublikowanych postów"
+            ),
+        ),
+        migrations.RunPython(fill_published_posts_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:46
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+SEARCH_INDEX = django.contrib.postgres.indexes.GinIndex(
+    fields=["search_vector"], name="cms_blogpost_search_gin"
+)
+
+
+def create_search_index(apps, schema_editor):
+    # Indeks GIN i tsvector istnieją tylko w PostgreSQL (SQLite w developmencie)
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    BlogPost = apps.get_model("cms", "BlogPost")
+    schema_editor.add_index(BlogPost, SEARCH_INDEX)
+
+    from django.contrib.postgres.search import SearchVector
+
+    config = settings.BLOG_SEARCH_CONFIG
+    BlogPost.objects.update(
+        search_vector=SearchVector("title", weight="A", config=config)
+        + SearchVector("excerpt", weight="B", config=config)
+        + SearchVector("content", weight="C", config=config)
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    BlogPost = apps.get_model("cms", "BlogPost")
+    schema_editor.remove_index(BlogPost, SEARCH_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0002_published_posts_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="blogpost", index=SEARCH_INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_index, drop_search_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+from cms import paths
+
+
+def fill_comment_paths(apps, schema_editor):
+    paths.fill_paths(apps.get_model("cms", "Comment"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0003_blogpost_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(
+                default=0, editable=False, verbose_name="Poziom zagnieżdżenia"
+            ),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=255,
+                verbose_name="Ścieżka w wątku",
+            ),
+        ),
+        migrations.RunPython(fill_comment_paths, migrations.RunPython.noop),
+    ]
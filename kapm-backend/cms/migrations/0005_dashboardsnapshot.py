@@ -0,0 +1,89 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0004_comment_path"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "total_posts",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Liczba postów"
+                    ),
+                ),
+                (
+                    "published_posts",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Opublikowane posty"
+                    ),
+                ),
+                (
+                    "draft_posts",
+                    models.PositiveIntegerField(default=0, verbose_name="Szkice"),
+                ),
+                (
+                    "total_comments",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Liczba komentarzy"
+                    ),
+                ),
+                (
+                    "pending_comments",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Komentarze do moderacji"
+                    ),
+                ),
+                (
+                    "total_users",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Liczba użytkowników"
+                    ),
+                ),
+                (
+                    "total_media",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Liczba plików mediów"
+                    ),
+                ),
+                (
+                    "total_views",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Liczba wyświetleń"
+                    ),
+                ),
+                (
+                    "is_stale",
+                    models.BooleanField(
+                        default=True, verbose_name="Wymaga odświeżenia"
+                    ),
+                ),
+                (
+                    "refreshed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Data odświeżenia"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Migawka statystyk dashboardu",
+                "verbose_name_plural": "Migawki statystyk dashboardu",
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0005_dashboardsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostViewStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[
+                            ("hour", "Godzina"),
+                            ("day", "Dzień"),
+                            ("month", "Miesiąc"),
+                        ],
+                        max_length=5,
+                        verbose_name="Przedział",
+                    ),
+                ),
+                ("bucket", models.DateTimeField(verbose_name="Początek przedziału")),
+                (
+                    "views",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Liczba wyświetleń"
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="view_stats",
+                        to="cms.blogpost",
+                        verbose_name="Post",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Statystyka wyświetleń",
+                "verbose_name_plural": "Statystyki wyświetleń",
+                "ordering": ["-bucket"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("granularity", "bucket", "post"),
+                        name="cms_postviewstat_unique_bucket",
+                    )
+                ],
+            },
+        ),
+    ]
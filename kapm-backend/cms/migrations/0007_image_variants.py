@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0006_postviewstat"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="featured_image_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Warianty obrazu wyróżniającego",
+            ),
+        ),
+        migrations.AddField(
+            model_name="mediafile",
+            name="file_variants",
+            field=models.JSONField(
+                blank=True, default=dict, editable=False, verbose_name="Warianty obrazu"
+            ),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="avatar_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Warianty avatara",
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:56
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0007_image_variants"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UploadSession",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Data utworzenia"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Data modyfikacji"
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[("media", "Plik mediów"), ("document", "Dokument")],
+                        max_length=20,
+                        verbose_name="Docelowy model",
+                    ),
+                ),
+                (
+                    "filename",
+                    models.CharField(max_length=255, verbose_name="Nazwa pliku"),
+                ),
+                (
+                    "total_size",
+                    models.PositiveBigIntegerField(
+                        verbose_name="Rozmiar pliku (bytes)"
+                    ),
+                ),
+                (
+                    "offset",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Przesłano (bytes)"
+                    ),
+                ),
+                (
+                    "temp_name",
+                    models.CharField(max_length=255, verbose_name="Plik tymczasowy"),
+                ),
+                (
+                    "metadata",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Dane obiektu"
+                    ),
+                ),
+                (
+                    "chunks",
+                    models.JSONField(
+                        blank=True, default=list, verbose_name="Sumy kontrolne kawałków"
+                    ),
+                ),
+                (
+                    "uploaded_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="upload_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Przesyłający",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Sesja przesyłania",
+                "verbose_name_plural": "Sesje przesyłania",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:58
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0008_uploadsession"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="mediafile",
+            name="file",
+            field=models.FileField(
+                storage=core.storage.ContentAddressedStorage(),
+                upload_to="media/%Y/%m/",
+                verbose_name="Plik",
+            ),
+        ),
+    ]
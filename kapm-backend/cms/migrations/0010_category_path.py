@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+from cms import paths
+
+
+def fill_category_paths(apps, schema_editor):
+    paths.fill_paths(apps.get_model("cms", "Category"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0009_content_storage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="depth",
+            field=models.PositiveSmallIntegerField(
+                default=0, editable=False, verbose_name="Poziom zagnieżdżenia"
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="path",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=255,
+                verbose_name="Ścieżka w drzewie",
+            ),
+        ),
+        migrations.RunPython(fill_category_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0010_category_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="content_html",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Treść (HTML)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="content_toc",
+            field=models.JSONField(
+                blank=True, default=list, editable=False, verbose_name="Spis treści"
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="reading_time",
+            field=models.PositiveSmallIntegerField(
+                default=0, editable=False, verbose_name="Czas czytania (min)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="render_version",
+            field=models.PositiveSmallIntegerField(
+                default=0, editable=False, verbose_name="Wersja renderowania"
+            ),
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="word_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Liczba słów"
+            ),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="content_html",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Treść (HTML)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="content_toc",
+            field=models.JSONField(
+                blank=True, default=list, editable=False, verbose_name="Spis treści"
+            ),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="reading_time",
+            field=models.PositiveSmallIntegerField(
+                default=0, editable=False, verbose_name="Czas czytania (min)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="render_version",
+            field=models.PositiveSmallIntegerField(
+                default=0, editable=False, verbose_name="Wersja renderowania"
+            ),
+        ),
+        migrations.AddField(
+            model_name="page",
+            name="word_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Liczba słów"
+            ),
+        ),
+    ]
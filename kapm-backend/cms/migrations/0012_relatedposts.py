@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0011_rendered_content"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedPosts",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="related_posts",
+                        serialize=False,
+                        to="cms.blogpost",
+                        verbose_name="Post",
+                    ),
+                ),
+                (
+                    "items",
+                    models.JSONField(
+                        blank=True, default=list, verbose_name="Powiązane posty"
+                    ),
+                ),
+                (
+                    "computed_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Data przeliczenia",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Powiązane posty",
+                "verbose_name_plural": "Powiązane posty",
+            },
+        ),
+    ]
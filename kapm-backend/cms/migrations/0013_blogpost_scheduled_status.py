@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:13
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def mark_future_posts_scheduled(apps, schema_editor):
+    """Opublikowane posty z datą w przyszłości - status 'scheduled' i korekta liczników"""
+    BlogPost = apps.get_model("cms", "BlogPost")
+    Category = apps.get_model("cms", "Category")
+    Tag = apps.get_model("cms", "Tag")
+    future = BlogPost.objects.filter(status="published", published_at__gt=timezone.now())
+    for post in future:
+        Category.objects.filter(pk=post.category_id).update(
+            published_posts_count=F("published_posts_count") - 1
+        )
+        Tag.objects.filter(posts=post).update(published_posts_count=F("published_posts_count") - 1)
+    future.update(status="scheduled")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0012_relatedposts"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="blogpost",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("draft", "Szkic"),
+                    ("scheduled", "Zaplanowany"),
+                    ("published", "Opublikowany"),
+                    ("archived", "Zarchiwizowany"),
+                ],
+                default="draft",
+                max_length=20,
+                verbose_name="Status",
+            ),
+        ),
+        migrations.RunPython(mark_future_posts_scheduled, migrations.RunPython.noop),
+    ]
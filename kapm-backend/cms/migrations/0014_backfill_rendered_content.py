@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:05
+
+from django.db import migrations
+
+from cms import rendering
+
+BATCH_SIZE = 200
+
+
+def render_existing_content(apps, schema_editor):
+    """HTML, spis treści i czas czytania dla postów i stron sprzed 0011"""
+    for model_name in ("BlogPost", "Page"):
+        model = apps.get_model("cms", model_name)
+        queryset = model.objects.filter(render_version__lt=rendering.RENDERER_VERSION).only("pk", "content")
+        batch = []
+        for obj in queryset.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+            for field, value in rendering.render(obj.content).items():
+                setattr(obj, field, value)
+            batch.append(obj)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, rendering.RENDERED_FIELDS)
+                batch = []
+        model.objects.bulk_update(batch, rendering.RENDERED_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0013_blogpost_scheduled_status"),
+    ]
+
+    operations = [
+        migrations.RunPython(render_existing_content, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0014_backfill_rendered_content"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dashboardsnapshot",
+            name="version",
+            field=models.PositiveBigIntegerField(default=0, verbose_name="Wersja"),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0015_dashboardsnapshot_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=255,
+                verbose_name="Ścieżka w drzewie",
+            ),
+        ),
+    ]
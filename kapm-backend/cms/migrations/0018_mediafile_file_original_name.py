@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:30
+
+import posixpath
+
+from django.db import migrations, models
+
+
+def fill_original_names(apps, schema_editor):
+    """Pliki sprzed magazynu adresowanego treścią mają jeszcze oryginalną nazwę w ścieżce"""
+    MediaFile = apps.get_model("cms", "MediaFile")
+    files = MediaFile.objects.exclude(file="").exclude(file__startswith="blobs/").only("pk", "file")
+    batch = []
+    for obj in files.iterator(chunk_size=500):
+        obj.file_original_name = posixpath.basename(obj.file.name)[:255]
+        batch.append(obj)
+    MediaFile.objects.bulk_update(batch, ["file_original_name"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0017_alter_mediafile_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediafile",
+            name="file_original_name",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=255,
+                verbose_name="Oryginalna nazwa pliku",
+            ),
+        ),
+        migrations.RunPython(fill_original_names, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,18 @@
+import uuid
+
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.utils.text import slugify
 from django.utils import timezone
 
+from core.storage import content_addressed_storage
+from . import paths, rendering, search
+
 
 class BaseModel(models.Model):
     """Model bazowy z polami czasowymi"""
@@ -13,7 +23,78 @@ class BaseModel(models.Model):
         abstract = True
 
 
-class Category(BaseModel):
+class RenderedContentModel(BaseModel):
+    """Model z treścią renderowaną do HTML przy zapisie (patrz cms/rendering.py)"""
+    content_html = models.TextField(blank=True, editable=False, verbose_name="Treść (HTML)")
+    content_toc = models.JSONField(default=list, blank=True, editable=False, verbose_name="Spis treści")
+    word_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Liczba słów")
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False,
+                                                    verbose_name="Czas czytania (min)")
+    render_version = models.PositiveSmallIntegerField(default=0, editable=False,
+                                                      verbose_name="Wersja renderowania")
+
+    class Meta:
+        abstract = True
+
+    def render_content(self):
+        for field, value in rendering.render(self.content).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.render_content()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *rendering.RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
+
+class MaterializedPathModel(BaseModel):
+    """Węzeł drzewa (pole parent) ze ścieżką zmaterializowaną - patrz cms/paths.py"""
+    path = models.CharField(max_length=paths.MAX_LENGTH, blank=True, editable=False, db_index=True,
+                            verbose_name="Ścieżka w drzewie")
+    depth = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name="Poziom zagnieżdżenia")
+
+    PATH_SEGMENT_LENGTH = paths.SEGMENT_LENGTH
+    MAX_DEPTH = paths.MAX_DEPTH
+
+    class Meta:
+        abstract = True
+
+    def is_descendant_or_self(self, node):
+        """Czy node leży w poddrzewie tego węzła (przeniesienie pod niego utworzyłoby cykl)"""
+        if node is None or self.pk is None:
+            return False
+        return node.pk == self.pk or bool(self.path) and node.path.startswith(self.path)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'parent' in update_fields:
+            self.update_path()
+
+    def update_path(self):
+        """Zapisuje ścieżkę węzła, a po przeniesieniu także całego jego poddrzewa"""
+        parent_path = self.parent.path if self.parent_id else ''
+        path = paths.build_path(parent_path, self.pk)
+        if path == self.path:
+            return
+
+        model = type(self)
+        old_path, old_depth = self.path, self.depth
+        depth = paths.get_depth(path)
+        model.objects.filter(pk=self.pk).update(path=path, depth=depth)
+        if old_path:
+            # Przeniesienie węzła - poprawiamy ścieżki całego poddrzewa
+            model.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                path=Concat(Value(path), Substr('path', len(old_path) + 1)),
+                depth=F('depth') + (depth - old_depth),
+            )
+        self.path, self.depth = path, depth
+
+
+class Category(MaterializedPathModel):
     """Kategoria dla postów bloga"""
     name = models.CharField(max_length=100, unique=True, verbose_name="Nazwa")
     slug = models.SlugField(max_length=100, unique=True, verbose_name="Slug")
@@ -21,12 +102,18 @@ class Category(BaseModel):
     parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE,
                               related_name='children', verbose_name="Kategoria nadrzędna")
     is_active = models.BooleanField(default=True, verbose_name="Aktywna")
+    published_posts_count = models.PositiveIntegerField(default=0, editable=False,
+                                                        verbose_name="Liczba opublikowanych postów")
 
     class Meta:
         verbose_name = "Kategoria"
         verbose_name_plural = "Kategorie"
         ordering = ['name']
 
+    def clean(self):
+        if self.is_descendant_or_self(self.parent):
+            raise ValidationError({'parent': "Kategoria nie może być podkategorią samej siebie"})
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
@@ -40,6 +127,8 @@ class Tag(BaseModel):
     """Tag dla postów bloga"""
     name = models.CharField(max_length=50, unique=True, verbose_name="Nazwa")
     slug = models.SlugField(max_length=50, unique=True, verbose_name="Slug")
+    published_posts_count = models.PositiveIntegerField(default=0, editable=False,
+                                                        verbose_name="Liczba opublikowanych postów")
 
     class Meta:
         verbose_name = "Tag"
@@ -55,10 +144,11 @@ class Tag(BaseModel):
         return self.name
 
 
-class BlogPost(BaseModel):
+class BlogPost(RenderedContentModel):
     """Model posta blogowego"""
     STATUS_CHOICES = [
         ('draft', 'Szkic'),
+        ('scheduled', 'Zaplanowany'),
         ('published', 'Opublikowany'),
         ('archived', 'Zarchiwizowany'),
     ]
@@ -69,6 +159,8 @@ class BlogPost(BaseModel):
     content = models.TextField(verbose_name="Treść")
     featured_image = models.ImageField(upload_to='blog/%Y/%m/', blank=True, null=True,
                                       verbose_name="Obraz wyróżniający")
+    featured_image_variants = models.JSONField(default=dict, blank=True, editable=False,
+                                               verbose_name="Warianty obrazu wyróżniającego")
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft',
                              verbose_name="Status")
@@ -89,27 +181,56 @@ class BlogPost(BaseModel):
     meta_description = models.CharField(max_length=160, blank=True, verbose_name="Meta opis")
     meta_keywords = models.CharField(max_length=255, blank=True, verbose_name="Meta słowa kluczowe")
 
+    # Wyszukiwanie pełnotekstowe (aktualizowane w save, patrz cms/search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         verbose_name = "Post blogowy"
         verbose_name_plural = "Posty blogowe"
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='cms_blogpost_search_gin'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stan z bazy - potrzebny do przyrostowej aktualizacji liczników postów i search_vector
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
 
         # Automatycznie ustaw datę publikacji przy pierwszej publikacji
-        if self.status == 'published' and not self.published_at:
+        if self.status in ('published', 'scheduled') and not self.published_at:
             self.published_at = timezone.now()
 
+        # Data publikacji w przyszłości - post czeka na publish_scheduled_posts (cms/scheduling.py)
+        if self.status in ('published', 'scheduled'):
+            self.status = 'scheduled' if self.published_at > timezone.now() else 'published'
+
         # Automatyczne SEO jeśli nie wypełnione
         if not self.meta_title:
             self.meta_title = self.title[:60]
         if not self.meta_description:
             self.meta_description = self.excerpt[:160] if self.excerpt else self.content[:160]
 
+        search_changed = self._state.adding or self.search_fields_changed(kwargs.get('update_fields'))
         super().save(*args, **kwargs)
 
+        if search_changed:
+            search.update_search_vector(BlogPost.objects.filter(pk=self.pk))
+
+    def search_fields_changed(self, update_fields=None):
+        """Czy zapis zmienia pola indeksowane w search_vector (stan z BlogPost.from_db)"""
+        fields = search.SEARCH_FIELDS if update_fields is None else search.SEARCH_FIELDS.intersection(update_fields)
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return bool(fields)
+        return any(field not in loaded or getattr(self, field) != loaded[field] for field in fields)
+
     def __str__(self):
         return self.title
 
@@ -118,7 +239,7 @@ class BlogPost(BaseModel):
         return self.status == 'published' and self.published_at and self.published_at <= timezone.now()
 
 
-class Page(BaseModel):
+class Page(RenderedContentModel):
     """Model dla statycznych stron"""
     TEMPLATE_CHOICES = [
         ('default', 'Domyślny'),
@@ -168,7 +289,12 @@ class MediaFile(BaseModel):
         ('other', 'Inne'),
     ]
 
-    file = models.FileField(upload_to='media/%Y/%m/', verbose_name="Plik")
+    file = models.FileField(upload_to='media/%Y/%m/', storage=content_addressed_storage,
+                            db_index=True, verbose_name="Plik")
+    file_original_name = models.CharField(max_length=255, blank=True, editable=False,
+                                          verbose_name="Oryginalna nazwa pliku")
+    file_variants = models.JSONField(default=dict, blank=True, editable=False,
+                                     verbose_name="Warianty obrazu")
     title = models.CharField(max_length=200, verbose_name="Tytuł")
     alt_text = models.CharField(max_length=200, blank=True, verbose_name="Tekst alternatywny")
     description = models.TextField(blank=True, verbose_name="Opis")
@@ -186,7 +312,10 @@ class MediaFile(BaseModel):
 
     def save(self, *args, **kwargs):
         if self.file:
-            self.file_size = self.file.size
+            # Rozmiar liczymy tylko dla nowo przesłanego pliku - przy uploadzie
+            # kawałkami (cms/uploads.py) file_size jest już ustawione
+            if not self.file._committed:
+                self.file_size = self.file.size
             # Określ typ pliku na podstawie rozszerzenia
             ext = self.file.name.split('.')[-1].lower()
             if ext in ['jpg', 'jpeg', 'png', 'gif', 'svg', 'webp']:
@@ -213,6 +342,8 @@ class UserProfile(BaseModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile',
                                verbose_name="Użytkownik")
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True, verbose_name="Avatar")
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False,
+                                       verbose_name="Warianty avatara")
     bio = models.TextField(blank=True, verbose_name="Bio")
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='viewer',
                           verbose_name="Rola")
@@ -235,7 +366,7 @@ class UserProfile(BaseModel):
         return f"{self.user.first_name} {self.user.last_name}".strip() or self.user.username
 
 
-class Comment(BaseModel):
+class Comment(MaterializedPathModel):
     """Model komentarzy do postów"""
     post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='comments',
                             verbose_name="Post")
@@ -255,3 +386,99 @@ class Comment(BaseModel):
 
     def __str__(self):
         return f"Komentarz do {self.post.title} przez {self.author_name or self.author.username}"
+
+
+class DashboardSnapshot(models.Model):
+    """Zagregowane statystyki dashboardu (jeden wiersz, patrz cms/dashboard.py)"""
+    total_posts = models.PositiveIntegerField(default=0, verbose_name="Liczba postów")
+    published_posts = models.PositiveIntegerField(default=0, verbose_name="Opublikowane posty")
+    draft_posts = models.PositiveIntegerField(default=0, verbose_name="Szkice")
+    total_comments = models.PositiveIntegerField(default=0, verbose_name="Liczba komentarzy")
+    pending_comments = models.PositiveIntegerField(default=0, verbose_name="Komentarze do moderacji")
+    total_users = models.PositiveIntegerField(default=0, verbose_name="Liczba użytkowników")
+    total_media = models.PositiveIntegerField(default=0, verbose_name="Liczba plików mediów")
+    total_views = models.PositiveBigIntegerField(default=0, verbose_name="Liczba wyświetleń")
+
+    is_stale = models.BooleanField(default=True, verbose_name="Wymaga odświeżenia")
+    version = models.PositiveBigIntegerField(default=0, verbose_name="Wersja")
+    refreshed_at = models.DateTimeField(null=True, blank=True, verbose_name="Data odświeżenia")
+
+    class Meta:
+        verbose_name = "Migawka statystyk dashboardu"
+        verbose_name_plural = "Migawki statystyk dashboardu"
+
+    def __str__(self):
+        return f"Statystyki z {self.refreshed_at}"
+
+
+class PostViewStat(models.Model):
+    """Liczba wyświetleń posta w przedziale czasu (godzina, dzień lub miesiąc)"""
+    GRANULARITY_CHOICES = [
+        ('hour', 'Godzina'),
+        ('day', 'Dzień'),
+        ('month', 'Miesiąc'),
+    ]
+
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='view_stats',
+                             verbose_name="Post")
+    granularity = models.CharField(max_length=5, choices=GRANULARITY_CHOICES, verbose_name="Przedział")
+    bucket = models.DateTimeField(verbose_name="Początek przedziału")
+    views = models.PositiveIntegerField(default=0, verbose_name="Liczba wyświetleń")
+
+    class Meta:
+        verbose_name = "Statystyka wyświetleń"
+        verbose_name_plural = "Statystyki wyświetleń"
+        ordering = ['-bucket']
+        constraints = [
+            models.UniqueConstraint(fields=['granularity', 'bucket', 'post'], name='cms_postviewstat_unique_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} {self.granularity} {self.bucket}: {self.views}"
+
+
+class RelatedPosts(models.Model):
+    """Wstępnie policzone powiązane posty (patrz cms/related.py)"""
+    post = models.OneToOneField(BlogPost, on_delete=models.CASCADE, primary_key=True,
+                                related_name='related_posts', verbose_name="Post")
+    items = models.JSONField(default=list, blank=True, verbose_name="Powiązane posty")
+    computed_at = models.DateTimeField(default=timezone.now, verbose_name="Data przeliczenia")
+
+    class Meta:
+        verbose_name = "Powiązane posty"
+        verbose_name_plural = "Powiązane posty"
+
+    def __str__(self):
+        return f"Powiązane z {self.post_id}: {len(self.items)}"
+
+
+class UploadSession(BaseModel):
+    """Sesja przesyłania pliku kawałkami (patrz cms/uploads.py)"""
+    TARGET_CHOICES = [
+        ('media', 'Plik mediów'),
+        ('document', 'Dokument'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES, verbose_name="Docelowy model")
+    filename = models.CharField(max_length=255, verbose_name="Nazwa pliku")
+    total_size = models.PositiveBigIntegerField(verbose_name="Rozmiar pliku (bytes)")
+    offset = models.PositiveBigIntegerField(default=0, verbose_name="Przesłano (bytes)")
+    temp_name = models.CharField(max_length=255, verbose_name="Plik tymczasowy")
+    metadata = models.JSONField(default=dict, blank=True, verbose_name="Dane obiektu")
+    chunks = models.JSONField(default=list, blank=True, verbose_name="Sumy kontrolne kawałków")
+
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions',
+                                    verbose_name="Przesyłający")
+
+    class Meta:
+        verbose_name = "Sesja przesyłania"
+        verbose_name_plural = "Sesje przesyłania"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.total_size})"
+
+    @property
+    def is_complete(self):
+        return self.offset == self.total_size
@@ -0,0 +1,124 @@
+"""
+Paginacja kursorowa (keyset) dla list postów.
+
+Kursor koduje parę (wartość pola sortowania, id) ostatniego/pierwszego elementu
+strony, więc kolejne strony są wybierane warunkiem WHERE zamiast OFFSET i bez COUNT(*).
+Publikacja nowych postów nie przesuwa elementów między stronami.
+
+Klienci potrzebujący łącznej liczby wyników przekazują parametr ?page=
+i dostają klasyczną odpowiedź PageNumberPagination.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Sortowanie kursora pochodzi z atrybutu widoku keyset_ordering (np. '-published_at'),
+    z id jako drugim kluczem. Gdy klient wybiera własne sortowanie lub wyszukiwanie,
+    kolejność nie pasuje do kursora - wtedy używana jest paginacja numerowana.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    page_number_class = PageNumberPagination
+    page_number_triggers = ('page', api_settings.ORDERING_PARAM, api_settings.SEARCH_PARAM)
+    invalid_cursor_message = 'Nieprawidłowy kursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_number = None
+        if any(request.query_params.get(param) for param in self.page_number_triggers):
+            self.page_number = self.page_number_class()
+            return self.page_number.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        ordering = getattr(view, 'keyset_ordering', '-created_at')
+        self.field = ordering.lstrip('-')
+        descending = ordering.startswith('-')
+
+        position, reverse = self.decode_cursor(request)
+        # Strona "wstecz" to zapytanie w odwróconym kierunku
+        forward = descending != reverse
+        lookup = 'lt' if forward else 'gt'
+        prefix = '-' if forward else ''
+
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value}) | Q(**{self.field: value, f'pk__{lookup}': pk})
+            )
+
+        rows = list(queryset.order_by(f'{prefix}{self.field}', f'{prefix}pk')[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = has_more if reverse else position is not None
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.page_number is not None:
+            return self.page_number.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, obj, reverse):
+        value = getattr(obj, self.field)
+        payload = {'v': value.isoformat() if hasattr(value, 'isoformat') else value, 'id': obj.pk, 'r': reverse}
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Zwraca ((wartość, id), reverse) albo (None, False) dla pierwszej strony"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            # Pola kursora to daty (published_at, created_at) - tylko data ze strefą i całkowite id
+            value = parse_datetime(payload['v'])
+            pk = payload['id']
+            if value is None or not timezone.is_aware(value) or type(pk) is not int:
+                raise ValueError
+            return (value, pk), bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
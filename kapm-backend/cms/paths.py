@@ -0,0 +1,35 @@
+"""
+Ścieżki zmaterializowane drzew (Category.path, Comment.path).
+
+Ścieżka to id przodków i własne, każde dopełnione zerami do SEGMENT_LENGTH znaków
+i zakończone '/', np. "0000000012/0000000034/". Poddrzewo węzła wybiera
+path__startswith=<ścieżka węzła>; pusta ścieżka (węzeł zapisany z pominięciem
+save(), np. bulk_create) nie pasuje do niczego.
+"""
+SEGMENT_LENGTH = 10
+MAX_LENGTH = 255
+# Najgłębszy poziom (od 0), którego ścieżka mieści się w MAX_LENGTH znaków
+MAX_DEPTH = MAX_LENGTH // (SEGMENT_LENGTH + 1) - 1
+
+
+def build_path(parent_path, pk):
+    return f"{parent_path}{pk:0{SEGMENT_LENGTH}d}/"
+
+
+def get_depth(path):
+    return path.count('/') - 1
+
+
+def fill_paths(model):
+    """Wylicza ścieżki całego drzewa poziom po poziomie (także dla modeli historycznych w migracjach)"""
+    paths = {}
+    level = list(model.objects.filter(parent=None).values_list("pk", "parent_id"))
+    depth = 0
+    while level:
+        for pk, parent_id in level:
+            paths[pk] = build_path(paths.get(parent_id, ''), pk)
+            model.objects.filter(pk=pk).update(path=paths[pk], depth=depth)
+        level = list(
+            model.objects.filter(parent__in=[pk for pk, _ in level]).values_list("pk", "parent_id")
+        )
+        depth += 1
@@ -1,5 +1,19 @@
 from rest_framework import permissions
 
+from authentication.tokens import request_claims
+
+EDITOR_ROLES = ('admin', 'editor')
+
+
+def has_role(request, roles):
+    """Superużytkownik lub jedna z ról - wg roszczeń tokena, bez zapytań do bazy"""
+    claims = request_claims(request)
+    return bool(claims['is_superuser']) or claims['role'] in roles
+
+
+def is_superuser(request):
+    return bool(request_claims(request)['is_superuser'])
+
 
 class IsAuthorOrAdmin(permissions.BasePermission):
     """
@@ -13,10 +27,10 @@ class IsAuthorOrAdmin(permissions.BasePermission):
             return True
 
         # Edycja dla autora lub admina
-        if hasattr(obj, 'author'):
-            return obj.author == request.user or request.user.is_superuser
+        if hasattr(obj, 'author_id'):
+            return obj.author_id == request.user.pk or is_superuser(request)
 
-        return request.user.is_superuser
+        return is_superuser(request)
 
 
 class IsOwnerOrAdmin(permissions.BasePermission):
@@ -31,13 +45,13 @@ class IsOwnerOrAdmin(permissions.BasePermission):
             return request.user.is_authenticated
 
         # Edycja dla właściciela lub admina
-        if hasattr(obj, 'uploaded_by'):
-            return obj.uploaded_by == request.user or request.user.is_superuser
+        if hasattr(obj, 'uploaded_by_id'):
+            return obj.uploaded_by_id == request.user.pk or is_superuser(request)
 
-        if hasattr(obj, 'user'):
-            return obj.user == request.user or request.user.is_superuser
+        if hasattr(obj, 'user_id'):
+            return obj.user_id == request.user.pk or is_superuser(request)
 
-        return request.user.is_superuser
+        return is_superuser(request)
 
 
 class IsAdminOrEditor(permissions.BasePermission):
@@ -49,10 +63,4 @@ class IsAdminOrEditor(permissions.BasePermission):
         if not request.user.is_authenticated:
             return False
 
-        if request.user.is_superuser:
-            return True
-
-        if hasattr(request.user, 'profile'):
-            return request.user.profile.role in ['admin', 'editor']
-
-        return False
\ No newline at end of file
+        return has_role(request, EDITOR_ROLES)
@@ -0,0 +1,144 @@
+"""
+Powiązane posty ("Zobacz także").
+
+Każdy opublikowany post to wektor cech: tagi (waga TAG_WEIGHT) oraz kolejne poziomy
+ścieżki kategorii (CATEGORY_WEIGHT) - posty z kategorii siostrzanych są do siebie
+podobne słabiej niż posty z tej samej kategorii. Podobieństwo to cosinus wektorów,
+a iloczyny skalarne liczone są przez indeks odwrócony (cecha -> posty), więc
+porównywane są tylko posty mające wspólną cechę.
+
+Lista RELATED_POSTS_COUNT najlepszych dopasowań z danymi do wyświetlenia trafia do
+tabeli RelatedPosts (jeden wiersz na post) - szczegóły posta czytają ją przez
+select_related, bez dodatkowych zapytań. Przebudowę po zmianach planują sygnały
+(z opóźnieniem RELATED_POSTS_DEBOUNCE, żeby seria zmian dała jedno przeliczenie),
+a raz na dobę wykonuje ją też Celery beat.
+"""
+import heapq
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from . import cache as blog_cache
+from .models import BlogPost, Category, RelatedPosts
+
+PENDING_KEY = 'cms:related:pending'
+TAG_WEIGHT = 1.0
+CATEGORY_WEIGHT = 0.5
+# Pola posta widoczne na liście powiązanych albo wpływające na dobór
+RELATED_FIELDS = ('status', 'published_at', 'category_id', 'title', 'slug', 'featured_image')
+
+
+# ==================== OBLICZANIE ====================
+
+def load_posts():
+    """Opublikowane posty: {id: dane do wyświetlenia} i {id: {cecha: waga}} - dwa zapytania"""
+    posts = {}
+    vectors = {}
+    rows = BlogPost.objects.filter(status='published', published_at__lte=timezone.now()).values(
+        'id', 'title', 'slug', 'featured_image', 'published_at', 'category__path'
+    )
+    for row in rows:
+        path = row.pop('category__path')
+        row['published_at'] = row['published_at'].isoformat()
+        posts[row['id']] = row
+        vectors[row['id']] = {
+            ('category', path[:end]): CATEGORY_WEIGHT
+            for end in range(Category.PATH_SEGMENT_LENGTH, len(path or '') + 1, Category.PATH_SEGMENT_LENGTH)
+        }
+
+    tagged = BlogPost.tags.through.objects.filter(blogpost_id__in=posts).values_list('blogpost_id', 'tag_id')
+    for post_id, tag_id in tagged:
+        vectors[post_id][('tag', tag_id)] = TAG_WEIGHT
+    return posts, vectors
+
+
+def compute(posts, vectors, count):
+    """Zwraca {id posta: [powiązane posty]} - tylko posty z co najmniej jednym dopasowaniem"""
+    index = defaultdict(list)
+    for post_id, vector in vectors.items():
+        for feature, weight in vector.items():
+            index[feature].append((post_id, weight))
+    norms = {
+        post_id: math.sqrt(sum(weight * weight for weight in vector.values()))
+        for post_id, vector in vectors.items()
+    }
+
+    result = {}
+    for post_id, vector in vectors.items():
+        scores = defaultdict(float)
+        for feature, weight in vector.items():
+            for other_id, other_weight in index[feature]:
+                if other_id != post_id:
+                    scores[other_id] += weight * other_weight
+        if not scores:
+            continue
+        # Ranking po cosinusie (tej samej wartości, która trafia do listy), nie po iloczynie skalarnym
+        similarities = {
+            other_id: round(score / (norms[post_id] * norms[other_id]), 4)
+            for other_id, score in scores.items()
+        }
+        best = heapq.nlargest(
+            count, similarities.items(),
+            # Przy równym podobieństwie wygrywa nowszy post
+            key=lambda item: (item[1], posts[item[0]]['published_at'], item[0]),
+        )
+        result[post_id] = [dict(posts[other_id], score=similarity) for other_id, similarity in best]
+    return result
+
+
+# ==================== ZAPIS ====================
+
+def rebuild():
+    """Przelicza listy i zapisuje tylko zmienione wiersze; zwraca liczbę zmienionych"""
+    posts, vectors = load_posts()
+    lists = compute(posts, vectors, settings.RELATED_POSTS_COUNT)
+    existing = dict(RelatedPosts.objects.values_list('post_id', 'items'))
+    now = timezone.now()
+
+    to_create = [
+        RelatedPosts(post_id=post_id, items=items, computed_at=now)
+        for post_id, items in lists.items() if post_id not in existing
+    ]
+    to_update = [
+        RelatedPosts(post_id=post_id, items=items, computed_at=now)
+        for post_id, items in lists.items() if post_id in existing and existing[post_id] != items
+    ]
+    stale = existing.keys() - lists.keys()
+    with transaction.atomic():
+        RelatedPosts.objects.bulk_create(to_create)
+        RelatedPosts.objects.bulk_update(to_update, ['items', 'computed_at'])
+        RelatedPosts.objects.filter(post_id__in=stale).delete()
+
+    changed = [row.post_id for row in to_create + to_update] + list(stale)
+    if changed:
+        blog_cache.invalidate_posts(changed)
+    return len(changed)
+
+
+def affects_related(instance, created):
+    """Czy zapis posta może zmienić listy powiązanych (stan z BlogPost.from_db)"""
+    loaded = getattr(instance, '_loaded_values', None)
+    if created or loaded is None:
+        return True
+    return any(field not in loaded or getattr(instance, field) != loaded[field] for field in RELATED_FIELDS)
+
+
+def schedule():
+    """Jedna przebudowa w tle na okno RELATED_POSTS_DEBOUNCE sekund (po zatwierdzeniu transakcji)"""
+    transaction.on_commit(_enqueue)
+
+
+def _enqueue():
+    from .tasks import rebuild_related_posts
+
+    delay = settings.RELATED_POSTS_DEBOUNCE
+    if cache.add(PENDING_KEY, True, delay):
+        rebuild_related_posts.apply_async(countdown=delay)
+
+
+def clear_pending():
+    cache.delete(PENDING_KEY)
@@ -0,0 +1,74 @@
+"""
+Renderowanie treści postów i stron do HTML przy zapisie.
+
+Treść z panelu (HTML z edytora albo zwykły tekst) jest oczyszczana raz, w save(),
+a wynik trafia do kolumn modelu (RenderedContentModel w cms/models.py):
+    content_html   - bezpieczny HTML z kotwicami id w nagłówkach h2/h3
+    content_toc    - spis treści [{'id', 'title', 'level'}]
+    word_count     - liczba słów
+    reading_time   - szacowany czas czytania w minutach
+    render_version - RENDERER_VERSION z chwili renderowania
+
+Po zmianie zasad renderowania trzeba podbić RENDERER_VERSION i uruchomić
+`python manage.py rerender_content`, który przerenderuje nieaktualne wiersze.
+"""
+import html
+import math
+import re
+
+import nh3
+from django.utils.html import linebreaks, strip_tags
+from django.utils.text import slugify
+
+RENDERER_VERSION = 1
+RENDERED_FIELDS = ('content_html', 'content_toc', 'word_count', 'reading_time', 'render_version')
+WORDS_PER_MINUTE = 200
+
+TOC_LEVELS = ('h2', 'h3')
+TAG_RE = re.compile(r'</?[a-zA-Z][^>]*>')
+HEADING_RE = re.compile(r'<(h[23])(?:\s[^>]*)?>(.*?)</\1>', re.IGNORECASE | re.DOTALL)
+WORD_RE = re.compile(r'\w+')
+
+
+def sanitize(content):
+    """HTML z dozwolonymi znacznikami; zwykły tekst dostaje akapity i <br>"""
+    if not TAG_RE.search(content):
+        content = linebreaks(content, autoescape=True)
+    return nh3.clean(content)
+
+
+def add_heading_anchors(content):
+    """Nadaje nagłówkom h2/h3 unikalne id i zwraca (html, spis treści)"""
+    toc = []
+    used = set()
+
+    def anchor(match):
+        level, inner = match.group(1).lower(), match.group(2)
+        title = html.unescape(strip_tags(inner)).strip()
+        base = slugify(title, allow_unicode=True) or 'sekcja'
+        anchor_id, number = base, 1
+        while anchor_id in used:
+            number += 1
+            anchor_id = f'{base}-{number}'
+        used.add(anchor_id)
+        toc.append({'id': anchor_id, 'title': title, 'level': TOC_LEVELS.index(level) + 2})
+        return f'<{level} id="{anchor_id}">{inner}</{level}>'
+
+    return HEADING_RE.sub(anchor, content), toc
+
+
+def count_words(content):
+    return len(WORD_RE.findall(html.unescape(strip_tags(content))))
+
+
+def render(content):
+    """Zwraca wartości kolumn RENDERED_FIELDS dla podanej treści"""
+    content_html, toc = add_heading_anchors(sanitize(content or ''))
+    word_count = count_words(content_html)
+    return {
+        'content_html': content_html,
+        'content_toc': toc,
+        'word_count': word_count,
+        'reading_time': math.ceil(word_count / WORDS_PER_MINUTE),
+        'render_version': RENDERER_VERSION,
+    }
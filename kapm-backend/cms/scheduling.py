@@ -0,0 +1,68 @@
+"""
+Publikacja zaplanowana.
+
+Post zapisany jako opublikowany z datą publikacji w przyszłości dostaje status
+'scheduled' (BlogPost.save). Zadanie publish_scheduled_posts, uruchamiane przez
+Celery beat co minutę, zmienia go na 'published' - z opóźnieniem najwyżej minuty.
+Zapis posta nie kolejkuje zadania z eta: takie zadania siedzą w brokerze do swojego
+czasu, a Redis po visibility_timeout (domyślnie godzina) oddaje je ponownie.
+
+Publikacja przechodzi przez save(), więc sygnały aktualizują liczniki, cache,
+mapę witryny z kanałami (przebudowa w tle) i powiązane posty. Potem odpowiedzi
+publicznego API - domyślna lista i szczegóły nowych postów we wszystkich
+językach - są generowane od razu, żeby pierwszy czytelnik nie trafiał na pusty cache.
+"""
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from .models import BlogPost
+
+SCHEDULED = 'scheduled'
+PUBLISHED = 'published'
+
+
+def publish_due(now=None):
+    """Publikuje posty, których czas nadszedł; zwraca ich identyfikatory"""
+    now = now or timezone.now()
+    with transaction.atomic():
+        posts = list(
+            BlogPost.objects.select_for_update(skip_locked=True).filter(status=SCHEDULED, published_at__lte=now)
+        )
+        for post in posts:
+            post.status = PUBLISHED
+            post.save()
+    pks = [post.pk for post in posts]
+    if pks:
+        warm_up(pks)
+    return pks
+
+
+# ==================== ROZGRZEWANIE CACHE ====================
+
+def _request_factory():
+    url = urlsplit(settings.API_URL)
+    return RequestFactory(HTTP_HOST=url.netloc, secure=url.scheme == 'https')
+
+
+def warm_up(pks):
+    """Generuje do cache domyślną listę i szczegóły podanych postów (bez liczenia wyświetleń)"""
+    from .views import PublicBlogPostViewSet
+
+    factory = _request_factory()
+    list_view = PublicBlogPostViewSet.as_view({'get': 'list'})
+    detail_view = PublicBlogPostViewSet.as_view({'get': 'retrieve'})
+    for language, _ in settings.LANGUAGES:
+        with translation.override(language):
+            request = factory.get(reverse('cms:public:public-blog-list'))
+            request.LANGUAGE_CODE = language
+            list_view(request)
+            for pk in pks:
+                request = factory.get(reverse('cms:public:public-blog-detail', kwargs={'pk': pk}))
+                request.LANGUAGE_CODE = language
+                request.is_cache_warm_up = True
+                detail_view(request, pk=pk)
@@ -0,0 +1,31 @@
+"""
+Wyszukiwanie pełnotekstowe postów bloga w PostgreSQL.
+
+BlogPost.search_vector przechowuje tsvector z wagami tytuł (A) > zajawka (B) > treść (C),
+indeksowany GIN. Na SQLite (USE_SQLITE) wyszukiwanie wraca do zwykłego SearchFilter.
+Moduł importują modele - filtr DRF (FullTextSearchFilter) jest w cms/filters.py.
+"""
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import connection
+
+SEARCH_FIELDS = {'title', 'excerpt', 'content'}
+
+
+def is_supported():
+    return connection.vendor == 'postgresql'
+
+
+def build_search_vector():
+    config = settings.BLOG_SEARCH_CONFIG
+    return (
+        SearchVector('title', weight='A', config=config)
+        + SearchVector('excerpt', weight='B', config=config)
+        + SearchVector('content', weight='C', config=config)
+    )
+
+
+def update_search_vector(queryset):
+    """Przelicza search_vector dla postów z querysetu (jeden UPDATE)"""
+    if is_supported():
+        queryset.update(search_vector=build_search_vector())
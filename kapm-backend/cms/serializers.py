@@ -1,11 +1,37 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+from core.images import VARIANT_FORMATS
+from core.models import Document
+from . import bulk
 from .models import (
     BlogPost, Category, Tag, Page, MediaFile,
-    UserProfile, Comment
+    UserProfile, Comment, UploadSession, RelatedPosts
 )
 
 
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Mapa URL-i responsywnych wariantów obrazu w stylu srcset:
+    {'webp': {'320': url, '640': url}, 'jpeg': {...}}
+    """
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        result = {}
+        for extension in VARIANT_FORMATS:
+            urls = {}
+            for width, name in sorted((value or {}).get(extension, {}).items(), key=lambda item: int(item[0])):
+                url = default_storage.url(name)
+                urls[width] = request.build_absolute_uri(url) if request else url
+            if urls:
+                result[extension] = urls
+        return result
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer dla User"""
     full_name = serializers.SerializerMethodField()
@@ -22,6 +48,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
     """Serializer dla UserProfile"""
     user = UserSerializer(read_only=True)
     full_name = serializers.ReadOnlyField(source='full_name')
+    avatar_variants = ImageVariantsField()
 
     class Meta:
         model = UserProfile
@@ -30,26 +57,25 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
 class CategorySerializer(serializers.ModelSerializer):
     """Serializer dla Category"""
-    posts_count = serializers.SerializerMethodField()
+    posts_count = serializers.ReadOnlyField(source='published_posts_count')
 
     class Meta:
         model = Category
-        fields = '__all__'
+        exclude = ['published_posts_count', 'path']
 
-    def get_posts_count(self, obj):
-        return obj.posts.filter(status='published').count()
+    def validate_parent(self, value):
+        if self.instance is not None and self.instance.is_descendant_or_self(value):
+            raise serializers.ValidationError("Kategoria nie może być podkategorią samej siebie")
+        return value
 
 
 class TagSerializer(serializers.ModelSerializer):
     """Serializer dla Tag"""
-    posts_count = serializers.SerializerMethodField()
+    posts_count = serializers.ReadOnlyField(source='published_posts_count')
 
     class Meta:
         model = Tag
-        fields = '__all__'
-
-    def get_posts_count(self, obj):
-        return obj.posts.filter(status='published').count()
+        exclude = ['published_posts_count']
 
 
 class BlogPostListSerializer(serializers.ModelSerializer):
@@ -58,16 +84,32 @@ class BlogPostListSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     is_published = serializers.ReadOnlyField()
+    featured_image_variants = ImageVariantsField()
 
     class Meta:
         model = BlogPost
         fields = [
-            'id', 'title', 'slug', 'excerpt', 'featured_image',
+            'id', 'title', 'slug', 'excerpt', 'featured_image', 'featured_image_variants',
             'status', 'published_at', 'author', 'category', 'tags',
-            'views_count', 'is_featured', 'is_published', 'created_at'
+            'views_count', 'is_featured', 'is_published', 'reading_time', 'created_at'
         ]
 
 
+class BlogPostSearchSerializer(BlogPostListSerializer):
+    """Serializer dla wyników wyszukiwania - trafność i fragmenty z podświetleniem"""
+    search_rank = serializers.SerializerMethodField()
+    search_headline = serializers.SerializerMethodField()
+
+    class Meta(BlogPostListSerializer.Meta):
+        fields = BlogPostListSerializer.Meta.fields + ['search_rank', 'search_headline']
+
+    def get_search_rank(self, obj):
+        return getattr(obj, 'search_rank', None)
+
+    def get_search_headline(self, obj):
+        return getattr(obj, 'search_headline', None)
+
+
 class BlogPostDetailSerializer(serializers.ModelSerializer):
     """Serializer dla szczegółów posta bloga"""
     author = UserSerializer(read_only=True)
@@ -75,14 +117,56 @@ class BlogPostDetailSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True, read_only=True)
     is_published = serializers.ReadOnlyField()
     comments_count = serializers.SerializerMethodField()
+    featured_image_variants = ImageVariantsField()
+    related = serializers.SerializerMethodField()
 
     class Meta:
         model = BlogPost
-        fields = '__all__'
+        exclude = ['search_vector', 'render_version']
 
     def get_comments_count(self, obj):
         return obj.comments.filter(is_approved=True).count()
 
+    def get_related(self, obj):
+        """Wstępnie policzone powiązane posty (cms/related.py)"""
+        try:
+            items = obj.related_posts.items
+        except RelatedPosts.DoesNotExist:
+            return []
+        request = self.context.get('request')
+        result = []
+        for item in items:
+            image = item['featured_image']
+            if image:
+                image = default_storage.url(image)
+                image = request.build_absolute_uri(image) if request else image
+            result.append(dict(item, featured_image=image or None))
+        return result
+
+
+class PublicBlogPostDetailSerializer(BlogPostDetailSerializer):
+    """Szczegóły posta dla publicznego API - tylko wyrenderowany HTML, bez surowej treści"""
+
+    class Meta(BlogPostDetailSerializer.Meta):
+        exclude = BlogPostDetailSerializer.Meta.exclude + ['content']
+
+
+class BlogPostBulkSerializer(serializers.Serializer):
+    """Serializer dla operacji masowych na postach (cms/bulk.py)"""
+    action = serializers.ChoiceField(choices=bulk.ACTIONS)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False,
+                                max_length=bulk.MAX_IDS)
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), allow_null=True,
+                                                  required=False)
+    tags = serializers.PrimaryKeyRelatedField(queryset=Tag.objects.all(), many=True, required=False)
+
+    def validate(self, attrs):
+        if attrs['action'] == 'set_category' and 'category' not in attrs:
+            raise serializers.ValidationError({'category': 'To pole jest wymagane dla tej akcji.'})
+        if attrs['action'] in ('add_tags', 'remove_tags') and not attrs.get('tags'):
+            raise serializers.ValidationError({'tags': 'To pole jest wymagane dla tej akcji.'})
+        return attrs
+
 
 class BlogPostWriteSerializer(serializers.ModelSerializer):
     """Serializer do tworzenia/edycji postów bloga"""
@@ -97,7 +181,7 @@ class BlogPostWriteSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BlogPost
-        fields = '__all__'
+        exclude = ['search_vector', 'render_version']
         read_only_fields = ['slug', 'views_count']
 
 
@@ -105,14 +189,22 @@ class PageSerializer(serializers.ModelSerializer):
     """Serializer dla Page"""
     class Meta:
         model = Page
-        fields = '__all__'
+        exclude = ['render_version']
         read_only_fields = ['slug']
 
 
+class PublicPageSerializer(PageSerializer):
+    """Strona dla publicznego API - tylko wyrenderowany HTML, bez surowej treści"""
+
+    class Meta(PageSerializer.Meta):
+        exclude = PageSerializer.Meta.exclude + ['content']
+
+
 class MediaFileSerializer(serializers.ModelSerializer):
     """Serializer dla MediaFile"""
     uploaded_by = UserSerializer(read_only=True)
     file_url = serializers.SerializerMethodField()
+    file_variants = ImageVariantsField()
 
     class Meta:
         model = MediaFile
@@ -128,6 +220,61 @@ class MediaFileSerializer(serializers.ModelSerializer):
         return None
 
 
+class MediaFileUploadSerializer(MediaFileSerializer):
+    """MediaFile tworzony z sesji przesyłania - plik pochodzi z sesji, nie z żądania"""
+
+    class Meta(MediaFileSerializer.Meta):
+        read_only_fields = MediaFileSerializer.Meta.read_only_fields + ['file']
+
+
+class DocumentUploadSerializer(serializers.ModelSerializer):
+    """Dokument klienta tworzony z sesji przesyłania"""
+    uploaded_by = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Document
+        fields = '__all__'
+        read_only_fields = ['file', 'uploaded_by']
+
+
+UPLOAD_TARGET_SERIALIZERS = {
+    'media': MediaFileUploadSerializer,
+    'document': DocumentUploadSerializer,
+}
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Serializer dla sesji przesyłania kawałkami"""
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'target', 'filename', 'total_size', 'offset', 'metadata', 'chunks',
+                  'created_at', 'updated_at']
+        read_only_fields = ['offset', 'chunks']
+
+    def validate_filename(self, value):
+        try:
+            return get_valid_filename(value.replace('\\', '/').rsplit('/', 1)[-1])
+        except SuspiciousFileOperation:
+            raise serializers.ValidationError("Nieprawidłowa nazwa pliku")
+
+    def validate_total_size(self, value):
+        if not 0 < value <= settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Rozmiar pliku musi mieścić się w zakresie 1-{settings.UPLOAD_MAX_SIZE} bajtów"
+            )
+        return value
+
+    def validate(self, data):
+        # Dane obiektu sprawdzamy od razu, żeby nie przesyłać pliku na próżno
+        target_serializer = UPLOAD_TARGET_SERIALIZERS[data['target']](
+            data=data.get('metadata', {}), context=self.context
+        )
+        if not target_serializer.is_valid():
+            raise serializers.ValidationError({'metadata': target_serializer.errors})
+        return data
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """Serializer dla Comment"""
     author = UserSerializer(read_only=True)
@@ -136,9 +283,13 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = '__all__'
-        read_only_fields = ['author', 'is_approved']
+        read_only_fields = ['author', 'is_approved', 'path', 'depth']
 
     def get_replies(self, obj):
+        tree = self.context.get('comment_tree')
+        if tree is not None:
+            # Drzewo zbudowane wcześniej jednym zapytaniem (cms/comments.py)
+            return CommentSerializer(tree.get(obj.pk, []), many=True, context=self.context).data
         if obj.parent is None:
             # Tylko dla komentarzy głównych zwracamy odpowiedzi
             replies = obj.replies.filter(is_approved=True)
@@ -152,6 +303,12 @@ class CommentWriteSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ['post', 'content', 'parent', 'author_name', 'author_email']
 
+    def validate_parent(self, value):
+        # Odpowiedź głębiej nie zmieściłaby się w Comment.path
+        if value is not None and value.depth >= Comment.MAX_DEPTH:
+            raise serializers.ValidationError("Nie można odpowiedzieć na komentarz na najgłębszym poziomie wątku")
+        return value
+
     def validate(self, data):
         # Jeśli użytkownik jest zalogowany, używamy jego danych
         request = self.context.get('request')
@@ -178,4 +335,5 @@ class DashboardStatsSerializer(serializers.Serializer):
     pending_comments = serializers.IntegerField()
     total_users = serializers.IntegerField()
     total_media = serializers.IntegerField()
-    total_views = serializers.IntegerField()
\ No newline at end of file
+    total_views = serializers.IntegerField()
+    refreshed_at = serializers.DateTimeField()
\ No newline at end of file
@@ -0,0 +1,189 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from core import images, storage
+from core.models import NewsItem
+
+from . import cache, categories, counters, dashboard, related, syndication, view_counter
+from .models import BlogPost, Category, Tag, Comment, MediaFile, Page, UserProfile
+
+
+# ==================== CACHE API BLOGA ====================
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def invalidate_post_cache(sender, instance, **kwargs):
+    """Unieważnia cache listy i szczegółów zmienionego posta"""
+    cache.invalidate_posts([instance.pk])
+
+
+@receiver(post_delete, sender=BlogPost)
+def forget_post_views(sender, instance, **kwargs):
+    """Liczniki wyświetleń w cache nie mają TTL - usuwane razem z postem"""
+    view_counter.forget(instance.pk)
+
+
+@receiver(images.variants_updated, sender=BlogPost)
+def invalidate_post_cache_on_variants(sender, instance, **kwargs):
+    """Warianty obrazka są zapisywane przez update() - bez post_save"""
+    cache.invalidate_posts([instance.pk])
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def invalidate_post_tags_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    """Unieważnia cache po zmianie tagów posta (z obu stron relacji)"""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            cache.invalidate_posts([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        cache.invalidate_posts(pk_set)
+    elif action == 'pre_clear':
+        cache.invalidate_posts(instance.posts.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def invalidate_category_cache(sender, instance, **kwargs):
+    """
+    Kategoria jest zagnieżdżona w odpowiedziach - unieważnia jej posty i drzewo kategorii.
+    Po zatwierdzeniu transakcji: post_save przychodzi przed zapisem ścieżki (Category.update_path).
+    """
+    post_pks = list(BlogPost.objects.filter(category_id=instance.pk).values_list('pk', flat=True))
+
+    def invalidate():
+        cache.invalidate_posts(post_pks)
+        categories.invalidate_tree()
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def invalidate_tag_cache(sender, instance, **kwargs):
+    """Tag jest zagnieżdżony w odpowiedziach - unieważnia jego posty"""
+    cache.invalidate_posts(BlogPost.objects.filter(tags=instance.pk).values_list('pk', flat=True))
+
+
+# ==================== LICZNIKI POSTÓW ====================
+
+@receiver(post_save, sender=BlogPost)
+def update_post_counts(sender, instance, created, raw=False, **kwargs):
+    """Aktualizuje liczniki kategorii i tagów po zmianie statusu lub kategorii"""
+    if not raw:
+        counters.post_saved(instance, created)
+
+
+@receiver(pre_delete, sender=BlogPost)
+def update_post_counts_on_delete(sender, instance, **kwargs):
+    """Tagi trzeba odczytać przed usunięciem - relacja M2M znika wraz z postem"""
+    counters.post_deleted(instance, list(instance.tags.values_list('pk', flat=True)))
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def update_tag_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    """Aktualizuje liczniki tagów po zmianie relacji post-tag"""
+    if action in ('post_add', 'post_remove'):
+        delta = 1 if action == 'post_add' else -1
+        if reverse:
+            counters.tag_posts_changed(instance, pk_set, delta)
+        else:
+            counters.post_tags_changed(instance, pk_set, delta)
+    elif action == 'pre_clear':
+        if reverse:
+            counters.tag_posts_changed(instance, instance.posts.values_list('pk', flat=True), -1)
+        else:
+            counters.post_tags_changed(instance, instance.tags.values_list('pk', flat=True), -1)
+
+
+# ==================== STATYSTYKI DASHBOARDU ====================
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def mark_dashboard_stale(sender, **kwargs):
+    """Zmiana statusu posta lub zatwierdzenia komentarza zmienia statystyki"""
+    dashboard.mark_stale()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=MediaFile)
+def mark_dashboard_stale_on_create(sender, created, **kwargs):
+    """Dla użytkowników i mediów liczy się tylko liczba - zapis bez utworzenia jej nie zmienia"""
+    if created:
+        dashboard.mark_stale()
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=MediaFile)
+def mark_dashboard_stale_on_delete(sender, **kwargs):
+    dashboard.mark_stale()
+
+
+# ==================== MAPA WITRYNY I KANAŁY ====================
+
+@receiver(pre_save, sender=BlogPost)
+@receiver(pre_save, sender=Page)
+@receiver(pre_save, sender=NewsItem)
+def remember_syndication_shard(sender, instance, raw=False, **kwargs):
+    """Fragment sprzed zmiany - obiekt wycofany lub przeniesiony na inny rok znika ze starego"""
+    instance._syndication_shard = None
+    if raw or instance.pk is None:
+        return
+    old = sender.objects.filter(pk=instance.pk).only(*syndication.shard_fields(sender)).first()
+    if old is not None:
+        instance._syndication_shard = syndication.document_shard(old)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=Page)
+@receiver(post_save, sender=NewsItem)
+def regenerate_syndication_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        syndication.schedule(syndication.affected_documents({
+            getattr(instance, '_syndication_shard', None), syndication.document_shard(instance),
+        }))
+
+
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_delete, sender=Page)
+@receiver(post_delete, sender=NewsItem)
+def regenerate_syndication_on_delete(sender, instance, **kwargs):
+    syndication.schedule(syndication.affected_documents({syndication.document_shard(instance)}))
+
+
+# ==================== POWIĄZANE POSTY ====================
+
+@receiver(post_save, sender=BlogPost)
+def schedule_related_posts_on_save(sender, instance, created, raw=False, **kwargs):
+    if not raw and related.affects_related(instance, created):
+        related.schedule()
+
+
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def schedule_related_posts(sender, **kwargs):
+    if not kwargs.get('raw'):
+        related.schedule()
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def schedule_related_posts_on_tags(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        related.schedule()
+
+
+# ==================== WARIANTY OBRAZÓW ====================
+
+images.register(BlogPost, 'featured_image')
+images.register(MediaFile, 'file', condition=lambda media: media.file_type == 'image')
+images.register(UserProfile, 'avatar')
+
+
+# ==================== MAGAZYN ADRESOWANY TREŚCIĄ ====================
+
+storage.track(MediaFile)
@@ -0,0 +1,326 @@
+"""
+Mapa witryny (sitemap) i kanały RSS/Atom/JSON.
+
+Dokumenty są generowane z wyprzedzeniem i trzymane w cache (SYNDICATION_CACHE_TIMEOUT):
+    index        - indeks map witryny (/sitemap.xml)
+    blog-<rok>   - posty opublikowane w danym roku
+    news-<rok>   - aktualności (core.NewsItem) z danego roku
+    pages        - opublikowane strony
+    blog.rss, blog.atom, blog.json, news.rss, ... - najnowsze wpisy (SYNDICATION_FEED_ITEMS)
+
+Po zapisie lub usunięciu treści sygnały (cms/signals.py) przekazują do zadania
+regenerate_syndication tylko dotknięte fragmenty - rok sprzed zmiany i po zmianie,
+kanał danego źródła oraz indeks. Brakujący wpis w cache generowany jest przy odczycie.
+
+Linki prowadzą do frontendu (SITE_URL + SYNDICATION_PATHS); frontend przekazuje
+/sitemap.xml, /sitemaps/ i /feeds/ do backendu, żeby mapy leżały w tej samej domenie.
+"""
+import hashlib
+import json
+from datetime import MAXYEAR, MINYEAR, datetime
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import DateTimeField
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils import feedgenerator, timezone
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from core.models import NewsItem
+from .models import BlogPost, Page
+
+GENERATION_KEY = 'cms:syndication:generation'
+DOCUMENT_KEY = 'cms:syndication:g{generation}:{name}'
+INDEX = 'index'
+PAGES = 'pages'
+FEED_FORMATS = {
+    'rss': feedgenerator.Rss201rev2Feed,
+    'atom': feedgenerator.Atom1Feed,
+    'json': None,
+}
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+# ==================== ŹRÓDŁA ====================
+
+def published_posts():
+    return BlogPost.objects.filter(status='published', published_at__lte=timezone.now()).annotate(
+        date=Coalesce('published_at', 'created_at', output_field=DateTimeField())
+    )
+
+
+def published_news():
+    return NewsItem.objects.filter(is_published=True).annotate(
+        date=Coalesce('published_at', 'created_at', output_field=DateTimeField())
+    ).filter(date__lte=timezone.now())
+
+
+SOURCES = {
+    'blog': published_posts,
+    'news': published_news,
+}
+
+
+def item_url(kind, slug):
+    return settings.SITE_URL.rstrip('/') + settings.SYNDICATION_PATHS[kind].format(slug=slug)
+
+
+def document_shard(instance):
+    """Fragment mapy witryny, w którym jest obiekt w bieżącym stanie (None - niepubliczny)"""
+    if isinstance(instance, Page):
+        return PAGES if instance.is_published else None
+    if isinstance(instance, BlogPost):
+        published = instance.status == 'published'
+        source = 'blog'
+    else:
+        published = instance.is_published
+        source = 'news'
+    date = instance.published_at or instance.created_at
+    if not published or date is None:
+        return None
+    return f'{source}-{timezone.localtime(date).year}'
+
+
+def shard_fields(model):
+    """Pola, od których zależy fragment obiektu (do odczytu stanu sprzed zmiany)"""
+    if model is Page:
+        return ('is_published',)
+    if model is BlogPost:
+        return ('status', 'published_at', 'created_at')
+    return ('is_published', 'published_at', 'created_at')
+
+
+def affected_documents(shards):
+    """Nazwy dokumentów do przebudowy po zmianie obiektów z podanych fragmentów"""
+    names = {shard for shard in shards if shard}
+    for shard in list(names):
+        source = shard.split('-')[0]
+        if source in SOURCES:
+            names.update(f'{source}.{fmt}' for fmt in FEED_FORMATS)
+    if names:
+        names.add(INDEX)
+    return names
+
+
+# ==================== GENEROWANIE ====================
+
+def _year_bounds(year):
+    """Początek roku i następnego albo None dla roku poza zakresem datetime (także po zmianie strefy)"""
+    if not MINYEAR < year < MAXYEAR:
+        return None
+    tz = timezone.get_current_timezone()
+    return datetime(year, 1, 1, tzinfo=tz), datetime(year + 1, 1, 1, tzinfo=tz)
+
+
+def _document(content, content_type, last_modified):
+    last_modified = last_modified or timezone.now()
+    return {
+        'content': content,
+        'content_type': content_type,
+        'last_modified': last_modified.timestamp(),
+        'etag': hashlib.md5(content.encode()).hexdigest(),
+    }
+
+
+def _write_xml(root, entries, child):
+    """entries: lista słowników {'loc': ..., 'lastmod': datetime}"""
+    output = StringIO()
+    handler = SimplerXMLGenerator(output, 'utf-8')
+    handler.startDocument()
+    handler.startElement(root, {'xmlns': SITEMAP_NS})
+    for entry in entries:
+        handler.startElement(child, {})
+        handler.addQuickElement('loc', entry['loc'])
+        if entry.get('lastmod'):
+            handler.addQuickElement('lastmod', entry['lastmod'].isoformat())
+        handler.endElement(child)
+    handler.endElement(root)
+    return output.getvalue()
+
+
+def render_sitemap(name):
+    if name == PAGES:
+        rows = Page.objects.filter(is_published=True).order_by('menu_order', 'pk').values('slug', 'updated_at')
+        kind = 'page'
+    else:
+        source, _, year = name.partition('-')
+        if source not in SOURCES or not year.isdigit():
+            return None
+        bounds = _year_bounds(int(year))
+        if bounds is None:
+            return None
+        start, end = bounds
+        rows = SOURCES[source]().filter(date__gte=start, date__lt=end).order_by('date', 'pk').values(
+            'slug', 'updated_at'
+        )
+        kind = source
+
+    entries = [{'loc': item_url(kind, row['slug']), 'lastmod': row['updated_at']} for row in rows]
+    if not entries and name != PAGES:
+        return None
+    content = _write_xml('urlset', entries, 'url')
+    return _document(content, 'application/xml', max((e['lastmod'] for e in entries), default=None))
+
+
+def sitemap_names():
+    """Wszystkie istniejące fragmenty mapy witryny - jedno zapytanie DISTINCT na źródło"""
+    names = [PAGES]
+    for source, queryset in SOURCES.items():
+        years = queryset().dates('date', 'year', order='DESC')
+        names.extend(f'{source}-{year.year}' for year in years)
+    return names
+
+
+def render_index():
+    entries = []
+    for name in sitemap_names():
+        document = get_document(name)
+        if document is None:
+            continue
+        entries.append({
+            'loc': settings.SITE_URL.rstrip('/') + reverse('sitemap-shard', kwargs={'name': name}),
+            'lastmod': datetime.fromtimestamp(document['last_modified'], tz=timezone.get_current_timezone()),
+        })
+    content = _write_xml('sitemapindex', entries, 'sitemap')
+    return _document(content, 'application/xml', max((e['lastmod'] for e in entries), default=None))
+
+
+def render_feeds(source):
+    """Generuje wszystkie formaty kanału źródła z jednego zapytania"""
+    items = list(
+        SOURCES[source]().select_related('author').order_by('-date', '-pk')[:settings.SYNDICATION_FEED_ITEMS]
+    )
+    title = settings.SYNDICATION_FEED_TITLES[source]
+    link = settings.SITE_URL.rstrip('/') + settings.SYNDICATION_PATHS[f'{source}_index']
+    last_modified = max((item.updated_at for item in items), default=None)
+
+    documents = {}
+    for fmt, feed_class in FEED_FORMATS.items():
+        feed_url = settings.SITE_URL.rstrip('/') + reverse('feed', kwargs={'source': source, 'fmt': fmt})
+        if feed_class is None:
+            content = json.dumps(_json_feed(items, source, title, link, feed_url), ensure_ascii=False)
+            documents[f'{source}.{fmt}'] = _document(content, 'application/feed+json', last_modified)
+            continue
+
+        feed = feed_class(title=title, link=link, description=title, language='pl', feed_url=feed_url)
+        for item in items:
+            feed.add_item(
+                title=item.title,
+                link=item_url(source, item.slug),
+                description=item.excerpt,
+                unique_id=item_url(source, item.slug),
+                pubdate=item.date,
+                updateddate=item.updated_at,
+                author_name=_author_name(item),
+            )
+        documents[f'{source}.{fmt}'] = _document(
+            feed.writeString('utf-8'), feed.content_type, last_modified
+        )
+    return documents
+
+
+def _author_name(item):
+    if item.author is None:
+        return None
+    return item.author.get_full_name() or item.author.username
+
+
+def _json_feed(items, source, title, link, feed_url):
+    """JSON Feed 1.1 (https://jsonfeed.org/version/1.1)"""
+    return {
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': title,
+        'home_page_url': link,
+        'feed_url': feed_url,
+        'language': 'pl',
+        'items': [
+            {
+                'id': item_url(source, item.slug),
+                'url': item_url(source, item.slug),
+                'title': item.title,
+                'summary': item.excerpt,
+                'date_published': item.date.isoformat(),
+                'date_modified': item.updated_at.isoformat(),
+                **({'authors': [{'name': _author_name(item)}]} if item.author else {}),
+            }
+            for item in items
+        ],
+    }
+
+
+def render(name):
+    """Generuje dokument (dla kanału - wszystkie formaty źródła) i zwraca {nazwa: dokument}"""
+    if name == INDEX:
+        return {INDEX: render_index()}
+    source, dot, fmt = name.partition('.')
+    if dot:
+        if source not in SOURCES or fmt not in FEED_FORMATS:
+            return {}
+        return render_feeds(source)
+    return {name: render_sitemap(name)}
+
+
+# ==================== CACHE ====================
+
+def _key(name):
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return DOCUMENT_KEY.format(generation=generation, name=name)
+
+
+def get_document(name):
+    document = cache.get(_key(name))
+    if document is None:
+        documents = render(name)
+        store(documents)
+        document = documents.get(name)
+    return document
+
+
+def store(documents):
+    for name, document in documents.items():
+        if document is None:
+            cache.delete(_key(name))
+        else:
+            cache.set(_key(name), document, settings.SYNDICATION_CACHE_TIMEOUT)
+
+
+def regenerate(names):
+    """Przebudowuje podane dokumenty; indeks na końcu, bo zależy od fragmentów"""
+    names = set(names)
+    done = set()
+    for name in sorted(names - {INDEX}):
+        if name not in done:
+            documents = render(name)
+            store(documents)
+            done.update(documents)
+    if INDEX in names:
+        store(render(INDEX))
+        done.add(INDEX)
+    return sorted(done)
+
+
+def schedule(names):
+    """Przebudowa w tle po zatwierdzeniu transakcji (zadanie regenerate_syndication)"""
+    if not names:
+        return
+    from .tasks import regenerate_syndication
+
+    names = sorted(names)
+    transaction.on_commit(lambda: regenerate_syndication.delay(names))
+
+
+def invalidate_all():
+    """
+    Dla operacji masowych omijających sygnały - nowa generacja kluczy,
+    dokumenty wygenerują się przy odczycie (stare wygasną po SYNDICATION_CACHE_TIMEOUT).
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 2, None)
@@ -0,0 +1,58 @@
+from celery import shared_task
+
+from . import analytics, cache, dashboard, related, scheduling, syndication, uploads, view_counter
+from .models import BlogPost
+
+
+def _record_flushed_views(pending):
+    """Statystyki w przedziałach i migawka dashboardu - w transakcji zapisu wyświetleń"""
+    analytics.record_views(pending)
+    dashboard.add_views(sum(pending.values()))
+
+
+@shared_task
+def flush_view_counts():
+    """Zapisuje buforowane wyświetlenia postów do bazy"""
+    pending = view_counter.flush(BlogPost.objects.all(), on_flush=_record_flushed_views)
+    if pending:
+        # Listy w cache dostają bieżące liczby wyświetleń z view_counter - unieważniamy tylko szczegóły
+        cache.invalidate_details(pending)
+    return len(pending)
+
+
+@shared_task
+def refresh_dashboard_snapshot():
+    """Okresowo przelicza migawkę - obejmuje zmiany z pominięciem sygnałów (update())"""
+    dashboard.refresh_snapshot()
+
+
+@shared_task
+def compact_view_stats():
+    """Usuwa stare godzinowe i dzienne statystyki wyświetleń (miesięczne zostają)"""
+    return analytics.compact()
+
+
+@shared_task
+def cleanup_upload_sessions():
+    """Usuwa porzucone sesje przesyłania razem z plikami tymczasowymi"""
+    return uploads.cleanup()
+
+
+@shared_task
+def regenerate_syndication(names):
+    """Przebudowuje wskazane fragmenty mapy witryny i kanały"""
+    return syndication.regenerate(names)
+
+
+@shared_task
+def rebuild_related_posts():
+    """Przelicza listy powiązanych postów"""
+    # Zmiany w trakcie przeliczania zaplanują kolejny przebieg
+    related.clear_pending()
+    return related.rebuild()
+
+
+@shared_task
+def publish_scheduled_posts():
+    """Publikuje zaplanowane posty, których czas nadszedł, i rozgrzewa cache"""
+    return scheduling.publish_due()
@@ -1,3 +1,126 @@
+import base64
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from . import view_counter
+from .models import BlogPost
+
+
+def create_posts(count, **kwargs):
+    author = User.objects.create_user(username='autor')
+    return [
+        BlogPost.objects.create(title=f'Post {i}', content='Treść', author=author, status='published', **kwargs)
+        for i in range(count)
+    ]
+
+
+class ViewCounterFlushTests(TestCase):
+    """Buforowany licznik wyświetleń (cms/view_counter.py)"""
+
+    def setUp(self):
+        cache.clear()
+        self.first, self.second = create_posts(2)
+
+    def flush(self):
+        return view_counter.flush(BlogPost.objects.all())
+
+    def views_count(self, post):
+        return BlogPost.objects.values_list('views_count', flat=True).get(pk=post.pk)
+
+    def test_flush_writes_pending_views(self):
+        view_counter.increment(self.first.pk)
+        view_counter.increment(self.first.pk)
+        self.assertEqual(self.flush(), {self.first.pk: 2})
+        self.assertEqual(self.views_count(self.first), 2)
+        self.assertEqual(view_counter.get_pending_total(), 0)
+        self.assertEqual(self.flush(), {})
+
+    def test_flush_skips_log_gap_after_grace(self):
+        view_counter.increment(self.first.pk)
+        # Wpis dziennika utracony (awaria między numerem a zapisem albo usunięty przez Redis)
+        cache.delete(view_counter.DIRTY_LOG_KEY.format(number=1))
+        view_counter.increment(self.second.pk)
+
+        self.assertEqual(self.flush(), {})  # Luka świeża - wpis może się jeszcze pojawić
+
+        later = view_counter.time.time() + view_counter.DIRTY_GAP_GRACE + 1
+        with mock.patch.object(view_counter.time, 'time', return_value=later):
+            self.assertEqual(self.flush(), {self.second.pk: 1})
+        self.assertEqual(self.views_count(self.second), 1)
+
+        # Po wygaśnięciu znacznika kolejne wyświetlenie dopisuje post ponownie - z zaległym przyrostem
+        cache.delete(view_counter.DIRTY_KEY.format(pk=self.first.pk))
+        view_counter.increment(self.first.pk)
+        self.assertEqual(self.flush(), {self.first.pk: 2})
+        self.assertEqual(self.views_count(self.first), 2)
+
+
+class KeysetPaginationTests(TestCase):
+    """Paginacja kursorowa publicznej listy postów (cms/pagination.py)"""
+
+    url = '/api/public/blog/'
+
+    def setUp(self):
+        cache.clear()
+        create_posts(12)
+
+    def cursor(self, payload):
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def test_next_link_returns_remaining_posts(self):
+        first = self.client.get(self.url).json()
+        second = self.client.get(first['next']).json()
+        ids = [post['id'] for post in first['results'] + second['results']]
+        self.assertEqual(len(ids), 12)
+        self.assertEqual(len(set(ids)), 12)
+        self.assertIsNone(second['next'])
+
+    def test_invalid_cursor_returns_404(self):
+        payloads = [
+            {'v': 'abc', 'id': 1},
+            {'v': [1], 'id': 1},
+            {'v': {'a': 1}, 'id': 1},
+            {'v': '2026-01-01T00:00:00', 'id': 1},
+            {'v': '2026-01-01T00:00:00+00:00', 'id': 'x'},
+            [1],
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                response = self.client.get(self.url, {'cursor': self.cursor(payload)})
+                self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(self.url, {'cursor': '%%%'}).status_code, 404)
+
+
+class ConditionalGetTests(TestCase):
+    """ETag / Last-Modified publicznego API bloga (cms/conditional.py)"""
+
+    def setUp(self):
+        cache.clear()
+        [self.post] = create_posts(1)
+
+    def test_if_none_match_for_missing_post_returns_404(self):
+        for pk in ('999', 'abc'):
+            with self.subTest(pk=pk):
+                response = self.client.get(f'/api/public/blog/{pk}/', HTTP_IF_NONE_MATCH='*')
+                self.assertEqual(response.status_code, 404)
+        self.assertEqual(view_counter.get_pending_total(), 0)
+
+    def test_detail_not_modified_counts_view(self):
+        url = f'/api/public/blog/{self.post.pk}/'
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(view_counter.get_pending([self.post.pk]), {self.post.pk: 2})
+
+    def test_list_not_modified_without_queries(self):
+        response = self.client.get('/api/public/blog/')
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/public/blog/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,129 @@
+"""
+Przesyłanie dużych plików kawałkami z możliwością wznowienia.
+
+Protokół (endpointy w UploadSessionViewSet):
+    POST   /api/admin/uploads/                  -> sesja (target, filename, total_size, metadata)
+    PUT    /api/admin/uploads/<id>/chunk/       -> kawałek; nagłówki Upload-Offset i Upload-Checksum (sha256, hex)
+    GET    /api/admin/uploads/<id>/             -> bieżący offset (wznowienie po zerwanym połączeniu)
+    POST   /api/admin/uploads/<id>/finalize/    -> utworzenie MediaFile lub Document
+    DELETE /api/admin/uploads/<id>/             -> przerwanie i usunięcie pliku tymczasowego
+
+Kawałki są dopisywane bezpośrednio do pliku tymczasowego w MEDIA_ROOT, a finalize
+przekazuje go do magazynu pola FileField - rozmiar pochodzi z sesji, a plik jest
+czytany tylko raz, do policzenia hasha treści.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import UploadSession
+
+TEMP_DIR = 'uploads/tmp'
+
+
+class OffsetMismatch(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Nieprawidłowy offset kawałka'
+
+    def __init__(self, offset):
+        super().__init__()
+        # Offset jako liczba (APIException zamienia wartości szczegółów na tekst)
+        self.detail = {'detail': self.default_detail, 'offset': offset}
+
+
+class ChunkTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Kawałek przekracza dozwolony rozmiar'
+
+
+def start(**fields):
+    """Tworzy sesję i pusty plik tymczasowy"""
+    session = UploadSession(**fields)
+    session.temp_name = default_storage.save(f'{TEMP_DIR}/{session.id}.part', ContentFile(b''))
+    session.save()
+    return session
+
+
+def write_chunk(session, offset, stream, length, checksum):
+    """
+    Zapisuje kawałek pod podanym offsetem i zwraca nowy offset.
+    Offset musi być równy liczbie już przyjętych bajtów - w przeciwnym razie
+    klient dostaje 409 z aktualnym offsetem i wznawia od niego.
+    """
+    if length > settings.UPLOAD_CHUNK_MAX_SIZE:
+        raise ChunkTooLarge()
+    data = stream.read(length) if length else b''
+    if not data or len(data) != length:
+        raise ValidationError({'detail': 'Pusty lub niekompletny kawałek'})
+    if hashlib.sha256(data).hexdigest() != (checksum or '').lower():
+        raise ValidationError({'detail': 'Suma kontrolna kawałka się nie zgadza'})
+
+    with transaction.atomic():
+        # Blokada wiersza - równoległe PUT dla tej samej sesji czekają na siebie
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if offset != session.offset:
+            raise OffsetMismatch(session.offset)
+        if offset + length > session.total_size:
+            raise ValidationError({'detail': 'Kawałek wykracza poza zadeklarowany rozmiar pliku'})
+
+        with open(default_storage.path(session.temp_name), 'r+b') as temp_file:
+            temp_file.seek(offset)
+            temp_file.write(data)
+            # Pozostałości po przerwanym zapisie za nowym offsetem są odcinane
+            temp_file.truncate()
+
+        session.offset = offset + length
+        session.chunks.append({'offset': offset, 'size': length, 'sha256': checksum.lower()})
+        session.save(update_fields=['offset', 'chunks', 'updated_at'])
+    return session
+
+
+def finalize(session, serializer):
+    """
+    Przekazuje złożony plik do magazynu pola FileField (deduplikacja, core/storage.py)
+    i zapisuje obiekt przez serializer (MediaFile lub Document) w jednej transakcji
+    z usunięciem sesji. Plik tymczasowy znika dopiero po zatwierdzeniu.
+    """
+    model = serializer.Meta.model
+    field = model._meta.get_field('file')
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if not session.is_complete:
+            raise OffsetMismatch(session.offset)
+
+        name = field.storage.adopt(
+            default_storage.path(session.temp_name), field.generate_filename(None, session.filename)
+        )
+        extra = {'file_original_name': session.filename}
+        if hasattr(model, 'file_size'):
+            extra['file_size'] = session.total_size
+        instance = serializer.save(file=name, uploaded_by=session.uploaded_by, **extra)
+        session.delete()
+        transaction.on_commit(lambda: default_storage.delete(session.temp_name))
+    return instance
+
+
+def abort(session):
+    default_storage.delete(session.temp_name)
+    session.delete()
+
+
+def cleanup(now=None):
+    """Usuwa porzucone sesje (bez aktywności dłużej niż UPLOAD_SESSION_TTL_HOURS)"""
+    now = now or timezone.now()
+    expired = UploadSession.objects.filter(
+        updated_at__lt=now - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+    )
+    count = 0
+    for session in expired:
+        abort(session)
+        count += 1
+    return count
@@ -21,6 +21,7 @@ admin_router.register(r'categories', views.AdminCategoryViewSet, basename='admin
 admin_router.register(r'tags', views.AdminTagViewSet, basename='admin-tags')
 admin_router.register(r'media', views.MediaFileViewSet, basename='media')
 admin_router.register(r'comments', views.AdminCommentViewSet, basename='admin-comments')
+admin_router.register(r'uploads', views.UploadSessionViewSet, basename='uploads')
 
 urlpatterns = [
     # Publiczne API
@@ -33,4 +34,10 @@ urlpatterns = [
     path('admin/dashboard/stats/', views.dashboard_stats_view, name='dashboard-stats'),
     path('admin/dashboard/recent-posts/', views.recent_posts_view, name='recent-posts'),
     path('admin/dashboard/recent-comments/', views.recent_comments_view, name='recent-comments'),
+    path('admin/dashboard/cache-stats/', views.cache_stats_view, name='cache-stats'),
+    path('admin/dashboard/storage-stats/', views.storage_stats_view, name='storage-stats'),
+
+    # Statystyki wyświetleń
+    path('admin/analytics/top-posts/', views.top_posts_view, name='analytics-top-posts'),
+    path('admin/analytics/posts/<int:pk>/', views.post_views_series_view, name='analytics-post-views'),
 ]
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""
+Buforowany (write-behind) licznik wyświetleń postów.
+
+Wyświetlenie zwiększa tylko liczniki w cache (Redis INCR), bez zapisu do bazy:
+    cms:views:pending:<pk>  - przyrost jeszcze niezapisany w bazie
+    cms:views:total:<pk>    - bieżąca liczba wyświetleń (baza + przyrost)
+Pierwsze wyświetlenie od ostatniego zapisu dopisuje post do dziennika "brudnych"
+postów (kolejne numery z licznika), więc okresowe zadanie flush_view_counts czyta
+tylko posty z nowymi wyświetleniami i przenosi przyrosty do BlogPost.views_count
+zbiorczymi UPDATE z F().
+
+Wpis dziennika może nie powstać (awaria między pobraniem numeru a zapisem) albo
+zostać usunięty przez Redis. Luka starsza niż DIRTY_GAP_GRACE sekund jest pomijana,
+a znacznik "brudny" wygasa po DIRTY_MARKER_TIMEOUT - kolejne wyświetlenie posta
+z utraconego wpisu dopisuje go ponownie.
+
+Odpowiedzi (także z cache odpowiedzi API) dostają views_count z licznika bieżącego,
+dlatego zapis do bazy nie musi unieważniać list. Brakujący licznik bieżący jest
+zakładany przy odczycie z wartości z bazy i przyrostu.
+"""
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+PENDING_KEY = 'cms:views:pending:{pk}'
+PENDING_TOTAL_KEY = 'cms:views:pending:total'
+TOTAL_KEY = 'cms:views:total:{pk}'
+DIRTY_KEY = 'cms:views:dirty:{pk}'
+DIRTY_SEQUENCE_KEY = 'cms:views:dirty:seq'
+DIRTY_LOG_KEY = 'cms:views:dirty:log:{number}'
+FLUSHED_SEQUENCE_KEY = 'cms:views:dirty:flushed'
+DIRTY_GAP_KEY = 'cms:views:dirty:gap:{number}'
+# Jak długo zapis czeka na brakujący wpis dziennika (numer już pobrany, wpis jeszcze niezapisany)
+DIRTY_GAP_GRACE = 60
+DIRTY_MARKER_TIMEOUT = 10 * 60
+FLUSH_LOCK_KEY = 'cms:views:flush:lock'
+FLUSH_LOCK_TIMEOUT = 5 * 60
+BATCH_SIZE = 1000
+
+
+def _incr(key, delta=1):
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, None)
+        return cache.incr(key, delta)
+
+
+def _mark_dirty(pk):
+    """Dopisuje post do dziennika - tylko pierwsze wyświetlenie od ostatniego zapisu"""
+    if cache.add(DIRTY_KEY.format(pk=pk), 1, DIRTY_MARKER_TIMEOUT):
+        cache.set(DIRTY_LOG_KEY.format(number=_incr(DIRTY_SEQUENCE_KEY)), pk, None)
+
+
+def increment(pk):
+    """Rejestruje wyświetlenie posta"""
+    _incr(PENDING_KEY.format(pk=pk))
+    _incr(PENDING_TOTAL_KEY)
+    try:
+        cache.incr(TOTAL_KEY.format(pk=pk))
+    except ValueError:
+        pass  # Licznik bieżący założy pierwszy odczyt (z przyrostem z PENDING_KEY)
+    _mark_dirty(pk)
+
+
+def get_pending(pks):
+    """Zwraca słownik {pk: przyrost} dla postów z niezapisanymi wyświetleniami"""
+    keys = {PENDING_KEY.format(pk=pk): pk for pk in pks}
+    return {keys[key]: delta for key, delta in cache.get_many(keys).items() if delta}
+
+
+def get_pending_total():
+    return cache.get(PENDING_TOTAL_KEY, 0)
+
+
+def get_totals(stored):
+    """
+    Bieżące liczby wyświetleń dla {pk: views_count z odpowiedzi}. Brakujące liczniki
+    bieżące są zakładane z wartości z odpowiedzi i przyrostu.
+    """
+    keys = {TOTAL_KEY.format(pk=pk): pk for pk in stored}
+    totals = {keys[key]: total for key, total in cache.get_many(keys).items()}
+    missing = [pk for pk in stored if pk not in totals]
+    if missing:
+        pending = get_pending(missing)
+        for pk in missing:
+            total = stored[pk] + pending.get(pk, 0)
+            if not cache.add(TOTAL_KEY.format(pk=pk), total, None):
+                total = cache.get(TOTAL_KEY.format(pk=pk), total)
+            totals[pk] = total
+    return totals
+
+
+def merge_pending(data):
+    """Wstawia bieżące liczby wyświetleń do zserializowanych postów (lista, strona lub pojedynczy post)"""
+    if isinstance(data, dict) and 'results' in data:
+        items = data['results']
+    elif isinstance(data, list):
+        items = data
+    else:
+        items = [data]
+
+    items = [item for item in items if isinstance(item, dict) and 'views_count' in item and 'id' in item]
+    if not items:
+        return data
+
+    totals = get_totals({item['id']: item['views_count'] for item in items})
+    for item in items:
+        item['views_count'] = totals[item['id']]
+    return data
+
+
+def forget(pk):
+    """Usuwa liczniki usuniętego posta"""
+    cache.delete_many([TOTAL_KEY.format(pk=pk), DIRTY_KEY.format(pk=pk)])
+
+
+def _dirty_pks():
+    """
+    Posty z dziennika od ostatniego zapisu: (pk, numer pierwszego i ostatniego przeczytanego wpisu).
+    Czytanie kończy się przed brakującym wpisem (numer pobrany, wpis jeszcze niezapisany) -
+    reszta zostaje na następny zapis. Wpis brakujący dłużej niż DIRTY_GAP_GRACE jest pomijany.
+    """
+    end = cache.get(DIRTY_SEQUENCE_KEY, 0)
+    start = cache.get(FLUSHED_SEQUENCE_KEY, 0)
+    if end < start:
+        # Cache wyczyszczony - dziennik zaczyna się od nowa
+        start = 0
+    pks = set()
+    last = start
+    for batch_start in range(start + 1, end + 1, BATCH_SIZE):
+        numbers = range(batch_start, min(batch_start + BATCH_SIZE, end + 1))
+        log = cache.get_many([DIRTY_LOG_KEY.format(number=number) for number in numbers])
+        for number in numbers:
+            pk = log.get(DIRTY_LOG_KEY.format(number=number))
+            if pk is None and not _gap_expired(number):
+                return pks, start, last
+            if pk is not None:
+                pks.add(pk)
+            last = number
+    return pks, start, last
+
+
+def _gap_expired(number):
+    """Czy brakujący wpis dziennika jest już uznany za utracony (pierwsze zauważenie zapamiętane w cache)"""
+    key = DIRTY_GAP_KEY.format(number=number)
+    now = time.time()
+    cache.add(key, now, 24 * 60 * 60)
+    return now - cache.get(key, now) >= DIRTY_GAP_GRACE
+
+
+def flush(queryset, on_flush=None):
+    """
+    Zapisuje zaległe wyświetlenia postów z dziennika (ograniczone do querysetu) do bazy.
+    Posty z tym samym przyrostem aktualizowane są jednym UPDATE.
+    on_flush(pending) działa w tej samej transakcji (np. statystyki w przedziałach) -
+    jego błąd cofa zapis i przywraca przyrost w cache.
+    Zwraca słownik {pk: przyrost} zapisanych wyświetleń.
+    """
+    if not cache.add(FLUSH_LOCK_KEY, 1, FLUSH_LOCK_TIMEOUT):
+        return {}
+    try:
+        return _flush(queryset, on_flush)
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+def _flush(queryset, on_flush):
+    dirty, start, last = _dirty_pks()
+    if not dirty:
+        return {}
+
+    # Znacznik zdejmujemy przed odczytem przyrostu - wyświetlenie w trakcie zapisu trafi do dziennika ponownie
+    cache.delete_many([DIRTY_KEY.format(pk=pk) for pk in dirty])
+    existing = set(queryset.filter(pk__in=dirty).values_list('pk', flat=True))
+    removed = get_pending(dirty - existing)
+    if removed:
+        # Posty usunięte od wyświetlenia - ich przyrostu nie ma gdzie zapisać
+        cache.delete_many([PENDING_KEY.format(pk=pk) for pk in removed])
+        cache.decr(PENDING_TOTAL_KEY, sum(removed.values()))
+    pending = get_pending(existing)
+
+    # Najpierw zdejmujemy przyrost z cache - nowe wyświetlenia w trakcie flush nie giną
+    for pk, delta in pending.items():
+        cache.decr(PENDING_KEY.format(pk=pk), delta)
+    if pending:
+        cache.decr(PENDING_TOTAL_KEY, sum(pending.values()))
+
+    by_delta = defaultdict(list)
+    for pk, delta in pending.items():
+        by_delta[delta].append(pk)
+
+    try:
+        with transaction.atomic():
+            for delta, pks in by_delta.items():
+                queryset.model.objects.filter(pk__in=pks).update(views_count=F('views_count') + delta)
+            if on_flush is not None and pending:
+                on_flush(pending)
+    except Exception:
+        # Przywróć przyrost - wpisy dziennika zostają, więc kolejny flush go zapisze
+        for pk, delta in pending.items():
+            _incr(PENDING_KEY.format(pk=pk), delta)
+        if pending:
+            _incr(PENDING_TOTAL_KEY, sum(pending.values()))
+        raise
+
+    # Liczniki bieżące zakładane tu z bazy - odczyt z odpowiedzi w cache sprzed zapisu zaniżyłby je
+    stored = dict(queryset.model.objects.filter(pk__in=pending).values_list('pk', 'views_count'))
+    current = get_pending(stored)
+    for pk, views_count in stored.items():
+        cache.add(TOTAL_KEY.format(pk=pk), views_count + current.get(pk, 0), None)
+
+    # Dziennik do numeru `last` zapisany; przy błędzie wyżej zostaje na następny zapis
+    cache.set(FLUSHED_SEQUENCE_KEY, last, None)
+    cache.delete_many([
+        key.format(number=number) for number in range(start + 1, last + 1) for key in (DIRTY_LOG_KEY, DIRTY_GAP_KEY)
+    ])
+    return pending
+
+
+class PendingViewsMixin:
+    """Mixin dla ViewSetów - wstawia bieżące liczby wyświetleń do odpowiedzi GET"""
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method == 'GET' and response.status_code == 200 and getattr(response, 'data', None):
+            merge_pending(response.data)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,67 +1,108 @@
+from datetime import datetime, time, timedelta
+
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Count
 from django.utils import timezone
-from rest_framework import viewsets, status, filters
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from rest_framework import viewsets, mixins, status, filters
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import (
     BlogPost, Category, Tag, Page, MediaFile,
-    UserProfile, Comment
+    UserProfile, Comment, UploadSession
 )
 from .serializers import (
-    BlogPostListSerializer, BlogPostDetailSerializer, BlogPostWriteSerializer,
-    CategorySerializer, TagSerializer, PageSerializer,
+    BlogPostListSerializer, BlogPostDetailSerializer, PublicBlogPostDetailSerializer, BlogPostWriteSerializer,
+    BlogPostSearchSerializer, BlogPostBulkSerializer,
+    CategorySerializer, TagSerializer, PageSerializer, PublicPageSerializer,
     MediaFileSerializer, UserProfileSerializer,
     CommentSerializer, CommentWriteSerializer,
-    DashboardStatsSerializer
+    DashboardStatsSerializer, UploadSessionSerializer, UPLOAD_TARGET_SERIALIZERS
 )
-from .permissions import IsAuthorOrAdmin, IsOwnerOrAdmin
+from .permissions import IsAuthorOrAdmin, IsOwnerOrAdmin, IsAdminOrEditor, EDITOR_ROLES, has_role
+from .filters import BlogPostFilter, FullTextSearchFilter
+from .pagination import KeysetPagination
+from .comments import build_tree
+from .cache import CachedResponseMixin, get_last_modified, get_stats as get_cache_stats, get_version_token
+from .conditional import ConditionalGetMixin
+from . import view_counter, dashboard, analytics, uploads, categories, syndication, bulk
+from .view_counter import PendingViewsMixin
+from core import storage as content_storage
 
 
 # ==================== PUBLIC VIEWS ====================
 
-class PublicBlogPostViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicBlogPostViewSet(PendingViewsMixin, ConditionalGetMixin, CachedResponseMixin,
+                            viewsets.ReadOnlyModelViewSet):
     """
-    Publiczny ViewSet dla postów bloga (tylko odczyt)
+    Publiczny ViewSet dla postów bloga (tylko odczyt, odpowiedzi cache'owane)
     """
     serializer_class = BlogPostListSerializer
     permission_classes = [AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['category', 'tags', 'is_featured']
+    # FullTextSearchFilter po OrderingFilter - sortowanie wg trafności nadpisuje domyślne
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
+    filterset_class = BlogPostFilter
     search_fields = ['title', 'excerpt', 'content']
     ordering_fields = ['published_at', 'views_count', 'created_at']
     ordering = ['-published_at']
+    pagination_class = KeysetPagination
+    keyset_ordering = '-published_at'
+    # ETag i Last-Modified z wersji cache - ta sama wersja wyznacza klucz zapisanej odpowiedzi,
+    # więc 304 listy nie wymaga zapytania do bazy; wersja zmienia się także przy edycji kategorii i tagów
+    etag_from_version = True
 
     def get_queryset(self):
         """Zwraca tylko opublikowane posty"""
-        return BlogPost.objects.filter(
+        queryset = BlogPost.objects.filter(
             status='published',
             published_at__lte=timezone.now()
         ).select_related('author', 'category').prefetch_related('tags')
+        if self.action == 'retrieve':
+            # Powiązane posty w tym samym zapytaniu (cms/related.py)
+            queryset = queryset.select_related('related_posts')
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
-            return BlogPostDetailSerializer
+            return PublicBlogPostDetailSerializer
+        if self.request.query_params.get(FullTextSearchFilter.search_param):
+            return BlogPostSearchSerializer
         return BlogPostListSerializer
 
-    def retrieve(self, request, *args, **kwargs):
-        """Zwiększa licznik wyświetleń przy pobieraniu posta"""
-        instance = self.get_object()
-        instance.views_count += 1
-        instance.save(update_fields=['views_count'])
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+    def get_etag_extra(self, request, pk=None):
+        return get_version_token(pk)
 
+    def get_version_last_modified(self, request, pk=None):
+        return get_last_modified(pk)
 
-class PublicPageViewSet(viewsets.ReadOnlyModelViewSet):
+    def retrieve(self, request, *args, **kwargs):
+        """Zwiększa licznik wyświetleń przy pobieraniu posta"""
+        response = super().retrieve(request, *args, **kwargs)
+        # Zapis do bazy robi okresowo zadanie flush_view_counts
+        if getattr(request, 'is_cache_warm_up', False):
+            return response
+        if response.status_code == 200:
+            view_counter.increment(response.data['id'])
+        elif response.status_code == 304:
+            # Identyfikator posta potwierdzony przez walidatory (cms/conditional.py)
+            view_counter.increment(self.conditional_state['pk'])
+        return response
+
+
+class PublicPageViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     Publiczny ViewSet dla stron statycznych
     """
-    serializer_class = PageSerializer
+    serializer_class = PublicPageSerializer
     permission_classes = [AllowAny]
     lookup_field = 'slug'
 
@@ -70,21 +111,28 @@ class PublicPageViewSet(viewsets.ReadOnlyModelViewSet):
         return Page.objects.filter(is_published=True)
 
 
-class PublicCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicCategoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     Publiczny ViewSet dla kategorii
     """
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
+    conditional_extra_fields = ('published_posts_count',)
     queryset = Category.objects.filter(is_active=True)
 
+    @action(detail=False)
+    def tree(self, request):
+        """Całe drzewo aktywnych kategorii (z cache) - jedno zapytanie przy pierwszym odczycie"""
+        return Response(categories.get_tree())
 
-class PublicTagViewSet(viewsets.ReadOnlyModelViewSet):
+
+class PublicTagViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     Publiczny ViewSet dla tagów
     """
     serializer_class = TagSerializer
     permission_classes = [AllowAny]
+    conditional_extra_fields = ('published_posts_count',)
     queryset = Tag.objects.all()
 
 
@@ -98,16 +146,52 @@ class PublicCommentViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Zwraca tylko zatwierdzone komentarze"""
-        return Comment.objects.filter(
-            is_approved=True,
-            parent=None  # Tylko główne komentarze, odpowiedzi są zagnieżdżone
-        ).select_related('author', 'post').order_by('-created_at')
+        queryset = Comment.objects.filter(is_approved=True).select_related('author').order_by('-created_at')
+        if self.action == 'replies':
+            return queryset
+        return queryset.filter(parent=None)  # Tylko główne komentarze, odpowiedzi są zagnieżdżone
 
     def get_serializer_class(self):
         if self.action in ['create']:
             return CommentWriteSerializer
         return CommentSerializer
 
+    def get_max_depth(self):
+        """Parametr ?depth= - liczba poziomów odpowiedzi pod komentarzem głównym"""
+        depth = self.request.query_params.get('depth')
+        try:
+            return max(int(depth), 0) if depth is not None else None
+        except ValueError:
+            raise ValidationError({'depth': 'Wymagana liczba całkowita'})
+
+    def get_tree_response(self, roots, paginated):
+        context = self.get_serializer_context()
+        context['comment_tree'] = build_tree(roots, self.get_max_depth())
+        serializer = self.get_serializer(roots, many=True, context=context)
+        if paginated:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def list(self, request, *args, **kwargs):
+        """Stronicowane wątki - odpowiedzi ładowane jednym zapytaniem dla całej strony"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        return self.get_tree_response(page if page is not None else list(queryset), page is not None)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        context = self.get_serializer_context()
+        context['comment_tree'] = build_tree([instance], self.get_max_depth())
+        return Response(self.get_serializer(instance, context=context).data)
+
+    @action(detail=True, methods=['get'])
+    def replies(self, request, pk=None):
+        """Stronicowane bezpośrednie odpowiedzi na komentarz wraz z ich poddrzewami"""
+        parent = self.get_object()
+        queryset = Comment.objects.filter(parent=parent, is_approved=True).select_related('author')
+        page = self.paginate_queryset(queryset)
+        return self.get_tree_response(page if page is not None else list(queryset), page is not None)
+
     def perform_create(self, serializer):
         """Automatycznie zatwierdza komentarze od zalogowanych użytkowników"""
         is_approved = self.request.user.is_authenticated
@@ -116,7 +200,7 @@ class PublicCommentViewSet(viewsets.ModelViewSet):
 
 # ==================== ADMIN/PRIVATE VIEWS ====================
 
-class AdminBlogPostViewSet(viewsets.ModelViewSet):
+class AdminBlogPostViewSet(PendingViewsMixin, viewsets.ModelViewSet):
     """
     Admin ViewSet dla zarządzania postami bloga
     """
@@ -126,11 +210,13 @@ class AdminBlogPostViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'content']
     ordering_fields = ['created_at', 'published_at', 'views_count']
     ordering = ['-created_at']
+    pagination_class = KeysetPagination
+    keyset_ordering = '-created_at'
 
     def get_queryset(self):
         """Zwraca wszystkie posty dla adminów, własne dla autorów"""
         user = self.request.user
-        if user.is_superuser or (hasattr(user, 'profile') and user.profile.role in ['admin', 'editor']):
+        if has_role(self.request, EDITOR_ROLES):
             return BlogPost.objects.all().select_related('author', 'category').prefetch_related('tags')
         return BlogPost.objects.filter(author=user).select_related('category').prefetch_related('tags')
 
@@ -149,6 +235,8 @@ class AdminBlogPostViewSet(viewsets.ModelViewSet):
         if not post.published_at:
             post.published_at = timezone.now()
         post.save()
+        if post.status == 'scheduled':
+            return Response({'status': 'Publikacja posta zaplanowana', 'published_at': post.published_at})
         return Response({'status': 'Post opublikowany'})
 
     @action(detail=True, methods=['post'])
@@ -159,6 +247,21 @@ class AdminBlogPostViewSet(viewsets.ModelViewSet):
         post.save()
         return Response({'status': 'Publikacja cofnięta'})
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Operacja masowa: publish, unpublish, archive, set_category, add_tags, remove_tags.
+        Body: {"action": ..., "ids": [...], "category": id, "tags": [...]}
+        """
+        serializer = BlogPostBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        updated, results = bulk.apply(
+            BlogPost.objects.filter(pk__in=self.get_queryset().values('pk')), request.user,
+            data['action'], data['ids'], category=data.get('category'), tags=data.get('tags', []),
+        )
+        return Response({'action': data['action'], 'updated': updated, 'results': results})
+
 
 class AdminPageViewSet(viewsets.ModelViewSet):
     """
@@ -172,9 +275,7 @@ class AdminPageViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         """Tylko admini i edytorzy mogą zarządzać stronami"""
         if self.request.method not in ['GET']:
-            user = self.request.user
-            if not (user.is_superuser or
-                   (hasattr(user, 'profile') and user.profile.role in ['admin', 'editor'])):
+            if not has_role(self.request, EDITOR_ROLES):
                 return [IsAuthenticated(), IsOwnerOrAdmin()]
         return super().get_permissions()
 
@@ -190,9 +291,7 @@ class AdminCategoryViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         """Tylko admini mogą zarządzać kategoriami"""
         if self.request.method not in ['GET']:
-            user = self.request.user
-            if not (user.is_superuser or
-                   (hasattr(user, 'profile') and user.profile.role == 'admin')):
+            if not has_role(self.request, ['admin']):
                 return [IsAuthenticated(), IsOwnerOrAdmin()]
         return super().get_permissions()
 
@@ -219,10 +318,9 @@ class MediaFileViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Zwraca pliki użytkownika lub wszystkie dla adminów"""
-        user = self.request.user
-        if user.is_superuser or (hasattr(user, 'profile') and user.profile.role in ['admin', 'editor']):
+        if has_role(self.request, EDITOR_ROLES):
             return MediaFile.objects.all()
-        return MediaFile.objects.filter(uploaded_by=user)
+        return MediaFile.objects.filter(uploaded_by=self.request.user)
 
     def perform_create(self, serializer):
         """Przypisuje przesyłającego użytkownika"""
@@ -260,30 +358,84 @@ class AdminCommentViewSet(viewsets.ModelViewSet):
         return Response({'status': 'Komentarz odrzucony'})
 
 
+class UploadSessionViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """
+    Przesyłanie dużych plików kawałkami z wznawianiem (protokół w cms/uploads.py)
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Użytkownik widzi tylko własne sesje"""
+        return UploadSession.objects.filter(uploaded_by=self.request.user)
+
+    def perform_create(self, serializer):
+        # Dokumenty klientów mogą przesyłać tylko admini i edytorzy
+        if serializer.validated_data['target'] == 'document' \
+                and not IsAdminOrEditor().has_permission(self.request, self):
+            self.permission_denied(self.request)
+        serializer.instance = uploads.start(uploaded_by=self.request.user, **serializer.validated_data)
+
+    def perform_destroy(self, instance):
+        uploads.abort(instance)
+
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        """Dopisuje kawałek pliku (nagłówki Upload-Offset i Upload-Checksum)"""
+        session = self.get_object()
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.headers.get('Content-Length') or 0)
+        except ValueError:
+            raise ValidationError({'detail': 'Wymagany nagłówek Upload-Offset'})
+
+        session = uploads.write_chunk(
+            session, offset, request.stream, length, request.headers.get('Upload-Checksum')
+        )
+        return Response({'offset': session.offset, 'total_size': session.total_size},
+                        headers={'Upload-Offset': str(session.offset)})
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """Tworzy MediaFile lub Document z kompletnie przesłanego pliku"""
+        session = self.get_object()
+        serializer = UPLOAD_TARGET_SERIALIZERS[session.target](
+            data=session.metadata, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        uploads.finalize(session, serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 # ==================== DASHBOARD VIEWS ====================
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats_view(request):
     """
-    Zwraca statystyki dla dashboardu
+    Zwraca statystyki dla dashboardu (z migawki, z datą odświeżenia)
     """
-    from django.contrib.auth.models import User
-    from django.db.models import Sum
+    serializer = DashboardStatsSerializer(dashboard.get_stats())
+    return Response(serializer.data)
 
-    stats = {
-        'total_posts': BlogPost.objects.count(),
-        'published_posts': BlogPost.objects.filter(status='published').count(),
-        'draft_posts': BlogPost.objects.filter(status='draft').count(),
-        'total_comments': Comment.objects.count(),
-        'pending_comments': Comment.objects.filter(is_approved=False).count(),
-        'total_users': User.objects.count(),
-        'total_media': MediaFile.objects.count(),
-        'total_views': BlogPost.objects.aggregate(Sum('views_count'))['views_count__sum'] or 0
-    }
 
-    serializer = DashboardStatsSerializer(stats)
-    return Response(serializer.data)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminOrEditor])
+def cache_stats_view(request):
+    """
+    Zwraca liczniki trafień cache publicznego API bloga
+    """
+    return Response(get_cache_stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminOrEditor])
+def storage_stats_view(request):
+    """
+    Zwraca zajętość magazynu plików i miejsce zaoszczędzone przez deduplikację
+    """
+    return Response(content_storage.report())
 
 
 @api_view(['GET'])
@@ -294,7 +446,7 @@ def recent_posts_view(request):
     """
     posts = BlogPost.objects.all().order_by('-created_at')[:5]
     serializer = BlogPostListSerializer(posts, many=True, context={'request': request})
-    return Response(serializer.data)
+    return Response(view_counter.merge_pending(serializer.data))
 
 
 @api_view(['GET'])
@@ -306,3 +458,104 @@ def recent_comments_view(request):
     comments = Comment.objects.filter(is_approved=False).order_by('-created_at')[:10]
     serializer = CommentSerializer(comments, many=True, context={'request': request})
     return Response(serializer.data)
+
+
+# ==================== ANALYTICS VIEWS ====================
+
+def _parse_window(request, default_days=7):
+    """Okno czasu z parametrów ?start= i ?end= (data lub data z godziną)"""
+    def parse(name, default):
+        value = request.query_params.get(name)
+        if not value:
+            return default
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValidationError({name: 'Nieprawidłowa data'})
+            moment = datetime.combine(day, time.min)
+        return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
+
+    end = parse('end', timezone.now())
+    start = parse('start', end - timedelta(days=default_days))
+    if start >= end:
+        raise ValidationError({'start': 'Początek okna musi być przed końcem'})
+    return start, end
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminOrEditor])
+def top_posts_view(request):
+    """
+    Najczęściej wyświetlane posty w oknie czasu (?start=, ?end=, ?limit=)
+    """
+    start, end = _parse_window(request)
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+    except ValueError:
+        raise ValidationError({'limit': 'Wymagana liczba całkowita'})
+
+    return Response({
+        'start': start,
+        'end': end,
+        'results': [
+            {'id': row['post_id'], 'title': row['post__title'], 'slug': row['post__slug'],
+             'views': row['total_views']}
+            for row in analytics.top_posts(start, end, limit)
+        ],
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminOrEditor])
+def post_views_series_view(request, pk):
+    """
+    Wyświetlenia posta w czasie (?granularity=hour|day|month, ?start=, ?end=)
+    """
+    post = get_object_or_404(BlogPost, pk=pk)
+    granularity = request.query_params.get('granularity', 'day')
+    if granularity not in analytics.GRANULARITIES:
+        raise ValidationError({'granularity': f'Dozwolone wartości: {", ".join(analytics.GRANULARITIES)}'})
+
+    start, end = _parse_window(request, default_days=30)
+    return Response({
+        'id': post.pk,
+        'title': post.title,
+        'granularity': granularity,
+        'results': analytics.post_series(post.pk, granularity, start, end),
+    })
+
+
+# ==================== MAPA WITRYNY I KANAŁY ====================
+
+def _syndication_response(request, name):
+    """Odpowiedź z gotowego dokumentu - z Last-Modified/ETag, 304 bez generowania treści"""
+    document = syndication.get_document(name)
+    if document is None:
+        raise Http404
+    etag = quote_etag(document['etag'])
+    response = get_conditional_response(request, etag=etag, last_modified=int(document['last_modified']))
+    if response is None:
+        response = HttpResponse(document['content'], content_type=document['content_type'])
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(document['last_modified'])
+    return response
+
+
+@require_safe
+def sitemap_index_view(request):
+    return _syndication_response(request, syndication.INDEX)
+
+
+@require_safe
+def sitemap_view(request, name):
+    if name == syndication.INDEX:
+        raise Http404
+    return _syndication_response(request, name)
+
+
+@require_safe
+def feed_view(request, source, fmt):
+    if source not in syndication.SOURCES or fmt not in syndication.FEED_FORMATS:
+        raise Http404
+    return _syndication_response(request, f'{source}.{fmt}')
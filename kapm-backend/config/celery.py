@@ -0,0 +1,16 @@
+"""
+Konfiguracja Celery dla projektu config.
+
+Ustawienia są czytane z config/settings.py (prefiks CELERY_),
+zadania wykrywane automatycznie w modułach tasks.py aplikacji.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     # Third party apps
     "rest_framework",
@@ -168,9 +169,31 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 
+# Produkcyjnie collectstatic nadaje plikom nazwy z hashem treści i tworzy warianty .br/.gz;
+# whitenoise wysyła je z nagłówkiem Cache-Control: immutable (kompletność manifestu: core/checks.py)
+STATIC_COMPRESSED_MANIFEST = config('STATIC_COMPRESSED_MANIFEST', default=not DEBUG, cast=bool)
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "whitenoise.storage.CompressedManifestStaticFilesStorage" if STATIC_COMPRESSED_MANIFEST
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+# Pliki bez hasha w nazwie (np. odwołania spoza {% static %}) - krótki czas cache
+WHITENOISE_MAX_AGE = config('WHITENOISE_MAX_AGE', default=0 if DEBUG else 60 * 60, cast=int)
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Wysyłka plików mediów (core/sendfile.py): simple (Django), nginx (X-Accel-Redirect), xsendfile.
+# Na produkcji domyślnie nginx - workery gunicorna nie są zajęte przesyłaniem bajtów
+MEDIA_SENDFILE_BACKEND = config('MEDIA_SENDFILE_BACKEND', default='simple' if DEBUG else 'nginx')
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -201,7 +224,7 @@ CORS_ALLOW_HEADERS = [
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -224,9 +247,11 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
+    # Czarna lista w cache z TTL do wygaśnięcia tokena (authentication/blacklist.py), bez token_blacklist
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': True,
 
+    # HS256 tylko bez kluczy w JWT_KEYS_DIR - tokeny podpisuje authentication/keys.py
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'VERIFYING_KEY': None,
@@ -238,7 +263,9 @@ SIMPLE_JWT = {
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
 
-    'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    'AUTH_TOKEN_CLASSES': ('authentication.tokens.AccessToken',),
+    # Roszczenia role/is_staff/is_superuser odświeżane przy każdym odświeżeniu (authentication/tokens.py)
+    'TOKEN_REFRESH_SERIALIZER': 'authentication.tokens.RoleTokenRefreshSerializer',
     'TOKEN_TYPE_CLAIM': 'token_type',
 
     'JTI_CLAIM': 'jti',
@@ -248,6 +275,21 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Klucze podpisujące tokeny JWT (authentication/keys.py) - RS256 lub EdDSA, rotacja: rotate_jwt_key
+# Pusty katalog oznacza podpis HS256 z SECRET_KEY (development)
+JWT_KEYS_DIR = config('JWT_KEYS_DIR', default=os.path.join(BASE_DIR, 'keys', 'jwt'))
+JWT_SIGNING_ALGORITHM = config('JWT_SIGNING_ALGORITHM', default='RS256')
+JWKS_MAX_AGE = config('JWKS_MAX_AGE', default=300, cast=int)
+
+# Cache użytkownika z profilem dla uwierzytelniania JWT (authentication/user_cache.py), w sekundach
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=300, cast=int)
+
+# Czarna lista tokenów w cache (authentication/blacklist.py) - unieważnienia tokenów dostępu
+# docierają do pozostałych procesów najpóźniej po TOKEN_REVOCATION_SYNC_INTERVAL sekundach
+TOKEN_REVOCATION_SYNC_INTERVAL = config('TOKEN_REVOCATION_SYNC_INTERVAL', default=1, cast=float)
+TOKEN_REVOCATION_BLOOM_CAPACITY = config('TOKEN_REVOCATION_BLOOM_CAPACITY', default=10000, cast=int)
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = config('TOKEN_REVOCATION_BLOOM_ERROR_RATE', default=0.001, cast=float)
+
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
@@ -260,3 +302,103 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Bez Redisa (development na SQLite) zadania wykonywane są od razu w procesie
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=config('USE_SQLITE', default=False, cast=bool),
+                                  cast=bool)
+
+# Zadania okresowe (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    'flush-view-counts': {
+        'task': 'cms.tasks.flush_view_counts',
+        'schedule': config('VIEW_COUNT_FLUSH_INTERVAL', default=60, cast=int),
+    },
+    'refresh-dashboard-snapshot': {
+        'task': 'cms.tasks.refresh_dashboard_snapshot',
+        'schedule': 300,
+    },
+    'compact-view-stats': {
+        'task': 'cms.tasks.compact_view_stats',
+        'schedule': 24 * 60 * 60,
+    },
+    'cleanup-upload-sessions': {
+        'task': 'cms.tasks.cleanup_upload_sessions',
+        'schedule': 60 * 60,
+    },
+    'publish-scheduled-posts': {
+        'task': 'cms.tasks.publish_scheduled_posts',
+        'schedule': 60,
+    },
+    'rebuild-related-posts': {
+        'task': 'cms.tasks.rebuild_related_posts',
+        'schedule': 24 * 60 * 60,
+    },
+    'compact-token-blacklist': {
+        'task': 'authentication.tasks.compact_token_blacklist',
+        'schedule': 60 * 60,
+    },
+    'collect-storage-garbage': {
+        'task': 'core.tasks.collect_storage_garbage',
+        'schedule': 24 * 60 * 60,
+    },
+}
+
+# Przesyłanie plików kawałkami (cms/uploads.py)
+UPLOAD_MAX_SIZE = config('UPLOAD_MAX_SIZE', default=500 * 1024 * 1024, cast=int)
+UPLOAD_CHUNK_MAX_SIZE = config('UPLOAD_CHUNK_MAX_SIZE', default=8 * 1024 * 1024, cast=int)
+UPLOAD_SESSION_TTL_HOURS = config('UPLOAD_SESSION_TTL_HOURS', default=24, cast=int)
+# Plik magazynu bez wiersza Blob starszy niż tyle godzin jest usuwany (core/storage.py)
+STORAGE_ORPHAN_GRACE_HOURS = config('STORAGE_ORPHAN_GRACE_HOURS', default=1, cast=int)
+
+# Mapa witryny i kanały (cms/syndication.py) - linki prowadzą do frontendu
+SITE_URL = config('SITE_URL', default='http://localhost:3003')
+# Publiczny adres backendu - dla absolutnych URL-i w odpowiedziach generowanych w tle (cms/scheduling.py)
+API_URL = config('API_URL', default='http://localhost:8003')
+SYNDICATION_PATHS = {
+    'blog': '/pl/blogi/{slug}',
+    'news': '/pl/aktualnosci/{slug}',
+    'page': '/pl/{slug}',
+    'blog_index': '/pl/blogi',
+    'news_index': '/pl/aktualnosci',
+}
+SYNDICATION_FEED_TITLES = {
+    'blog': 'KAPM - Blog',
+    'news': 'KAPM - Aktualności',
+}
+SYNDICATION_FEED_ITEMS = config('SYNDICATION_FEED_ITEMS', default=20, cast=int)
+# Czas życia wygenerowanych dokumentów w cache (s) - po wygaśnięciu generowane przy odczycie
+SYNDICATION_CACHE_TIMEOUT = config('SYNDICATION_CACHE_TIMEOUT', default=24 * 60 * 60, cast=int)
+
+# Powiązane posty (cms/related.py) - długość listy i opóźnienie przebudowy po zmianach (s)
+RELATED_POSTS_COUNT = config('RELATED_POSTS_COUNT', default=5, cast=int)
+RELATED_POSTS_DEBOUNCE = config('RELATED_POSTS_DEBOUNCE', default=60, cast=int)
+
+# Szerokości (px) responsywnych wariantów przesłanych obrazów
+IMAGE_VARIANT_WIDTHS = [320, 640, 1024, 1600]
+
+# Okres przechowywania statystyk wyświetleń (dni) - miesięczne są trzymane zawsze
+ANALYTICS_HOURLY_RETENTION_DAYS = config('ANALYTICS_HOURLY_RETENTION_DAYS', default=14, cast=int)
+ANALYTICS_DAILY_RETENTION_DAYS = config('ANALYTICS_DAILY_RETENTION_DAYS', default=400, cast=int)
+
+# Cache - Redis (ta sama instancja co Celery), LocMem dla developmentu bez Dockera
+if config('USE_SQLITE', default=False, cast=bool):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": config('REDIS_URL', default='redis://localhost:6379/0'),
+            "KEY_PREFIX": "kapm",
+        }
+    }
+
+# Konfiguracja wyszukiwania pełnotekstowego (PostgreSQL text search config)
+# 'polish' wymaga zainstalowanego w PostgreSQL słownika hunspell/ispell dla języka polskiego
+BLOG_SEARCH_CONFIG = config('BLOG_SEARCH_CONFIG', default='simple')
+
+# Cache odpowiedzi publicznego API bloga (w sekundach)
+# Klucze są wersjonowane i unieważniane sygnałami, więc TTL może być długi
+CMS_CACHE_TIMEOUT = config('CMS_CACHE_TIMEOUT', default=3600, cast=int)
@@ -19,7 +19,9 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from core.views import home_view, api_root
+from core.views import home_view, api_root, MediaView
+from cms.views import sitemap_index_view, sitemap_view, feed_view
+from authentication.views import jwks_view
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 urlpatterns = [
@@ -28,6 +30,7 @@ urlpatterns = [
 
     # Authentication endpoints
     path('api/auth/', include('authentication.urls')),
+    path('.well-known/jwks.json', jwks_view, name='jwks'),
 
     # CMS endpoints - nowa struktura
     path('api/', include('cms.urls')),
@@ -45,4 +48,12 @@ urlpatterns = [
     # API documentation (opcjonalne)
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT) + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+
+    # Mapa witryny i kanały RSS/Atom/JSON (cms/syndication.py)
+    path('sitemap.xml', sitemap_index_view, name='sitemap'),
+    path('sitemaps/<slug:name>.xml', sitemap_view, name='sitemap-shard'),
+    path('feeds/<slug:source>.<slug:fmt>', feed_view, name='feed'),
+
+    # Pliki mediów - uprawnienia w Django, wysyłka przez proxy (core/sendfile.py)
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", MediaView.as_view(), name='media'),
+] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from . import checks, images, storage  # noqa: F401 - checks rejestruje sprawdzenia
+        from .models import Document, NewsItem, TeamMember
+
+        images.register(TeamMember, 'photo')
+        images.register(NewsItem, 'image')
+        storage.track(Document)
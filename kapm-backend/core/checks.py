@@ -0,0 +1,61 @@
+"""
+Sprawdzenie przy starcie (manage.py migrate/check/runserver), czy collectstatic
+wygenerował kompletny manifest plików statycznych z nazwami zawierającymi hash.
+Brak wpisu w manifeście kończy się w produkcji błędem 500 przy {% static %}.
+"""
+import json
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.checks import Error, register
+
+MAX_LISTED_FILES = 5
+
+
+def _listing(names):
+    names = sorted(names)
+    listed = ', '.join(names[:MAX_LISTED_FILES])
+    return listed + (f' (+{len(names) - MAX_LISTED_FILES})' if len(names) > MAX_LISTED_FILES else '')
+
+
+# Bez tagu staticfiles - collectstatic uruchamia sprawdzenia z tym tagiem, zanim utworzy manifest
+@register()
+def check_static_manifest(app_configs, **kwargs):
+    storage = staticfiles_storage
+    if not isinstance(storage, ManifestFilesMixin):
+        return []
+
+    content = storage.read_manifest()
+    if content is None:
+        return [Error(
+            f'Brak manifestu plików statycznych ({storage.manifest_name}) w {settings.STATIC_ROOT}',
+            hint='Uruchom: python manage.py collectstatic --noinput',
+            id='core.E001',
+        )]
+    manifest = json.loads(content).get('paths', {})
+
+    ignore_patterns = apps.get_app_config('staticfiles').ignore_patterns
+    sources = {
+        path.replace(os.sep, '/')
+        for finder in finders.get_finders()
+        for path, _ in finder.list(ignore_patterns)
+    }
+    errors = []
+    missing_entries = sources - manifest.keys()
+    if missing_entries:
+        errors.append(Error(
+            f'Pliki statyczne bez wpisu w manifeście: {_listing(missing_entries)}',
+            hint='Manifest jest nieaktualny - uruchom ponownie collectstatic',
+            id='core.E002',
+        ))
+    missing_files = [hashed for hashed in manifest.values() if not storage.exists(hashed)]
+    if missing_files:
+        errors.append(Error(
+            f'Brak plików z manifestu w {settings.STATIC_ROOT}: {_listing(missing_files)}',
+            hint='Uruchom ponownie collectstatic',
+            id='core.E003',
+        ))
+    return errors
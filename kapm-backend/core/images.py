@@ -0,0 +1,142 @@
+"""
+Responsywne warianty przesłanych obrazów.
+
+Po zapisie modelu z zarejestrowanym polem obrazu zadanie Celery generuje
+przeskalowane wersje WebP i JPEG o stałych szerokościach (IMAGE_VARIANT_WIDTHS)
+i zapisuje je obok oryginału, np. blog/2025/09/foto.jpg -> blog/2025/09/foto_w640.webp.
+Ścieżki trafiają do pola JSON <pole>_variants:
+    {'source': 'blog/2025/09/foto.jpg', 'webp': {'640': '...'}, 'jpeg': {'640': '...'}}
+Plik, który nie jest obrazem, dostaje samo {'source': ...} - nie jest przetwarzany ponownie.
+
+Zapis idzie przez update() z pominięciem sygnałów modelu, dlatego po nim wysyłany jest
+sygnał variants_updated - odbiorcy unieważniają cache odpowiedzi z wariantami.
+"""
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import Signal
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+VARIANT_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+# Wysyłany po zapisaniu wariantów: sender=model, instance, field_name
+variants_updated = Signal()
+
+
+def variants_field_name(field_name):
+    return f'{field_name}_variants'
+
+
+def generate_variants(field_file):
+    """Tworzy warianty obrazu i zwraca słownik ścieżek (dla plików, które nie są obrazami - tylko 'source')"""
+    storage = field_file.storage
+    try:
+        with storage.open(field_file.name, 'rb') as source:
+            image = Image.open(source)
+            image.load()
+    except (UnidentifiedImageError, OSError):
+        return {'source': field_file.name}
+
+    image = ImageOps.exif_transpose(image)
+    original_width, original_height = image.size
+    widths = [width for width in settings.IMAGE_VARIANT_WIDTHS if width < original_width]
+    if original_width <= max(settings.IMAGE_VARIANT_WIDTHS):
+        widths.append(original_width)
+
+    stem, _ = os.path.splitext(field_file.name)
+    variants = {'source': field_file.name}
+    for width in widths:
+        height = max(round(original_height * width / original_width), 1)
+        resized = image.resize((width, height), Image.LANCZOS) if width != original_width else image
+
+        for extension, options in VARIANT_FORMATS.items():
+            options = dict(options)
+            target = resized
+            if options['format'] == 'JPEG' and target.mode not in ('RGB', 'L'):
+                # JPEG nie obsługuje przezroczystości - nakładamy na białe tło
+                background = Image.new('RGB', target.size, (255, 255, 255))
+                rgba = target.convert('RGBA')
+                background.paste(rgba, mask=rgba.getchannel('A'))
+                target = background
+            elif target.mode not in ('RGB', 'RGBA', 'L'):
+                target = target.convert('RGBA')
+
+            buffer = BytesIO()
+            target.save(buffer, **options)
+            name = storage.save(f'{stem}_w{width}.{extension}', ContentFile(buffer.getvalue()))
+            variants.setdefault(extension, {})[str(width)] = name
+
+    return variants
+
+
+def delete_variants(storage, variants):
+    for extension in VARIANT_FORMATS:
+        for name in (variants or {}).get(extension, {}).values():
+            storage.delete(name)
+
+
+def update_variants(instance, field_name):
+    """Generuje warianty dla pola instancji i zapisuje je bez sygnałów modelu (wysyła variants_updated)"""
+    model = type(instance)
+    field_file = getattr(instance, field_name)
+    variants_field = variants_field_name(field_name)
+    old_variants = getattr(instance, variants_field) or {}
+
+    variants = generate_variants(field_file) if field_file else {}
+    fields = {variants_field: variants}
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        # Zmiana odpowiedzi API - nowe Last-Modified/ETag dla klientów
+        fields['updated_at'] = timezone.now()
+    model.objects.filter(pk=instance.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(instance, name, value)
+    variants_updated.send(sender=model, instance=instance, field_name=field_name)
+
+    if old_variants:
+        delete_variants(field_file.storage, old_variants)
+    return variants
+
+
+def needs_update(instance, field_name):
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, variants_field_name(field_name)) or {}
+    return (field_file.name or None) != variants.get('source')
+
+
+def register(model, field_name, condition=None):
+    """
+    Rejestruje pole obrazu modelu - po zapisie ze zmienionym plikiem
+    warianty są generowane w tle (po zatwierdzeniu transakcji).
+    condition(instance) pozwala pominąć pliki, które nie są obrazami.
+    """
+    def schedule_variants(sender, instance, raw=False, **kwargs):
+        if raw or not needs_update(instance, field_name):
+            return
+        if condition is not None and not condition(instance):
+            return
+
+        from .tasks import generate_image_variants
+
+        meta = instance._meta
+        transaction.on_commit(lambda: generate_image_variants.delay(
+            meta.app_label, meta.model_name, instance.pk, field_name
+        ))
+
+    post_save.connect(
+        schedule_variants, sender=model, weak=False,
+        dispatch_uid=f'image_variants_{model._meta.label_lower}_{field_name}',
+    )
+
+
+def get_instance(app_label, model_name, pk):
+    model = apps.get_model(app_label, model_name)
+    return model.objects.filter(pk=pk).first()
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from core import storage
+
+
+class Command(BaseCommand):
+    help = 'Pokazuje zajętość magazynu plików i miejsce zaoszczędzone przez deduplikację'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collect-garbage', action='store_true',
+                            help='Usuń najpierw pliki bez wpisu w magazynie (np. po wycofanej transakcji)')
+
+    def handle(self, *args, **options):
+        if options['collect_garbage']:
+            removed, removed_bytes = storage.collect_garbage()
+            self.stdout.write(f"Usunięte osierocone pliki: {removed} ({filesizeformat(removed_bytes)})")
+        totals = storage.report()
+        self.stdout.write(f"Pliki w magazynie: {totals['blobs']} (odwołania: {totals['references']})")
+        self.stdout.write(f"Zapisane na dysku: {filesizeformat(totals['stored_bytes'])}")
+        self.stdout.write(f"Łącznie w odwołaniach: {filesizeformat(totals['logical_bytes'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Zaoszczędzone miejsce: {filesizeformat(totals['saved_bytes'])}"
+        ))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsitem",
+            name="image_variants",
+            field=models.JSONField(
+                blank=True, default=dict, editable=False, verbose_name="Warianty obrazu"
+            ),
+        ),
+        migrations.AddField(
+            model_name="teammember",
+            name="photo_variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Warianty zdjęcia",
+            ),
+        ),
+    ]
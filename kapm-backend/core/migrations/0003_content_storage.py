@@ -0,0 +1,70 @@
+# Generated by Django 5.2.6 on 2026-10-18 08:58
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_image_variants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Blob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "sha256",
+                    models.CharField(
+                        max_length=64, unique=True, verbose_name="SHA-256"
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="Ścieżka"
+                    ),
+                ),
+                (
+                    "size",
+                    models.PositiveBigIntegerField(verbose_name="Rozmiar (bytes)"),
+                ),
+                (
+                    "ref_count",
+                    models.PositiveIntegerField(
+                        default=1, verbose_name="Liczba odwołań"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Data utworzenia"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Plik w magazynie",
+                "verbose_name_plural": "Pliki w magazynie",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="file",
+            field=models.FileField(
+                storage=core.storage.ContentAddressedStorage(),
+                upload_to="documents/%Y/%m/",
+                verbose_name="Plik",
+            ),
+        ),
+    ]
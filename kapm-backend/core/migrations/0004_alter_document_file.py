@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:10
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_content_storage"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="document",
+            name="file",
+            field=models.FileField(
+                db_index=True,
+                storage=core.storage.ContentAddressedStorage(),
+                upload_to="documents/%Y/%m/",
+                verbose_name="Plik",
+            ),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from .storage import content_addressed_storage
+
 
 class BaseModel(models.Model):
     """Model bazowy z polami czasowymi"""
@@ -57,7 +59,10 @@ class Document(BaseModel):
 
     title = models.CharField(max_length=200, verbose_name="Tytuł")
     document_type = models.CharField(max_length=50, choices=DOCUMENT_TYPE_CHOICES, verbose_name="Typ dokumentu")
-    file = models.FileField(upload_to='documents/%Y/%m/', verbose_name="Plik")
+    file = models.FileField(upload_to='documents/%Y/%m/', storage=content_addressed_storage,
+                            db_index=True, verbose_name="Plik")
+    file_original_name = models.CharField(max_length=255, blank=True, editable=False,
+                                          verbose_name="Oryginalna nazwa pliku")
     description = models.TextField(blank=True, verbose_name="Opis")
     client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='documents', verbose_name="Klient")
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name="Przesłane przez")
@@ -78,6 +83,8 @@ class NewsItem(BaseModel):
     excerpt = models.TextField(max_length=500, verbose_name="Zajawka")
     content = models.TextField(verbose_name="Treść")
     image = models.ImageField(upload_to='news/%Y/%m/', blank=True, verbose_name="Obraz")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False,
+                                      verbose_name="Warianty obrazu")
     is_published = models.BooleanField(default=False, verbose_name="Opublikowany")
     published_at = models.DateTimeField(null=True, blank=True, verbose_name="Data publikacji")
     author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name="Autor")
@@ -114,6 +121,8 @@ class TeamMember(BaseModel):
     bio = models.TextField(verbose_name="Biografia")
     specializations = models.TextField(verbose_name="Specjalizacje")
     photo = models.ImageField(upload_to='team/', blank=True, verbose_name="Zdjęcie")
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False,
+                                      verbose_name="Warianty zdjęcia")
     email = models.EmailField(verbose_name="Email")
     phone = models.CharField(max_length=20, blank=True, verbose_name="Telefon")
     linkedin = models.URLField(blank=True, verbose_name="LinkedIn")
@@ -127,3 +136,20 @@ class TeamMember(BaseModel):
 
     def __str__(self):
         return f"{self.name} - {self.get_position_display()}"
+
+
+class Blob(models.Model):
+    """Plik w magazynie adresowanym treścią (patrz core/storage.py)"""
+    sha256 = models.CharField(max_length=64, unique=True, verbose_name="SHA-256")
+    name = models.CharField(max_length=255, unique=True, verbose_name="Ścieżka")
+    size = models.PositiveBigIntegerField(verbose_name="Rozmiar (bytes)")
+    ref_count = models.PositiveIntegerField(default=1, verbose_name="Liczba odwołań")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Data utworzenia")
+
+    class Meta:
+        verbose_name = "Plik w magazynie"
+        verbose_name_plural = "Pliki w magazynie"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
@@ -0,0 +1,128 @@
+"""
+Wysyłanie plików z MEDIA_ROOT po sprawdzeniu uprawnień w Django.
+
+Backend wybiera MEDIA_SENDFILE_BACKEND:
+    'simple'    - FileResponse z obsługą nagłówka Range (development, brak proxy)
+    'nginx'     - pusta odpowiedź z X-Accel-Redirect, bajty wysyła nginx:
+                      location /protected-media/ { internal; alias /app/media/; }
+    'xsendfile' - nagłówek X-Sendfile z bezwzględną ścieżką (Apache mod_xsendfile, lighttpd)
+
+Nagłówki Content-Type, Content-Disposition i Cache-Control ustawione tutaj
+proxy przenosi do odpowiedzi z plikiem.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def sendfile(request, path, name, attachment_name=None, cache_control=None):
+    """
+    Odpowiedź z plikiem `name` (ścieżka względna w MEDIA_ROOT) leżącym pod `path`.
+    attachment_name wymusza pobranie pliku pod podaną nazwą.
+    """
+    backend = BACKENDS[settings.MEDIA_SENDFILE_BACKEND]
+    response = backend(request, path, name)
+
+    if response.status_code in (200, 206):
+        content_type, encoding = mimetypes.guess_type(name)
+        response['Content-Type'] = content_type or 'application/octet-stream'
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if attachment_name:
+            response['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(attachment_name)}"
+    if cache_control:
+        response['Cache-Control'] = cache_control
+    return response
+
+
+def nginx_backend(request, path, name):
+    response = HttpResponse()
+    response['X-Accel-Redirect'] = quote(f'{settings.MEDIA_ACCEL_REDIRECT_PREFIX}{name}')
+    return response
+
+
+def xsendfile_backend(request, path, name):
+    response = HttpResponse()
+    response['X-Sendfile'] = path
+    return response
+
+
+def simple_backend(request, path, name):
+    """Wysyłka przez Django - z Last-Modified/If-Modified-Since i pojedynczym zakresem Range"""
+    stat = os.stat(path)
+    last_modified = http_date(stat.st_mtime)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    byte_range = parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != last_modified:
+        # Plik zmienił się od pierwszej części - klient dostaje całość
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+    elif byte_range is None:
+        response = FileResponse(open(path, 'rb'))
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(iter_range(path, start, end - start + 1), status=206)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = last_modified
+    return response
+
+
+def parse_range(header, size):
+    """
+    Zwraca (start, end) dla nagłówka 'bytes=start-end', None gdy nagłówka nie ma
+    lub nie jest obsługiwany (np. wiele zakresów), False gdy zakres jest niespełnialny.
+    """
+    match = RANGE_RE.match((header or '').strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        # Zakres sufiksowy: ostatnie N bajtów
+        length = int(end)
+        if not length or not size:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def iter_range(path, start, length):
+    with open(path, 'rb') as source:
+        source.seek(start)
+        while length > 0:
+            block = source.read(min(STREAM_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+BACKENDS = {
+    'simple': simple_backend,
+    'nginx': nginx_backend,
+    'xsendfile': xsendfile_backend,
+}
@@ -0,0 +1,231 @@
+"""
+Magazyn plików adresowanych treścią (deduplikacja przesyłanych plików).
+
+Plik jest haszowany (SHA-256) podczas zapisu strumieniowego i trafia pod
+blobs/ab/cd/<hash>.<rozszerzenie>. Ponowne przesłanie tej samej treści nie zapisuje
+nic na dysku - zwiększa tylko licznik odwołań w modelu Blob. delete() zwalnia
+odwołanie, a plik znika dopiero po zwolnieniu ostatniego.
+
+Pliki zapisane przed wprowadzeniem magazynu (media/%Y/%m/...) nie mają wiersza Blob
+i są obsługiwane jak w zwykłym FileSystemStorage.
+
+Plik trafia na dysk przed zatwierdzeniem transakcji - po jej wycofaniu zostaje bez
+wiersza Blob. Takie pliki (i porzucone pliki tymczasowe) usuwa collect_garbage(),
+uruchamiane okresowo i przez manage.py storage_report --collect-garbage.
+Oryginalna nazwa przesłanego pliku trafia do pola <pole>_original_name modelu.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_delete, pre_save
+from django.utils.deconstruct import deconstructible
+
+BLOB_DIR = 'blobs'
+HASH_BLOCK_SIZE = 1024 * 1024
+BATCH_SIZE = 1000
+
+
+def get_blob_model():
+    return apps.get_model('core', 'Blob')
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage zapisujący pliki pod hashem treści, z licznikiem odwołań"""
+
+    def get_available_name(self, name, max_length=None):
+        # Nazwa docelowa wynika z treści - nie trzeba szukać wolnej
+        return name
+
+    def blob_name(self, digest, name):
+        extension = os.path.splitext(name)[1].lower()
+        return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    def _save(self, name, content):
+        temp_dir = self.path(f'{BLOB_DIR}/tmp')
+        os.makedirs(temp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=temp_dir, delete=False) as temp_file:
+            try:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    temp_file.write(chunk)
+            except BaseException:
+                temp_file.close()
+                os.remove(temp_file.name)
+                raise
+        return self._store(temp_file.name, digest.hexdigest(), size, name, move=True)
+
+    def adopt(self, path, name):
+        """
+        Dodaje do magazynu istniejący plik lokalny (np. złożony z kawałków uploadu).
+        Plik źródłowy zostaje na miejscu - usuwa go wywołujący.
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as source:
+            for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        return self._store(path, digest.hexdigest(), os.path.getsize(path), name, move=False)
+
+    def _store(self, source_path, digest, size, name, move):
+        Blob = get_blob_model()
+        with transaction.atomic():
+            try:
+                blob, created = Blob.objects.get_or_create(
+                    sha256=digest, defaults={'name': self.blob_name(digest, name), 'size': size}
+                )
+            except IntegrityError:
+                blob, created = Blob.objects.get(sha256=digest), False
+            if not created:
+                Blob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+
+        target_path = self.path(blob.name)
+        if created or not os.path.exists(target_path):
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            if move:
+                os.replace(source_path, target_path)
+            else:
+                self._link(source_path, target_path)
+        elif move:
+            os.remove(source_path)
+        return blob.name
+
+    def _link(self, source_path, target_path):
+        try:
+            os.link(source_path, target_path)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(source_path, target_path)
+
+    def delete(self, name):
+        """Zwalnia odwołanie do bloba - plik jest usuwany razem z ostatnim odwołaniem"""
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        Blob = get_blob_model()
+        with transaction.atomic():
+            blob = Blob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                return super().delete(name)
+            if blob.ref_count > 1:
+                Blob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+                return
+            blob.delete()
+        # Plik usuwamy po zatwierdzeniu - chyba że w międzyczasie ta sama treść wróciła
+        transaction.on_commit(lambda: self._remove_orphan(blob.sha256, name))
+
+    def _remove_orphan(self, digest, name):
+        if not get_blob_model().objects.filter(sha256=digest).exists():
+            super().delete(name)
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+def track(model, field_name='file'):
+    """
+    Zwalnia odwołania do blobów przy usunięciu obiektu i podmianie pliku
+    (razem z wariantami obrazu, jeśli model je ma - patrz core/images.py).
+    """
+    variants_field = f'{field_name}_variants'
+    original_name_field = f'{field_name}_original_name'
+    field_names = {field.name for field in model._meta.fields}
+    has_variants = variants_field in field_names
+    has_original_name = original_name_field in field_names
+
+    def release(field_file, variants=None):
+        from . import images
+
+        storage = field_file.storage
+        if field_file.name:
+            storage.delete(field_file.name)
+        if variants:
+            images.delete_variants(storage, variants)
+
+    def release_replaced_file(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        field_file = getattr(instance, field_name)
+        if has_original_name and field_file and not field_file._committed:
+            # Przed zapisem nazwa pliku to jeszcze nazwa z żądania - w magazynie zostanie hash
+            setattr(instance, original_name_field, os.path.basename(field_file.name)[:255])
+        if instance.pk is None:
+            return
+        old_name = model.objects.filter(pk=instance.pk).values_list(field_name, flat=True).first()
+        # Nowy plik o tej samej treści też dostaje własne odwołanie - stare zwalniamy zawsze
+        if old_name and (not field_file._committed or old_name != field_file.name):
+            storage = field_file.storage
+            transaction.on_commit(lambda: storage.delete(old_name))
+
+    def release_deleted_file(sender, instance, **kwargs):
+        variants = getattr(instance, variants_field) if has_variants else None
+        release(getattr(instance, field_name), variants)
+
+    uid = f'content_storage_{model._meta.label_lower}_{field_name}'
+    pre_save.connect(release_replaced_file, sender=model, weak=False, dispatch_uid=f'{uid}_replace')
+    post_delete.connect(release_deleted_file, sender=model, weak=False, dispatch_uid=f'{uid}_delete')
+
+
+def report():
+    """Zajętość magazynu: bajty zapisane na dysku vs. bajty wszystkich odwołań"""
+    totals = get_blob_model().objects.aggregate(
+        blobs=Count('pk'),
+        references=Sum('ref_count'),
+        stored_bytes=Sum('size'),
+        logical_bytes=Sum(F('size') * F('ref_count')),
+    )
+    totals = {key: value or 0 for key, value in totals.items()}
+    totals['saved_bytes'] = totals['logical_bytes'] - totals['stored_bytes']
+    return totals
+
+
+def collect_garbage(grace=None):
+    """
+    Usuwa pliki magazynu bez wiersza Blob: zapisane w wycofanej transakcji albo
+    porzucone pliki tymczasowe. Pomija pliki młodsze niż grace sekund (domyślnie
+    STORAGE_ORPHAN_GRACE_HOURS) - ich transakcja może jeszcze trwać.
+    Zwraca (liczba plików, bajty).
+    """
+    if grace is None:
+        grace = settings.STORAGE_ORPHAN_GRACE_HOURS * 60 * 60
+    cutoff = time.time() - grace
+    root = content_addressed_storage.path(BLOB_DIR)
+
+    candidates = []
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            if os.path.getmtime(path) < cutoff:
+                name = os.path.relpath(path, content_addressed_storage.location).replace(os.sep, '/')
+                candidates.append(name)
+
+    Blob = get_blob_model()
+    removed = removed_bytes = 0
+    for start in range(0, len(candidates), BATCH_SIZE):
+        batch = candidates[start:start + BATCH_SIZE]
+        known = set(Blob.objects.filter(name__in=batch).values_list('name', flat=True))
+        for name in batch:
+            if name in known:
+                continue
+            path = content_addressed_storage.path(name)
+            try:
+                # Ponowne sprawdzenie tuż przed usunięciem - ta sama treść mogła właśnie wrócić
+                size = os.path.getsize(path)
+                if os.path.getmtime(path) >= cutoff or Blob.objects.filter(name=name).exists():
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+            removed_bytes += size
+    return removed, removed_bytes
@@ -0,0 +1,20 @@
+from celery import shared_task
+
+from . import images, storage
+
+
+@shared_task
+def generate_image_variants(app_label, model_name, pk, field_name):
+    """Generuje responsywne warianty obrazu zapisanego w polu modelu"""
+    instance = images.get_instance(app_label, model_name, pk)
+    if instance is None or not images.needs_update(instance, field_name):
+        return None
+    variants = images.update_variants(instance, field_name)
+    return sorted(variants.get('webp', {}), key=int)
+
+
+@shared_task
+def collect_storage_garbage():
+    """Usuwa pliki magazynu, których transakcja została wycofana"""
+    removed, _ = storage.collect_garbage()
+    return removed
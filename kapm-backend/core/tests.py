@@ -1,3 +1,54 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from .models import Blob, Client, Document
+from .storage import content_addressed_storage
+
+
+class ContentAddressedStorageTests(TestCase):
+    """Deduplikacja i licznik odwołań plików (core/storage.py)"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client_record = Client.objects.create(
+            name='Klient', client_type='company', email='klient@example.com', phone='123',
+            address='Ulica 1', city='Warszawa', postal_code='00-001',
+        )
+
+    def create_document(self, content, filename='umowa.pdf'):
+        return Document.objects.create(
+            title='Umowa', document_type='contract', client=self.client_record,
+            file=SimpleUploadedFile(filename, content),
+        )
+
+    def test_same_content_is_stored_once(self):
+        first = self.create_document(b'tresc')
+        second = self.create_document(b'tresc', filename='kopia.pdf')
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(Blob.objects.get().ref_count, 2)
+        self.assertEqual(second.file_original_name, 'kopia.pdf')
+
+    def test_delete_drops_reference_and_last_one_removes_file(self):
+        first = self.create_document(b'tresc')
+        second = self.create_document(b'tresc')
+        path = content_addressed_storage.path(first.file.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(Blob.objects.get().ref_count, 1)
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(Blob.objects.exists())
+        self.assertFalse(os.path.exists(path))
@@ -1,6 +1,20 @@
-from django.http import JsonResponse
+import os
+import posixpath
+
+from django.apps import apps
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import Http404, JsonResponse
+from django.utils.text import get_valid_filename
 from rest_framework.decorators import api_view
+from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from cms.permissions import EDITOR_ROLES, has_role
+from . import storage
+from .models import Document
+from .sendfile import sendfile
 
 
 def home_view(request):
@@ -33,4 +47,63 @@ def api_root(request):
         'services': request.build_absolute_uri('/api/services/'),
         'team': request.build_absolute_uri('/api/team/'),
         'contact': request.build_absolute_uri('/api/contact/'),
-    })
\ No newline at end of file
+    })
+
+
+class MediaView(APIView):
+    """
+    Pliki z MEDIA_ROOT. Uprawnienia sprawdza Django, bajty wysyła proxy
+    (X-Accel-Redirect/X-Sendfile) albo FileResponse w developmencie - patrz core/sendfile.py.
+    Dokumenty klientów są dostępne tylko dla adminów, edytorów, przesyłającego i samego klienta.
+    """
+    permission_classes = [AllowAny]
+    # Katalogi plików tymczasowych (upload kawałkami, zapis do magazynu) nie są udostępniane
+    hidden_prefixes = ('uploads/', f'{storage.BLOB_DIR}/tmp/')
+    public_cache_control = 'public, max-age=86400'
+    # Bloby są adresowane treścią - pod daną ścieżką nigdy nie zmieni się zawartość
+    immutable_cache_control = 'public, max-age=31536000, immutable'
+    private_cache_control = 'private, no-cache'
+
+    def perform_authentication(self, request):
+        # Uwierzytelnianie (JWT) tylko dla prywatnych dokumentów - patrz get()
+        pass
+
+    def get(self, request, path):
+        name = posixpath.normpath(path).lstrip('/')
+        if name.startswith(('..', '.')) or name.startswith(self.hidden_prefixes):
+            raise Http404
+        try:
+            full_path = default_storage.path(name)
+        except SuspiciousFileOperation:
+            raise Http404
+        if not os.path.isfile(full_path):
+            raise Http404
+
+        document = self.get_private_document(name)
+        if document is not None:
+            if not self.can_access_document(request, document):
+                self.permission_denied(request)
+            attachment_name = get_valid_filename(f'{document.title}{os.path.splitext(name)[1]}')
+            return sendfile(request, full_path, name, attachment_name=attachment_name,
+                            cache_control=self.private_cache_control)
+
+        immutable = name.startswith(f'{storage.BLOB_DIR}/')
+        return sendfile(request, full_path, name,
+                        cache_control=self.immutable_cache_control if immutable else self.public_cache_control)
+
+    def get_private_document(self, name):
+        """Dokument klienta wskazujący na plik - chyba że ta sama treść jest też publicznym plikiem mediów"""
+        document = Document.objects.filter(file=name).select_related('client').first()
+        if document is None:
+            return None
+        if apps.get_model('cms', 'MediaFile').objects.filter(file=name).exists():
+            return None
+        return document
+
+    def can_access_document(self, request, document):
+        user = request.user
+        if not user.is_authenticated:
+            return False
+        if document.uploaded_by_id == user.pk or document.client.user_id == user.pk:
+            return True
+        return has_role(request, EDITOR_ROLES)